@@ -1,61 +1,82 @@
 from flask import Flask
+from werkzeug.utils import import_string
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_admin import Admin
-from flask_security import Security, SQLAlchemyUserDatastore
+from flask_security import Security
 from config import config
 
 db = SQLAlchemy()
-migrate = Migrate()
-admin = Admin()
 security = Security()
 
-def create_app(config_name='default'):
+def create_app(config_name='default', api_only=None):
     app = Flask(__name__)
     
     app.config.from_object(config[config_name])
+    if api_only is not None:
+        app.config['API_ONLY'] = api_only
+    api_only = app.config['API_ONLY']
+    app.json_provider_class = import_string(app.config['JSON_PROVIDER'])
+    app.json = app.json_provider_class(app)
+    
+    from app.metrics import init_metrics
+    init_metrics(app)
     
     db.init_app(app)
-    migrate.init_app(app, db)
-    admin.init_app(app)
+    from app.database import init_database
+    init_database(app)
+    if not api_only:
+        from flask_migrate import Migrate
+        Migrate(app, db)
     
     from app import models
+    from app import standings
     
-    user_datastore = SQLAlchemyUserDatastore(db, models.User, models.Role)
-    security.init_app(app, user_datastore)
-    
-    from flask_admin.contrib.sqla import ModelView
-    from flask_security import current_user
-    
-    class SecureModelView(ModelView):
-        def is_accessible(self):
-            return current_user.is_authenticated
-        
-        def inaccessible_callback(self, name, **kwargs):
-            return redirect(url_for('security.login'))
+    from app.auth import CachedUserDatastore, init_auth
+    user_datastore = CachedUserDatastore(db, models.User, models.Role)
+    if api_only:
+        api_security = Security()
+        api_security.init_app(app, user_datastore, register_blueprint=False)
+        api_security.want_json(lambda request: True)
+    else:
+        security.init_app(app, user_datastore)
     
-    from flask import redirect, url_for
+    if not api_only:
+        from app.admin import init_admin
+        from app.routes.index import index_bp
+        init_admin(app)
+        app.register_blueprint(index_bp)
     
-    admin.add_view(SecureModelView(models.Game, db.session))
-    admin.add_view(SecureModelView(models.SavedGameMeta, db.session))
-    admin.add_view(SecureModelView(models.GameHoleData, db.session))
-    admin.add_view(SecureModelView(models.GamePlayer, db.session))
-    admin.add_view(SecureModelView(models.PlayerHoleScore, db.session))
-    admin.add_view(SecureModelView(models.User, db.session))
-    admin.add_view(SecureModelView(models.Role, db.session))
-    
-    from app.routes.index import index_bp
     from app.routes.games import games_bp
     from app.routes.saved_game_meta import saved_game_meta_bp
     from app.routes.game_hole_data import game_hole_data_bp
     from app.routes.game_players import game_players_bp
     from app.routes.player_hole_scores import player_hole_scores_bp
+    from app.routes.sync import sync_bp
+    from app.routes.cache import cache_bp
+    from app.routes.metrics import metrics_bp
     
-    app.register_blueprint(index_bp)
     app.register_blueprint(games_bp, url_prefix='/api')
     app.register_blueprint(saved_game_meta_bp, url_prefix='/api')
     app.register_blueprint(game_hole_data_bp, url_prefix='/api')
     app.register_blueprint(game_players_bp, url_prefix='/api')
     app.register_blueprint(player_hole_scores_bp, url_prefix='/api')
+    app.register_blueprint(sync_bp, url_prefix='/api')
+    app.register_blueprint(cache_bp, url_prefix='/api')
+    app.register_blueprint(metrics_bp)
+    
+    from app.commands import register_commands
+    register_commands(app)
+    
+    from app.timing import init_timing
+    init_timing(app)
+    
+    from app.slow_queries import init_slow_queries
+    init_slow_queries(app)
+    
+    from app.compression import init_compression
+    init_compression(app)
+    
+    from app.cache import cache
+    cache.init_app(app)
+    init_auth(app)
     
     return app
@@ -0,0 +1,24 @@
+from flask import redirect, url_for
+from flask_admin import Admin
+from flask_admin.contrib.sqla import ModelView
+from flask_security import current_user
+from app import db
+from app import models
+
+class SecureModelView(ModelView):
+    def is_accessible(self):
+        return current_user.is_authenticated
+    
+    def inaccessible_callback(self, name, **kwargs):
+        return redirect(url_for('security.login'))
+
+def init_admin(app):
+    admin = Admin(app)
+    admin.add_view(SecureModelView(models.Game, db.session))
+    admin.add_view(SecureModelView(models.SavedGameMeta, db.session))
+    admin.add_view(SecureModelView(models.GameHoleData, db.session))
+    admin.add_view(SecureModelView(models.GamePlayer, db.session))
+    admin.add_view(SecureModelView(models.PlayerHoleScore, db.session))
+    admin.add_view(SecureModelView(models.User, db.session))
+    admin.add_view(SecureModelView(models.Role, db.session))
+    return admin
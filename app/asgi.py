@@ -0,0 +1,277 @@
+import asyncio
+import json
+import re
+import time
+import uuid
+import zlib
+from urllib.parse import parse_qs
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from flask_login import current_user
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import joinedload, selectinload
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+from werkzeug.test import EnvironBuilder
+from app.cache import cache, game_version, game_version_query, stored_game_version
+from app.compression import choose_encoding, compress, gunzip
+from app.database import configure_engine
+from app.etags import encoded_etag, game_etag, matching_etag
+from app.metrics import observe_request
+from app.models import Game, GameStanding, PlayerHoleScore, bump_child_version
+from app.serializers import serialize, serializer_for
+from app.scorecards import patch_scorecards, score_columns
+from app.standings import refresh_standings
+from app.timing import finish_timing, listen_timing, start_timing
+from app.upsert import upsert_statement, upsert_values
+
+GAME = r'/api/games/(?P<game_id>[0-9a-fA-F-]{32,36})'
+
+ROUTES = (
+    ('GET', re.compile(rf'{GAME}'), 'games', 'get_game'),
+    ('GET', re.compile(rf'{GAME}/full'), 'games', 'get_game_full'),
+    ('GET', re.compile(rf'{GAME}/standings'), 'games', 'get_game_standings'),
+    ('PUT', re.compile(rf'{GAME}/holes/(?P<hole_number>\d+)/players/(?P<player_number>\d+)/score'),
+     'player_hole_scores', 'upsert_player_hole_score'),
+)
+
+SCORE_FIELDS = ('player_score', 'net_score', 'gross_score', 'player_money', 'wolf_score', 'prox_score')
+
+class AsyncRequest:
+    def __init__(self, scope, receive):
+        self.scope = scope
+        self.receive = receive
+        self.headers = Headers([(name.decode('latin-1'), value.decode('latin-1'))
+                                for name, value in scope['headers']])
+        self.args = parse_qs(scope['query_string'].decode('latin-1'))
+        self.body = None
+
+    async def read(self):
+        if self.body is None:
+            chunks = []
+            more_body = True
+            while more_body:
+                message = await self.receive()
+                chunks.append(message.get('body', b''))
+                more_body = message.get('more_body', False)
+            self.body = b''.join(chunks)
+        return self.body
+
+    async def json(self, max_size):
+        if self.headers.get('Content-Type', '').split(';')[0].strip() != 'application/json':
+            return None
+        data = await self.read()
+        encoding = self.headers.get('Content-Encoding', '').strip().lower()
+        try:
+            if encoding == 'gzip':
+                data = gunzip(data, max_size)
+            elif encoding not in ('', 'identity'):
+                return None
+            return json.loads(data)
+        except (OverflowError, zlib.error, ValueError):
+            return None
+
+    async def replay(self):
+        if self.body is None:
+            return await self.receive()
+        return {'type': 'http.request', 'body': self.body, 'more_body': False}
+
+class ThreadPoolWsgiInstance(WsgiToAsgiInstance):
+    run_wsgi_app = sync_to_async(WsgiToAsgiInstance.__dict__['run_wsgi_app'].func, thread_sensitive=False)
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await ThreadPoolWsgiInstance(self.wsgi_application)(scope, receive, send)
+
+class AsyncAPI:
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = ThreadPoolWsgiToAsgi(flask_app)
+        config = flask_app.config
+        self.engine = create_async_engine(config['ASYNC_DATABASE_URI'], **config['ASYNC_ENGINE_OPTIONS'])
+        configure_engine(self.engine.sync_engine, config)
+        if config['TIMING_SAMPLE_RATE'] > 0:
+            listen_timing(self.engine.sync_engine)
+        if 'slow_queries' in flask_app.extensions:
+            flask_app.extensions['slow_queries'].listen(self.engine.sync_engine)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        route = self.match(scope) if scope['type'] == 'http' else None
+        if route is None:
+            return await self.wsgi(scope, receive, send)
+        handler, params, blueprint = route
+        started = time.perf_counter()
+        timing = start_timing(self.flask_app.config['TIMING_SAMPLE_RATE'])
+        request = AsyncRequest(scope, receive)
+        response = None
+        if 'fields' not in request.args and await asyncio.to_thread(self.authenticated, scope, request.headers):
+            response = await handler(request, **params)
+        if response is None:
+            return await self.wsgi(scope, request.replay, send)
+        await self.send(request, self.instrument(send, scope, blueprint, handler.__name__, started, timing), *response)
+
+    def instrument(self, send, scope, blueprint, name, started, timing):
+        async def instrumented(message):
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                observe_request(blueprint, scope['method'], status, time.perf_counter() - started)
+                if timing is not None:
+                    header = finish_timing(timing, scope['method'], scope['path'], f'{blueprint}.{name}', status)
+                    message = {**message, 'headers': [*message['headers'], (b'server-timing', header.encode())]}
+            await send(message)
+        return instrumented
+
+    def match(self, scope):
+        for method, pattern, blueprint, name in ROUTES:
+            found = pattern.fullmatch(scope['path'])
+            if found and scope['method'] == method:
+                params = found.groupdict()
+                try:
+                    params['game_id'] = uuid.UUID(params['game_id'])
+                except ValueError:
+                    return None
+                for param in ('hole_number', 'player_number'):
+                    if param in params:
+                        params[param] = int(params[param])
+                return getattr(self, name), params, blueprint
+        return None
+
+    def authenticated(self, scope, headers):
+        environ = EnvironBuilder(
+            path=scope['path'], method=scope['method'], headers=headers,
+            query_string=scope['query_string'], base_url=f"{scope.get('scheme', 'http')}://localhost"
+        ).get_environ()
+        with self.flask_app.request_context(environ):
+            return bool(current_user.is_authenticated)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def send(self, request, send, status, body, etag=None):
+        headers = [] if status == 304 else [(b'content-type', b'application/json')]
+        config = self.flask_app.config
+        if status == 200 and len(body) >= config['COMPRESS_MIN_SIZE']:
+            headers.append((b'vary', b'Accept-Encoding'))
+            encoding = choose_encoding(parse_accept_header(request.headers.get('Accept-Encoding')))
+            if encoding is not None:
+                body = compress(body, encoding, config)
+                headers.append((b'content-encoding', encoding.encode()))
+                if etag is not None:
+                    etag = encoded_etag(etag, encoding)
+        if etag is not None:
+            headers.append((b'etag', quote_etag(etag).encode()))
+        headers.append((b'content-length', str(len(body)).encode()))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def dumps(self, data):
+        return self.flask_app.json.response(data).get_data()
+
+    async def cached_json(self, request, key, load):
+        with self.flask_app.app_context():
+            entry = cache.get(key)
+            revalidate = cache.needs_revalidation(entry)
+        if revalidate:
+            async with self.sessions() as session:
+                row = (await session.execute(game_version_query(entry[2]))).one_or_none()
+            with self.flask_app.app_context():
+                entry = cache.revalidate(key, entry, stored_game_version(row))
+        if entry is None:
+            async with self.sessions() as session:
+                loaded = await load(session)
+            if loaded is None:
+                return None
+            game_id, version, etag, data = loaded
+            entry = (etag, self.dumps(data).decode(), str(game_id), version)
+            with self.flask_app.app_context():
+                cache.set(key, entry, game_id)
+        etag, body = entry[:2]
+        matched = matching_etag(parse_etags(request.headers.get('If-None-Match')), etag)
+        if matched:
+            return 304, b'', matched
+        return 200, body.encode(), etag
+
+    async def get_game(self, request, game_id):
+        async def load(session):
+            game = await session.get(Game, game_id)
+            if game is None:
+                return None
+            return game.id, game_version(game), game_etag(game.id, game.updated_at), serializer_for(Game)(game)
+        return await self.cached_json(request, f'games:{game_id}', load)
+
+    async def get_game_full(self, request, game_id):
+        async def load(session):
+            game = (await session.execute(select(Game).options(
+                joinedload(Game.meta),
+                selectinload(Game.players),
+                selectinload(Game.holes),
+                selectinload(Game.scores)
+            ).where(Game.id == game_id))).unique().scalar_one_or_none()
+            if game is None:
+                return None
+            version = game_version(game)
+            return game.id, version, version, {
+                **serializer_for(Game)(game),
+                'players': [serialize(player) for player in game.players],
+                'hole_data': [serialize(data) for data in game.holes],
+                'scores': [serialize(score) for score in game.scores],
+                'saved_game_meta': serialize(game.meta) if game.meta else None
+            }
+        return await self.cached_json(request, f'games:{game_id}:full', load)
+
+    async def get_game_standings(self, request, game_id):
+        async with self.sessions() as session:
+            standings = (await session.scalars(select(GameStanding).where(GameStanding.game_id == game_id).order_by(
+                GameStanding.total_money.desc(), GameStanding.player_number
+            ))).all()
+        if not standings:
+            return None
+        return 200, self.dumps([{
+            'player_number': standing.player_number,
+            'total_money': float(standing.total_money),
+            'holes_played': standing.holes_played,
+            'total_points': standing.total_points
+        } for standing in standings])
+
+    async def upsert_player_hole_score(self, request, game_id, hole_number, player_number):
+        if not 1 <= hole_number <= 18 or not 1 <= player_number <= 9:
+            return None
+        data = await request.json(self.flask_app.config['MAX_DECOMPRESSED_REQUEST_SIZE'])
+        try:
+            values = upsert_values(PlayerHoleScore, data, SCORE_FIELDS)
+        except ValueError:
+            return None
+        stmt = upsert_statement(self.engine.dialect.name, PlayerHoleScore,
+                                {'game_id': game_id, 'player_number': player_number, 'hole_number': hole_number},
+                                values,
+                                returning=score_columns())
+        async with self.sessions() as session:
+            try:
+                score = (await session.execute(stmt)).one()
+                await session.run_sync(lambda sync_session: (
+                    bump_child_version(sync_session, [game_id]),
+                    refresh_standings(sync_session, [(game_id, player_number)]),
+                    patch_scorecards(sync_session, [score._mapping])
+                ))
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                return None
+        with self.flask_app.app_context():
+            cache.invalidate_games([game_id])
+        return 200, self.dumps({'id': str(score.id)})
+
+def create_asgi_app(flask_app):
+    return AsyncAPI(flask_app)
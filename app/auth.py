@@ -0,0 +1,80 @@
+from flask import current_app, has_app_context
+from flask.sessions import SecureCookieSessionInterface
+from flask_security import SQLAlchemyUserDatastore
+from flask_security.utils import get_request_attr
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app.cache import LRUCache
+from app.metrics import AUTH_LATENCY, CACHE_REQUESTS
+from app.models import User, Role
+from app.timing import measure
+
+def _columns(obj):
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+def _detached(model, columns):
+    obj = model(**columns)
+    make_transient_to_detached(obj)
+    return obj
+
+class CachedUserDatastore(SQLAlchemyUserDatastore):
+    def find_user(self, case_insensitive=False, **kwargs):
+        with measure('auth'), AUTH_LATENCY.time():
+            return self._find_user(case_insensitive, **kwargs)
+
+    def _find_user(self, case_insensitive=False, **kwargs):
+        identities = current_app.extensions.get('identity_cache') if has_app_context() else None
+        if identities is None or case_insensitive or list(kwargs) != ['fs_uniquifier']:
+            return super().find_user(case_insensitive, **kwargs)
+        uniquifier = kwargs['fs_uniquifier']
+        snapshot = identities.get(uniquifier)
+        CACHE_REQUESTS.labels('identity', 'hit' if snapshot is not None else 'miss').inc()
+        if snapshot is None:
+            user = super().find_user(**kwargs)
+            if user is not None:
+                identities.set(uniquifier, (_columns(user), [_columns(role) for role in user.roles]))
+            return user
+        user_columns, role_columns = snapshot
+        user = _detached(self.user_model, user_columns)
+        set_committed_value(user, 'roles', [_detached(self.role_model, columns) for columns in role_columns])
+        return self.db.session.merge(user, load=False)
+
+class TokenAwareSessionInterface(SecureCookieSessionInterface):
+    def save_session(self, app, session, response):
+        if get_request_attr('fs_authn_via') == 'token':
+            return
+        super().save_session(app, session, response)
+
+def init_auth(app):
+    app.session_interface = TokenAwareSessionInterface()
+    app.extensions['identity_cache'] = LRUCache(app.config['IDENTITY_CACHE_MAX_ENTRIES'],
+                                                app.config['IDENTITY_CACHE_TTL'])
+
+@event.listens_for(Session, 'before_flush')
+def _track_identity_changes_on_flush(session, flush_context, instances):
+    changed = session.info.setdefault('changed_identities', set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Role):
+            changed.add(None)
+        elif isinstance(obj, User):
+            history = inspect(obj).attrs.fs_uniquifier.history
+            changed.update(history.deleted)
+            changed.add(obj.fs_uniquifier)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_identities(session):
+    changed = session.info.pop('changed_identities', None)
+    if not changed or not has_app_context():
+        return
+    identities = current_app.extensions.get('identity_cache')
+    if identities is None:
+        return
+    if None in changed:
+        identities.clear()
+    else:
+        identities.delete(*changed)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_identities(session):
+    session.info.pop('changed_identities', None)
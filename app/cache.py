@@ -0,0 +1,229 @@
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, joinedload
+from werkzeug.utils import import_string
+from app import db
+from app.etags import game_etag, not_modified, with_etag
+from app.metrics import CACHE_REQUESTS
+from app.models import Game
+
+class NullCache:
+    shared = False
+
+    @classmethod
+    def from_config(cls, config):
+        return cls()
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, tags=()):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def invalidate_tags(self, tags):
+        pass
+
+class LRUCache:
+    shared = False
+
+    def __init__(self, max_entries=10000, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config['CACHE_MAX_ENTRIES'], config['CACHE_TTL'])
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, tags=()):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tuple(tags), value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._remove(key)
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisCache:
+    shared = True
+
+    def __init__(self, client, ttl=60, prefix='wolf:cache:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_config(cls, config):
+        import redis
+        return cls(redis.Redis.from_url(config['CACHE_REDIS_URL']), config['CACHE_TTL'])
+
+    def _tag_key(self, tag):
+        return f'{self.prefix}tag:{tag}'
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else tuple(json.loads(raw))
+
+    def set(self, key, value, tags=()):
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), self.prefix + key)
+            pipe.expire(self._tag_key(tag), self.ttl)
+        pipe.execute()
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def invalidate_tags(self, tags):
+        for tag in tags:
+            keys = self.client.smembers(self._tag_key(tag))
+            self.client.delete(self._tag_key(tag), *keys)
+
+class ReadCache:
+    def init_app(self, app):
+        backend = import_string(app.config['CACHE_BACKEND'])
+        app.extensions['read_cache'] = {
+            'backend': backend.from_config(app.config),
+            'hits': 0,
+            'misses': 0,
+            'stale': 0,
+            'lock': threading.Lock(),
+        }
+
+    @property
+    def state(self):
+        return current_app.extensions['read_cache']
+
+    @property
+    def backend(self):
+        return self.state['backend']
+
+    def get(self, key):
+        state = self.state
+        value = state['backend'].get(key)
+        with state['lock']:
+            state['hits' if value is not None else 'misses'] += 1
+        CACHE_REQUESTS.labels('read', 'hit' if value is not None else 'miss').inc()
+        return value
+
+    def set(self, key, value, game_id):
+        self.backend.set(key, value, tags=(f'game:{game_id}',))
+
+    def needs_revalidation(self, entry):
+        return entry is not None and not self.backend.shared
+
+    def revalidate(self, key, entry, version):
+        if entry[3] == version:
+            return entry
+        state = self.state
+        state['backend'].delete(key)
+        with state['lock']:
+            state['stale'] += 1
+        CACHE_REQUESTS.labels('read', 'stale').inc()
+        return None
+
+    def invalidate_games(self, game_ids):
+        self.backend.invalidate_tags([f'game:{game_id}' for game_id in game_ids])
+
+    def stats(self):
+        state = self.state
+        return {
+            'backend': type(state['backend']).__name__,
+            'hits': state['hits'],
+            'misses': state['misses'],
+            'stale': state['stale'],
+        }
+
+cache = ReadCache()
+
+def game_version(game):
+    return game_etag(game.id, game.updated_at, game.child_version)
+
+def with_game_version(model):
+    return joinedload(model.game).load_only(Game.updated_at, Game.child_version)
+
+def game_version_query(game_id):
+    return select(Game.id, Game.updated_at, Game.child_version).where(Game.id == uuid.UUID(game_id))
+
+def stored_game_version(row):
+    return None if row is None else game_version(row)
+
+def cached_json(key, load, fields=None):
+    if fields is not None:
+        key = f'{key}?fields={",".join(sorted(fields))}'
+    entry = cache.get(key)
+    if cache.needs_revalidation(entry):
+        row = db.session.execute(game_version_query(entry[2])).one_or_none()
+        entry = cache.revalidate(key, entry, stored_game_version(row))
+    if entry is None:
+        game_id, version, etag, data = load()
+        entry = (etag, current_app.json.response(data).get_data(as_text=True), str(game_id), version)
+        cache.set(key, entry, game_id)
+    etag, body = entry[:2]
+    response = current_app.response_class(body, mimetype='application/json')
+    if etag is None:
+        return response
+    return not_modified(etag) or with_etag(response, etag)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_games(session):
+    game_ids = session.info.pop('changed_games', None)
+    if game_ids and has_app_context() and 'read_cache' in current_app.extensions:
+        cache.invalidate_games(game_ids)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_games(session):
+    session.info.pop('changed_games', None)
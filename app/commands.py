@@ -0,0 +1,35 @@
+import click
+import time
+from app import db
+from app.models import Game
+from app.scoring import recompute_games
+from app.scorecards import refresh_scorecards
+from app.standings import rebuild_standings
+
+def register_commands(app):
+    @app.cli.command('recompute-scores')
+    @click.option('--batch-size', default=500, show_default=True, help='Games loaded and scored per pass.')
+    def recompute_scores(batch_size):
+        started = time.perf_counter()
+        game_ids = db.session.scalars(db.select(Game.id).order_by(Game.id)).all()
+        for start in range(0, len(game_ids), batch_size):
+            recompute_games(game_ids[start:start + batch_size])
+            db.session.commit()
+        click.echo(f'Recomputed {len(game_ids)} games in {time.perf_counter() - started:.2f}s')
+
+    @app.cli.command('rebuild-standings')
+    def rebuild_standings_command():
+        started = time.perf_counter()
+        rebuild_standings(db.session)
+        db.session.commit()
+        click.echo(f'Rebuilt standings in {time.perf_counter() - started:.2f}s')
+
+    @app.cli.command('rebuild-scorecards')
+    @click.option('--batch-size', default=500, show_default=True, help='Games packed per pass.')
+    def rebuild_scorecards(batch_size):
+        started = time.perf_counter()
+        game_ids = db.session.scalars(db.select(Game.id).order_by(Game.id)).all()
+        for start in range(0, len(game_ids), batch_size):
+            refresh_scorecards(db.session, game_ids[start:start + batch_size])
+            db.session.commit()
+        click.echo(f'Rebuilt {len(game_ids)} scorecards in {time.perf_counter() - started:.2f}s')
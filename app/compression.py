@@ -0,0 +1,108 @@
+import io
+import json
+import zlib
+from flask import current_app, request
+from app.etags import encoded_etag
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+def _offers():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def choose_encoding(accept_encodings):
+    return accept_encodings.best_match(_offers())
+
+def gunzip(data, max_size):
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    data = decompressor.decompress(data, max_size + 1)
+    if len(data) > max_size or decompressor.unconsumed_tail:
+        raise OverflowError('decompressed request body too large')
+    if not decompressor.eof:
+        raise zlib.error('truncated gzip stream')
+    return data
+
+def _compressor(encoding, config):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BR_LEVEL'])
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+def compress(data, encoding, config):
+    process, _, finish = _compressor(encoding, config)
+    return process(data) + finish()
+
+def _compress_stream(chunks, encoding, config):
+    process, flush, finish = _compressor(encoding, config)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+def compress_response(response):
+    config = current_app.config
+    if (request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in config['COMPRESS_MIMETYPES']):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding, config)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(compress(data, encoding, config))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(encoded_etag(etag, encoding))
+    return response
+
+def _error(start_response, status, message):
+    body = json.dumps({'error': message}).encode()
+    start_response(status, [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+    return [body]
+
+class GzipRequestMiddleware:
+    def __init__(self, wsgi_app, max_size):
+        self.wsgi_app = wsgi_app
+        self.max_size = max_size
+
+    def __call__(self, environ, start_response):
+        encoding = environ.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if encoding in ('', 'identity'):
+            return self.wsgi_app(environ, start_response)
+        if encoding != 'gzip':
+            return _error(start_response, '415 Unsupported Media Type', f'unsupported Content-Encoding: {encoding}')
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+        try:
+            data = gunzip(environ['wsgi.input'].read(length), self.max_size)
+        except zlib.error:
+            return _error(start_response, '400 Bad Request', 'invalid gzip request body')
+        except OverflowError as e:
+            return _error(start_response, '413 Request Entity Too Large', str(e))
+        environ['wsgi.input'] = io.BytesIO(data)
+        environ['CONTENT_LENGTH'] = str(len(data))
+        del environ['HTTP_CONTENT_ENCODING']
+        return self.wsgi_app(environ, start_response)
+
+def init_compression(app):
+    app.after_request(compress_response)
+    app.wsgi_app = GzipRequestMiddleware(app.wsgi_app, app.config['MAX_DECOMPRESSED_REQUEST_SIZE'])
@@ -0,0 +1,33 @@
+from sqlalchemy import event
+
+class LocalStatementTimeout:
+    def __init__(self, timeout_ms):
+        self.timeout_ms = int(timeout_ms)
+
+    def __call__(self, connection):
+        connection.exec_driver_sql(f'SET LOCAL statement_timeout = {self.timeout_ms}')
+
+FOREIGN_KEY_VIOLATION = '23503'
+
+def is_foreign_key_violation(error):
+    orig = error.orig
+    code = getattr(orig, 'pgcode', None) or getattr(orig, 'sqlstate', None)
+    return code == FOREIGN_KEY_VIOLATION or 'FOREIGN KEY constraint failed' in str(orig)
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+def configure_engine(engine, config):
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _enable_sqlite_foreign_keys)
+    elif engine.dialect.name == 'postgresql' and config['DB_PGBOUNCER']:
+        event.listen(engine, 'begin', LocalStatementTimeout(config['DB_STATEMENT_TIMEOUT_MS']))
+
+def init_database(app):
+    from app import db
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        configure_engine(engine, app.config)
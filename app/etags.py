@@ -0,0 +1,41 @@
+from flask import request, make_response, jsonify
+
+CONTENT_CODINGS = ('gzip', 'br')
+
+def game_etag(game_id, updated_at, child_version=None):
+    etag = f'{game_id.hex}.{updated_at:%Y%m%d%H%M%S%f}'
+    if child_version is not None:
+        etag = f'{etag}.{child_version}'
+    return etag
+
+def row_etag(row):
+    return f'{row.id.hex}.{row.version}'
+
+def encoded_etag(etag, encoding):
+    return f'{etag}-{encoding}'
+
+def etag_variants(etag):
+    return (etag,) + tuple(encoded_etag(etag, encoding) for encoding in CONTENT_CODINGS)
+
+def matching_etag(etags, etag):
+    for candidate in etag_variants(etag):
+        if etags.contains_weak(candidate):
+            return candidate
+    return None
+
+def not_modified(etag):
+    matched = matching_etag(request.if_none_match, etag)
+    if matched:
+        response = make_response('', 304)
+        response.set_etag(matched)
+        return response
+    return None
+
+def precondition_failed(etag):
+    if request.if_match and not any(request.if_match.contains(candidate) for candidate in etag_variants(etag)):
+        return jsonify({'error': 'Resource has been modified'}), 412
+    return None
+
+def with_etag(response, etag):
+    response.set_etag(etag)
+    return response
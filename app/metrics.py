@@ -0,0 +1,70 @@
+import os
+import time
+from flask import g, request, request_finished, request_started
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy.pool import QueuePool
+
+REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'Request latency by blueprint.',
+                            ['blueprint', 'method'])
+REQUEST_ERRORS = Counter('http_request_errors_total', 'Responses with a 4xx or 5xx status.',
+                         ['blueprint', 'method', 'status'])
+AUTH_LATENCY = Histogram('auth_lookup_duration_seconds', 'Time to load the user for a session or API token.',
+                         buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1))
+CACHE_REQUESTS = Counter('cache_requests_total', 'Cache lookups by cache and result.', ['cache', 'result'])
+POOL_CHECKED_OUT = Gauge('db_pool_checked_out_connections', 'Connections currently checked out of the pool.',
+                         multiprocess_mode='livesum')
+POOL_OVERFLOW = Gauge('db_pool_overflow_connections', 'Connections open beyond pool_size.',
+                      multiprocess_mode='livesum')
+POOL_WAITING = Gauge('db_pool_waiting_checkouts', 'Checkouts currently waiting for a connection.',
+                     multiprocess_mode='livesum')
+POOL_WAIT = Histogram('db_pool_checkout_wait_seconds', 'Time spent getting a connection from the pool.',
+                      buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10))
+
+class MeteredQueuePool(QueuePool):
+    def _do_get(self):
+        POOL_WAITING.inc()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAITING.dec()
+            POOL_WAIT.observe(time.perf_counter() - started)
+            self._report()
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._report()
+
+    def _report(self):
+        POOL_CHECKED_OUT.set(self.checkedout())
+        POOL_OVERFLOW.set(max(self.overflow(), 0))
+
+def _start_request(app, **extra):
+    g._metrics_started = time.perf_counter()
+
+def _finish_request(app, response, **extra):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return
+    observe_request(request.blueprint or 'none', request.method, response.status_code, time.perf_counter() - started)
+
+def observe_request(blueprint, method, status, elapsed):
+    REQUEST_LATENCY.labels(blueprint, method).observe(elapsed)
+    if status >= 400:
+        REQUEST_ERRORS.labels(blueprint, method, str(status)).inc()
+
+def render_metrics():
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def init_metrics(app):
+    options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    if 'pool_size' in options and 'poolclass' not in options:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**options, 'poolclass': MeteredQueuePool}
+    request_started.connect(_start_request, app)
+    request_finished.connect(_finish_request, app)
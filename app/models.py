@@ -1,9 +1,21 @@
 from app import db
 import uuid
 from datetime import datetime
+from sqlalchemy import DDL, event, update
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
 from flask_security import UserMixin, RoleMixin
 
+sync_counter = db.Table(
+    'sync_counter',
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('value', db.BigInteger, nullable=False)
+)
+
+event.listen(sync_counter, 'after_create', DDL('INSERT INTO sync_counter (id, value) VALUES (1, 0)'))
+
+CURRENT_CHANGE_SEQ = db.select(sync_counter.c.value).where(sync_counter.c.id == 1).scalar_subquery()
+
 class Game(db.Model):
     __tablename__ = 'games'
     
@@ -28,6 +40,26 @@ class Game(db.Model):
     
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    child_version = db.Column(db.Integer, nullable=False, default=1, server_default='1', info={'internal': True})
+    change_seq = db.Column(db.BigInteger, default=db.null(), onupdate=db.null(),
+                           server_default='0', info={'internal': True})
+    
+    players = db.relationship('GamePlayer', backref='game', order_by='GamePlayer.player_number',
+                              cascade='all, delete-orphan', passive_deletes=True)
+    holes = db.relationship('GameHoleData', backref='game', order_by='GameHoleData.hole_number',
+                            cascade='all, delete-orphan', passive_deletes=True)
+    scores = db.relationship('PlayerHoleScore', backref='game',
+                             order_by='[PlayerHoleScore.hole_number, PlayerHoleScore.player_number]',
+                             cascade='all, delete-orphan', passive_deletes=True)
+    meta = db.relationship('SavedGameMeta', backref='game', uselist=False,
+                           cascade='all, delete-orphan', passive_deletes=True)
+    
+    __table_args__ = (
+        db.Index('ix_games_last_saved_id', 'last_saved', 'id'),
+        db.Index('ix_games_change_seq_id', 'change_seq', 'id'),
+        db.Index('ix_games_is_continuing_game_last_saved_id', 'is_continuing_game', 'last_saved', 'id'),
+        db.Index('ix_games_game_name_pattern', 'game_name', postgresql_ops={'game_name': 'varchar_pattern_ops'}),
+    )
     
     def __repr__(self):
         return f'<Game {self.game_name}>'
@@ -41,6 +73,18 @@ class SavedGameMeta(db.Model):
     saved_at = db.Column(db.DateTime, nullable=False)
     hole = db.Column(db.Integer, nullable=False)
     
+    version = db.Column(db.Integer, nullable=False, server_default='1', info={'internal': True})
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+                           info={'internal': True})
+    change_seq = db.Column(db.BigInteger, default=db.null(), onupdate=db.null(),
+                           server_default='0', info={'internal': True})
+    
+    __table_args__ = (
+        db.Index('ix_saved_game_meta_change_seq_id', 'change_seq', 'id'),
+    )
+    
+    __mapper_args__ = {'version_id_col': version}
+    
     def __repr__(self):
         return f'<SavedGameMeta {self.name}>'
 
@@ -62,17 +106,27 @@ class GameHoleData(db.Model):
     re_roll_pushed = db.Column(db.Boolean, nullable=False, default=False)
     
     wolf_hole = db.Column(db.Integer, nullable=False, default=0)
+    wolf_partner = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     hole_handicap = db.Column(db.Integer, nullable=False, default=0)
     hole_par = db.Column(db.Integer, nullable=False, default=4)
     
     prox_array = db.Column(db.Boolean, nullable=False, default=False)
     
+    version = db.Column(db.Integer, nullable=False, server_default='1', info={'internal': True})
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+                           info={'internal': True})
+    change_seq = db.Column(db.BigInteger, default=db.null(), onupdate=db.null(),
+                           server_default='0', info={'internal': True})
+    
     __table_args__ = (
         db.CheckConstraint('hole_number >= 1 AND hole_number <= 18'),
         db.UniqueConstraint('game_id', 'hole_number'),
+        db.Index('ix_game_hole_data_change_seq_id', 'change_seq', 'id'),
     )
     
+    __mapper_args__ = {'version_id_col': version}
+    
     def __repr__(self):
         return f'<GameHoleData game_id={self.game_id} hole={self.hole_number}>'
 
@@ -93,11 +147,20 @@ class GamePlayer(db.Model):
     wolf_non_eagle_points = db.Column(db.Integer, nullable=False, default=0)
     non_wolf_birdie_points = db.Column(db.Integer, nullable=False, default=0)
     
+    version = db.Column(db.Integer, nullable=False, server_default='1', info={'internal': True})
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+                           info={'internal': True})
+    change_seq = db.Column(db.BigInteger, default=db.null(), onupdate=db.null(),
+                           server_default='0', info={'internal': True})
+    
     __table_args__ = (
         db.CheckConstraint('player_number >= 1 AND player_number <= 9'),
         db.UniqueConstraint('game_id', 'player_number'),
+        db.Index('ix_game_players_change_seq_id', 'change_seq', 'id'),
     )
     
+    __mapper_args__ = {'version_id_col': version}
+    
     def __repr__(self):
         return f'<GamePlayer {self.player_name} #{self.player_number}>'
 
@@ -120,16 +183,151 @@ class PlayerHoleScore(db.Model):
     
     prox_score = db.Column(db.Integer, nullable=False, default=0)
     
+    version = db.Column(db.Integer, nullable=False, server_default='1', info={'internal': True})
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow,
+                           info={'internal': True})
+    change_seq = db.Column(db.BigInteger, default=db.null(), onupdate=db.null(),
+                           server_default='0', info={'internal': True})
+    
     __table_args__ = (
         db.CheckConstraint('player_number >= 1 AND player_number <= 9'),
         db.CheckConstraint('hole_number >= 1 AND hole_number <= 18'),
         db.UniqueConstraint('game_id', 'player_number', 'hole_number'),
+        db.Index('ix_player_hole_scores_game_id_hole_number_player_number', 'game_id', 'hole_number', 'player_number'),
+        db.Index('ix_player_hole_scores_change_seq_id', 'change_seq', 'id'),
     )
     
+    __mapper_args__ = {'version_id_col': version}
+    
     def __repr__(self):
         return f'<PlayerHoleScore game_id={self.game_id} player={self.player_number} hole={self.hole_number}>'
 
 
+class GameStanding(db.Model):
+    __tablename__ = 'game_standings'
+    
+    game_id = db.Column(UUID(as_uuid=True), db.ForeignKey('games.id', ondelete='CASCADE'), primary_key=True)
+    player_number = db.Column(db.Integer, primary_key=True)
+    
+    total_money = db.Column(db.Numeric(10, 2), nullable=False, default=0.0)
+    holes_played = db.Column(db.Integer, nullable=False, default=0)
+    total_points = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<GameStanding game_id={self.game_id} player={self.player_number}>'
+
+
+class GameScorecard(db.Model):
+    __tablename__ = 'game_scorecards'
+    
+    game_id = db.Column(UUID(as_uuid=True), db.ForeignKey('games.id', ondelete='CASCADE'), primary_key=True)
+    cells = db.Column(db.LargeBinary, nullable=False)
+    
+    def __repr__(self):
+        return f'<GameScorecard game_id={self.game_id}>'
+
+
+class Tombstone(db.Model):
+    __tablename__ = 'tombstones'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    entity = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(UUID(as_uuid=True), nullable=False)
+    game_id = db.Column(UUID(as_uuid=True), nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    change_seq = db.Column(db.BigInteger, default=db.null(), server_default='0',
+                           info={'internal': True})
+    
+    __table_args__ = (
+        db.Index('ix_tombstones_change_seq_id', 'change_seq', 'id'),
+    )
+    
+    def __repr__(self):
+        return f'<Tombstone {self.entity} {self.row_id}>'
+
+
+GAME_CHILD_MODELS = (SavedGameMeta, GameHoleData, GamePlayer, PlayerHoleScore)
+SYNC_MODELS = (Game, *GAME_CHILD_MODELS, Tombstone)
+SYNC_TABLES = frozenset(model.__tablename__ for model in SYNC_MODELS)
+
+def mark_sync_tables(session, table_names):
+    session.info.setdefault('sync_tables', set()).update(table_names)
+
+def assign_change_seq(session, table_names):
+    session.execute(update(sync_counter).where(sync_counter.c.id == 1).values(value=sync_counter.c.value + 1))
+    for model in SYNC_MODELS:
+        if model.__tablename__ not in table_names:
+            continue
+        table = model.__table__
+        unchanged = {column.name: column for column in table.c if column.onupdate is not None}
+        session.execute(
+            update(table)
+            .where(table.c.change_seq.is_(None))
+            .values({**unchanged, 'change_seq': CURRENT_CHANGE_SEQ})
+        )
+
+def mark_games_changed(session, game_ids):
+    session.info.setdefault('changed_games', set()).update(game_ids)
+
+def bump_child_version(session, game_ids):
+    if game_ids:
+        mark_games_changed(session, game_ids)
+        session.execute(
+            update(Game)
+            .where(Game.id.in_(game_ids))
+            .values(child_version=Game.child_version + 1, updated_at=Game.updated_at, change_seq=Game.change_seq)
+            .execution_options(synchronize_session=False)
+        )
+
+def _owning_game_id(obj):
+    game_id = obj.id if isinstance(obj, SavedGameMeta) else obj.game_id
+    if game_id is None and obj.game is not None:
+        game_id = obj.game.id
+    return game_id
+
+@event.listens_for(Session, 'before_flush')
+def _track_game_changes_on_flush(session, flush_context, instances):
+    game_ids = set()
+    for obj in list(session.deleted):
+        if isinstance(obj, Game):
+            session.add(Tombstone(entity=Game.__tablename__, row_id=obj.id, game_id=obj.id))
+            mark_games_changed(session, [obj.id])
+        elif isinstance(obj, GAME_CHILD_MODELS):
+            session.add(Tombstone(entity=obj.__tablename__, row_id=obj.id, game_id=_owning_game_id(obj)))
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, GAME_CHILD_MODELS):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        game_ids.add(_owning_game_id(obj))
+    game_ids.discard(None)
+    bump_child_version(session, game_ids)
+    mark_games_changed(session, [obj.id for obj in session.dirty if isinstance(obj, Game) and session.is_modified(obj)])
+
+@event.listens_for(Session, 'before_flush')
+def _track_sync_tables_on_flush(session, flush_context, instances):
+    mark_sync_tables(session, {obj.__tablename__ for obj in (*session.new, *session.dirty, *session.deleted)
+                               if isinstance(obj, SYNC_MODELS)})
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_sync_tables_on_execute(orm_execute_state):
+    statement = orm_execute_state.statement
+    if statement.is_dml and statement.table.name in SYNC_TABLES:
+        mark_sync_tables(orm_execute_state.session, [statement.table.name])
+
+@event.listens_for(Session, 'before_commit')
+def _assign_change_seq_on_commit(session):
+    session.flush()
+    table_names = session.info.pop('sync_tables', None)
+    if table_names:
+        assign_change_seq(session, table_names)
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _reset_sync_tables(session):
+    session.info.pop('sync_tables', None)
+
+
 roles_users = db.Table(
     'roles_users',
     db.Column('user_id', UUID(as_uuid=True), db.ForeignKey('user.id'), primary_key=True),
@@ -0,0 +1,86 @@
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ('off', 'warn', 'raise')
+DEFAULT_MAX_REPEATS = 2
+
+_active = ContextVar('query_logs', default=())
+_installed = False
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryLog:
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def repeated(self):
+        shapes = defaultdict(set)
+        for statement, parameters in self.statements:
+            shapes[statement].add(repr(parameters))
+        return {statement: len(variants) for statement, variants in shapes.items() if len(variants) > 1}
+
+    def violations(self, max_queries=None, max_repeats=DEFAULT_MAX_REPEATS):
+        problems = []
+        if max_queries is not None and self.count > max_queries:
+            problems.append(f'{self.count} queries, budget is {max_queries}')
+        if max_repeats is not None:
+            for statement, times in self.repeated().items():
+                if times > max_repeats:
+                    problems.append(f'same statement ran {times} times with different parameters '
+                                    f'(possible N+1): {" ".join(statement.split())[:300]}')
+        return problems
+
+def _record(conn, cursor, statement, parameters, context, executemany):
+    for log in _active.get():
+        log.statements.append((statement, parameters))
+
+def _install():
+    global _installed
+    if not _installed:
+        event.listen(Engine, 'before_cursor_execute', _record)
+        _installed = True
+
+@contextmanager
+def query_budget(max_queries=None, max_repeats=DEFAULT_MAX_REPEATS, action='raise', label='query budget'):
+    if action not in ACTIONS:
+        raise ValueError(f'unknown query budget action: {action}')
+    _install()
+    log = QueryLog()
+    token = _active.set(_active.get() + (log,))
+    try:
+        yield log
+    finally:
+        _active.reset(token)
+    problems = log.violations(max_queries, max_repeats) if action != 'off' else []
+    if not problems:
+        return
+    message = f'{label}: ' + '; '.join(problems)
+    if action == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+def with_query_budget(max_queries, max_repeats=DEFAULT_MAX_REPEATS):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            action = current_app.config['QUERY_BUDGET_ACTION']
+            if action == 'off':
+                return view(*args, **kwargs)
+            with query_budget(max_queries, max_repeats, action, label=request.endpoint):
+                return view(*args, **kwargs)
+        wrapper.query_budget = (max_queries, max_repeats)
+        return wrapper
+    return decorator
@@ -0,0 +1,10 @@
+from flask import Blueprint, jsonify
+from flask_security import auth_required
+from app.cache import cache
+
+cache_bp = Blueprint('cache', __name__)
+
+@cache_bp.route('/cache/stats', methods=['GET'])
+@auth_required()
+def get_cache_stats():
+    return jsonify(cache.stats())
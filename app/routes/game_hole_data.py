@@ -2,57 +2,53 @@ from flask import Blueprint, request, jsonify
 from flask_security import auth_required
 from app import db
 from app.models import GameHoleData
+from app.serializers import serializer_for, requested_fields, project
+from app.streaming import stream_json_array, wants_stream
+from app.cache import cached_json, game_version, with_game_version
+from app.etags import row_etag, precondition_failed
+from app.upsert import upsert, upsert_values
+from app.query_budget import with_query_budget
+from app.database import is_foreign_key_violation
+from sqlalchemy.exc import IntegrityError
+import uuid
 
 game_hole_data_bp = Blueprint('game_hole_data', __name__)
 
 @game_hole_data_bp.route('/game-hole-data', methods=['GET'])
 @auth_required()
+@with_query_budget(1)
 def get_game_hole_data():
-    hole_data = GameHoleData.query.all()
-    return jsonify([{
-        'id': str(data.id),
-        'game_id': str(data.game_id),
-        'hole_number': data.hole_number,
-        'hole_dollars': float(data.hole_dollars),
-        'activated_dollars': float(data.activated_dollars),
-        'pressed_count': data.pressed_count,
-        'pressed_pushed_toggle': data.pressed_pushed_toggle,
-        'alone_pushed': data.alone_pushed,
-        'roll_pushed': data.roll_pushed,
-        're_roll_pushed': data.re_roll_pushed,
-        'wolf_hole': data.wolf_hole,
-        'hole_handicap': data.hole_handicap,
-        'hole_par': data.hole_par,
-        'prox_array': data.prox_array
-    } for data in hole_data])
+    try:
+        fields = requested_fields(GameHoleData)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    query = project(GameHoleData.query, GameHoleData, fields)
+    serialize_hole_data = serializer_for(GameHoleData, fields)
+    if wants_stream():
+        return stream_json_array(query, serialize_hole_data)
+    return jsonify([serialize_hole_data(data) for data in query.all()])
 
-@game_hole_data_bp.route('/game-hole-data/<data_id>', methods=['GET'])
+@game_hole_data_bp.route('/game-hole-data/<uuid:data_id>', methods=['GET'])
 @auth_required()
+@with_query_budget(2)
 def get_game_hole_data_by_id(data_id):
-    data = GameHoleData.query.get_or_404(data_id)
-    return jsonify({
-        'id': str(data.id),
-        'game_id': str(data.game_id),
-        'hole_number': data.hole_number,
-        'hole_dollars': float(data.hole_dollars),
-        'activated_dollars': float(data.activated_dollars),
-        'pressed_count': data.pressed_count,
-        'pressed_pushed_toggle': data.pressed_pushed_toggle,
-        'alone_pushed': data.alone_pushed,
-        'roll_pushed': data.roll_pushed,
-        're_roll_pushed': data.re_roll_pushed,
-        'wolf_hole': data.wolf_hole,
-        'hole_handicap': data.hole_handicap,
-        'hole_par': data.hole_par,
-        'prox_array': data.prox_array
-    })
+    try:
+        fields = requested_fields(GameHoleData)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    def load():
+        data = project(GameHoleData.query, GameHoleData, fields, 'game_id', 'version').options(
+            with_game_version(GameHoleData)
+        ).get_or_404(data_id)
+        return data.game_id, game_version(data.game), row_etag(data), serializer_for(GameHoleData, fields)(data)
+    return cached_json(f'game_hole_data:{data_id}', load, fields)
 
 @game_hole_data_bp.route('/game-hole-data', methods=['POST'])
 @auth_required()
 def create_game_hole_data():
     data = request.json
     hole_data = GameHoleData(
-        game_id=data['game_id'],
+        game_id=uuid.UUID(data['game_id']),
         hole_number=data['hole_number'],
         hole_dollars=data.get('hole_dollars', 2.0),
         activated_dollars=data.get('activated_dollars', 0.0),
@@ -62,6 +58,7 @@ def create_game_hole_data():
         roll_pushed=data.get('roll_pushed', False),
         re_roll_pushed=data.get('re_roll_pushed', False),
         wolf_hole=data.get('wolf_hole', 0),
+        wolf_partner=data.get('wolf_partner', 0),
         hole_handicap=data.get('hole_handicap', 0),
         hole_par=data.get('hole_par', 4),
         prox_array=data.get('prox_array', False)
@@ -70,10 +67,39 @@ def create_game_hole_data():
     db.session.commit()
     return jsonify({'id': str(hole_data.id)}), 201
 
-@game_hole_data_bp.route('/game-hole-data/<data_id>', methods=['PUT'])
+@game_hole_data_bp.route('/games/<uuid:game_id>/holes/<int:hole_number>', methods=['PUT'])
+@auth_required()
+def upsert_game_hole_data(game_id, hole_number):
+    if not 1 <= hole_number <= 18:
+        return jsonify({'error': 'hole_number must be 1-18'}), 400
+    fields = ('hole_dollars', 'activated_dollars', 'pressed_count', 'pressed_pushed_toggle', 'alone_pushed',
+              'roll_pushed', 're_roll_pushed', 'wolf_hole', 'wolf_partner', 'hole_handicap', 'hole_par',
+              'prox_array')
+    try:
+        values = upsert_values(GameHoleData, request.json, fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        data_id = upsert(
+            GameHoleData,
+            {'game_id': game_id, 'hole_number': hole_number},
+            values
+        ).id
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_foreign_key_violation(e):
+            return jsonify({'error': 'Game not found'}), 404
+        return jsonify({'error': 'write conflicts with existing data'}), 409
+    return jsonify({'id': str(data_id)})
+
+@game_hole_data_bp.route('/game-hole-data/<uuid:data_id>', methods=['PUT'])
 @auth_required()
 def update_game_hole_data(data_id):
     hole_data = GameHoleData.query.get_or_404(data_id)
+    failed = precondition_failed(row_etag(hole_data))
+    if failed:
+        return failed
     data = request.json
     
     hole_data.hole_dollars = data.get('hole_dollars', hole_data.hole_dollars)
@@ -84,6 +110,7 @@ def update_game_hole_data(data_id):
     hole_data.roll_pushed = data.get('roll_pushed', hole_data.roll_pushed)
     hole_data.re_roll_pushed = data.get('re_roll_pushed', hole_data.re_roll_pushed)
     hole_data.wolf_hole = data.get('wolf_hole', hole_data.wolf_hole)
+    hole_data.wolf_partner = data.get('wolf_partner', hole_data.wolf_partner)
     hole_data.hole_handicap = data.get('hole_handicap', hole_data.hole_handicap)
     hole_data.hole_par = data.get('hole_par', hole_data.hole_par)
     hole_data.prox_array = data.get('prox_array', hole_data.prox_array)
@@ -91,10 +118,13 @@ def update_game_hole_data(data_id):
     db.session.commit()
     return jsonify({'message': 'GameHoleData updated successfully'})
 
-@game_hole_data_bp.route('/game-hole-data/<data_id>', methods=['DELETE'])
+@game_hole_data_bp.route('/game-hole-data/<uuid:data_id>', methods=['DELETE'])
 @auth_required()
 def delete_game_hole_data(data_id):
     hole_data = GameHoleData.query.get_or_404(data_id)
+    failed = precondition_failed(row_etag(hole_data))
+    if failed:
+        return failed
     db.session.delete(hole_data)
     db.session.commit()
     return jsonify({'message': 'GameHoleData deleted successfully'})
\ No newline at end of file
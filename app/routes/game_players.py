@@ -2,49 +2,53 @@ from flask import Blueprint, request, jsonify
 from flask_security import auth_required
 from app import db
 from app.models import GamePlayer
+from app.serializers import serializer_for, requested_fields, project
+from app.streaming import stream_json_array, wants_stream
+from app.cache import cached_json, game_version, with_game_version
+from app.etags import row_etag, precondition_failed
+from app.upsert import upsert, upsert_values
+from app.query_budget import with_query_budget
+from app.database import is_foreign_key_violation
+from sqlalchemy.exc import IntegrityError
+import uuid
 
 game_players_bp = Blueprint('game_players', __name__)
 
 @game_players_bp.route('/game-players', methods=['GET'])
 @auth_required()
+@with_query_budget(1)
 def get_game_players():
-    players = GamePlayer.query.all()
-    return jsonify([{
-        'id': str(player.id),
-        'game_id': str(player.game_id),
-        'player_number': player.player_number,
-        'player_name': player.player_name,
-        'is_activated': player.is_activated,
-        'handicap': player.handicap,
-        'wolf_birdie_points': player.wolf_birdie_points,
-        'wolf_eagle_points': player.wolf_eagle_points,
-        'wolf_non_eagle_points': player.wolf_non_eagle_points,
-        'non_wolf_birdie_points': player.non_wolf_birdie_points
-    } for player in players])
+    try:
+        fields = requested_fields(GamePlayer)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    query = project(GamePlayer.query, GamePlayer, fields)
+    serialize_player = serializer_for(GamePlayer, fields)
+    if wants_stream():
+        return stream_json_array(query, serialize_player)
+    return jsonify([serialize_player(player) for player in query.all()])
 
-@game_players_bp.route('/game-players/<player_id>', methods=['GET'])
+@game_players_bp.route('/game-players/<uuid:player_id>', methods=['GET'])
 @auth_required()
+@with_query_budget(2)
 def get_game_player(player_id):
-    player = GamePlayer.query.get_or_404(player_id)
-    return jsonify({
-        'id': str(player.id),
-        'game_id': str(player.game_id),
-        'player_number': player.player_number,
-        'player_name': player.player_name,
-        'is_activated': player.is_activated,
-        'handicap': player.handicap,
-        'wolf_birdie_points': player.wolf_birdie_points,
-        'wolf_eagle_points': player.wolf_eagle_points,
-        'wolf_non_eagle_points': player.wolf_non_eagle_points,
-        'non_wolf_birdie_points': player.non_wolf_birdie_points
-    })
+    try:
+        fields = requested_fields(GamePlayer)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    def load():
+        player = project(GamePlayer.query, GamePlayer, fields, 'game_id', 'version').options(
+            with_game_version(GamePlayer)
+        ).get_or_404(player_id)
+        return player.game_id, game_version(player.game), row_etag(player), serializer_for(GamePlayer, fields)(player)
+    return cached_json(f'game_players:{player_id}', load, fields)
 
 @game_players_bp.route('/game-players', methods=['POST'])
 @auth_required()
 def create_game_player():
     data = request.json
     player = GamePlayer(
-        game_id=data['game_id'],
+        game_id=uuid.UUID(data['game_id']),
         player_number=data['player_number'],
         player_name=data.get('player_name', ''),
         is_activated=data.get('is_activated', True),
@@ -58,10 +62,38 @@ def create_game_player():
     db.session.commit()
     return jsonify({'id': str(player.id)}), 201
 
-@game_players_bp.route('/game-players/<player_id>', methods=['PUT'])
+@game_players_bp.route('/games/<uuid:game_id>/players/<int:player_number>', methods=['PUT'])
+@auth_required()
+def upsert_game_player(game_id, player_number):
+    if not 1 <= player_number <= 9:
+        return jsonify({'error': 'player_number must be 1-9'}), 400
+    fields = ('player_name', 'is_activated', 'handicap', 'wolf_birdie_points', 'wolf_eagle_points',
+              'wolf_non_eagle_points', 'non_wolf_birdie_points')
+    try:
+        values = upsert_values(GamePlayer, request.json, fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        player_id = upsert(
+            GamePlayer,
+            {'game_id': game_id, 'player_number': player_number},
+            values
+        ).id
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_foreign_key_violation(e):
+            return jsonify({'error': 'Game not found'}), 404
+        return jsonify({'error': 'write conflicts with existing data'}), 409
+    return jsonify({'id': str(player_id)})
+
+@game_players_bp.route('/game-players/<uuid:player_id>', methods=['PUT'])
 @auth_required()
 def update_game_player(player_id):
     player = GamePlayer.query.get_or_404(player_id)
+    failed = precondition_failed(row_etag(player))
+    if failed:
+        return failed
     data = request.json
     
     player.player_name = data.get('player_name', player.player_name)
@@ -75,10 +107,13 @@ def update_game_player(player_id):
     db.session.commit()
     return jsonify({'message': 'GamePlayer updated successfully'})
 
-@game_players_bp.route('/game-players/<player_id>', methods=['DELETE'])
+@game_players_bp.route('/game-players/<uuid:player_id>', methods=['DELETE'])
 @auth_required()
 def delete_game_player(player_id):
     player = GamePlayer.query.get_or_404(player_id)
+    failed = precondition_failed(row_etag(player))
+    if failed:
+        return failed
     db.session.delete(player)
     db.session.commit()
     return jsonify({'message': 'GamePlayer deleted successfully'})
\ No newline at end of file
@@ -1,57 +1,158 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from flask_security import auth_required
 from app import db
-from app.models import Game
+from app.models import Game, GameStanding
+from app.serializers import serialize, serializer_for, requested_fields, project
+from app.etags import game_etag, precondition_failed
+from app.cache import cached_json, game_version
+from app.scoring import POINT_FIELDS, recompute_games
+from app.streaming import stream_json_array, wants_stream
+from app.query_budget import with_query_budget
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime
+from urllib.parse import urlencode
+import base64
+import json
 import uuid
 
 games_bp = Blueprint('games', __name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def _parse_bool(value):
+    if value.lower() in ('true', '1', 'yes'):
+        return True
+    if value.lower() in ('false', '0', 'no'):
+        return False
+    raise ValueError(f'invalid boolean: {value}')
+
+def _encode_cursor(game):
+    raw = json.dumps([game.last_saved.isoformat(), str(game.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    position = json.loads(base64.urlsafe_b64decode(padded))
+    if not isinstance(position, list) or len(position) != 2 or not all(isinstance(value, str) for value in position):
+        raise ValueError('invalid cursor')
+    last_saved, game_id = position
+    return datetime.fromisoformat(last_saved), uuid.UUID(game_id)
+
 @games_bp.route('/games', methods=['GET'])
 @auth_required()
+@with_query_budget(1)
 def get_games():
-    games = Game.query.all()
-    return jsonify([{
-        'id': str(game.id),
-        'game_name': game.game_name,
-        'hole': game.hole,
-        'last_saved': game.last_saved.isoformat(),
-        'dollars': float(game.dollars),
-        'total_dollars': float(game.total_dollars),
-        'is_continuing_game': game.is_continuing_game,
-        'pressed_button': game.pressed_button,
-        'wolf': game.wolf,
-        'wolf_birdie_points': game.wolf_birdie_points,
-        'wolf_eagle_points': game.wolf_eagle_points,
-        'wolf_non_eagle_points': game.wolf_non_eagle_points,
-        'non_wolf_birdie_points': game.non_wolf_birdie_points,
-        'prox': game.prox,
-        'created_at': game.created_at.isoformat(),
-        'updated_at': game.updated_at.isoformat()
-    } for game in games])
+    args = request.args
+    try:
+        limit = min(max(int(args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        descending = args.get('order', 'desc') != 'asc'
+        fields = requested_fields(Game)
+        query = project(Game.query, Game, fields, 'last_saved')
+        if 'is_continuing_game' in args:
+            query = query.filter(Game.is_continuing_game == _parse_bool(args['is_continuing_game']))
+        if args.get('game_name'):
+            query = query.filter(Game.game_name.startswith(args['game_name'], autoescape=True))
+        if 'last_saved_from' in args:
+            query = query.filter(Game.last_saved >= datetime.fromisoformat(args['last_saved_from']))
+        if 'last_saved_to' in args:
+            query = query.filter(Game.last_saved <= datetime.fromisoformat(args['last_saved_to']))
+        if 'cursor' in args:
+            key = tuple_(Game.last_saved, Game.id)
+            position = tuple_(*_decode_cursor(args['cursor']))
+            query = query.filter(key < position if descending else key > position)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    if descending:
+        query = query.order_by(Game.last_saved.desc(), Game.id.desc())
+    else:
+        query = query.order_by(Game.last_saved.asc(), Game.id.asc())
+    serialize_game = serializer_for(Game, fields)
+    if wants_stream():
+        return stream_json_array(query, serialize_game)
+    games = query.limit(limit + 1).all()
+    has_more = len(games) > limit
+    games = games[:limit]
 
-@games_bp.route('/games/<game_id>', methods=['GET'])
+    response = jsonify([serialize_game(game) for game in games])
+    if has_more:
+        next_cursor = _encode_cursor(games[-1])
+        response.headers['X-Next-Cursor'] = next_cursor
+        next_args = args.to_dict()
+        next_args['cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.base_url}?{urlencode(next_args)}>; rel="next"'
+    return response
+
+@games_bp.route('/games/<uuid:game_id>', methods=['GET'])
 @auth_required()
+@with_query_budget(2)
 def get_game(game_id):
-    game = Game.query.get_or_404(game_id)
-    return jsonify({
-        'id': str(game.id),
-        'game_name': game.game_name,
-        'hole': game.hole,
-        'last_saved': game.last_saved.isoformat(),
-        'dollars': float(game.dollars),
-        'total_dollars': float(game.total_dollars),
-        'is_continuing_game': game.is_continuing_game,
-        'pressed_button': game.pressed_button,
-        'wolf': game.wolf,
-        'wolf_birdie_points': game.wolf_birdie_points,
-        'wolf_eagle_points': game.wolf_eagle_points,
-        'wolf_non_eagle_points': game.wolf_non_eagle_points,
-        'non_wolf_birdie_points': game.non_wolf_birdie_points,
-        'prox': game.prox,
-        'created_at': game.created_at.isoformat(),
-        'updated_at': game.updated_at.isoformat()
-    })
+    try:
+        fields = requested_fields(Game)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    def load():
+        game = project(Game.query, Game, fields, 'updated_at', 'child_version').get_or_404(game_id)
+        return game.id, game_version(game), game_etag(game.id, game.updated_at), serializer_for(Game, fields)(game)
+    return cached_json(f'games:{game_id}', load, fields)
+
+@games_bp.route('/games/<uuid:game_id>/full', methods=['GET'])
+@auth_required()
+@with_query_budget(5)
+def get_game_full(game_id):
+    try:
+        fields = requested_fields(Game)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    def load():
+        game = project(Game.query, Game, fields, 'updated_at', 'child_version').options(
+            joinedload(Game.meta),
+            selectinload(Game.players),
+            selectinload(Game.holes),
+            selectinload(Game.scores)
+        ).get_or_404(game_id)
+        version = game_version(game)
+        return game.id, version, version, {
+            **serializer_for(Game, fields)(game),
+            'players': [serialize(player) for player in game.players],
+            'hole_data': [serialize(data) for data in game.holes],
+            'scores': [serialize(score) for score in game.scores],
+            'saved_game_meta': serialize(game.meta) if game.meta else None
+        }
+    return cached_json(f'games:{game_id}:full', load, fields)
+
+@games_bp.route('/games/<uuid:game_id>/recompute', methods=['POST'])
+@auth_required()
+def recompute_game(game_id):
+    games, results = recompute_games([game_id])
+    if not games:
+        abort(404)
+    players = [{
+        'player_number': player.player_number,
+        'player_money': round(float(results['money'][0, player.player_number - 1].sum()), 2),
+        **{field: int(results['point_totals'][0, player.player_number - 1, i])
+           for i, field in enumerate(POINT_FIELDS)}
+    } for player in games[0].players]
+    db.session.commit()
+    return jsonify({'id': str(game_id), 'players': players})
+
+@games_bp.route('/games/<uuid:game_id>/standings', methods=['GET'])
+@auth_required()
+@with_query_budget(2)
+def get_game_standings(game_id):
+    standings = GameStanding.query.filter_by(game_id=game_id).order_by(
+        GameStanding.total_money.desc(), GameStanding.player_number
+    ).all()
+    if not standings:
+        Game.query.get_or_404(game_id)
+    return jsonify([{
+        'player_number': standing.player_number,
+        'total_money': float(standing.total_money),
+        'holes_played': standing.holes_played,
+        'total_points': standing.total_points
+    } for standing in standings])
 
 @games_bp.route('/games', methods=['POST'])
 @auth_required()
@@ -75,10 +176,13 @@ def create_game():
     db.session.commit()
     return jsonify({'id': str(game.id)}), 201
 
-@games_bp.route('/games/<game_id>', methods=['PUT'])
+@games_bp.route('/games/<uuid:game_id>', methods=['PUT'])
 @auth_required()
 def update_game(game_id):
     game = Game.query.get_or_404(game_id)
+    failed = precondition_failed(game_etag(game.id, game.updated_at))
+    if failed:
+        return failed
     data = request.json
     
     game.game_name = data.get('game_name', game.game_name)
@@ -98,10 +202,13 @@ def update_game(game_id):
     db.session.commit()
     return jsonify({'message': 'Game updated successfully'})
 
-@games_bp.route('/games/<game_id>', methods=['DELETE'])
+@games_bp.route('/games/<uuid:game_id>', methods=['DELETE'])
 @auth_required()
 def delete_game(game_id):
     game = Game.query.get_or_404(game_id)
+    failed = precondition_failed(game_etag(game.id, game.updated_at))
+    if failed:
+        return failed
     db.session.delete(game)
     db.session.commit()
     return jsonify({'message': 'Game deleted successfully'})
\ No newline at end of file
@@ -0,0 +1,13 @@
+import hmac
+from flask import Blueprint, current_app, jsonify, request
+from app.metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    token = current_app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Invalid metrics token'}), 401
+    body, content_type = render_metrics()
+    return current_app.response_class(body, content_type=content_type)
@@ -1,50 +1,60 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from flask_security import auth_required
 from app import db
-from app.models import PlayerHoleScore
+from app.models import Game, GameScorecard, PlayerHoleScore, bump_child_version
+from app.serializers import serializer_for, requested_fields, project
+from app.streaming import stream_json_array, wants_stream
+from app.cache import cached_json, game_version, with_game_version
+from app.etags import game_etag, row_etag, precondition_failed
+from app.upsert import upsert, upsert_values, value_error
+from app.standings import apply_standing_deltas, refresh_standings, score_deltas
+from app.scorecards import card_from_json, card_from_scores, card_to_json, patch_scorecards, score_columns, unpack, write_scorecard
+from app.query_budget import with_query_budget
+from app.database import is_foreign_key_violation
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+import uuid
 
 player_hole_scores_bp = Blueprint('player_hole_scores', __name__)
 
+MAX_BATCH_SIZE = 9 * 18
+SCORE_INT_FIELDS = ('player_score', 'net_score', 'gross_score', 'wolf_score', 'prox_score')
+
 @player_hole_scores_bp.route('/player-hole-scores', methods=['GET'])
 @auth_required()
+@with_query_budget(1)
 def get_player_hole_scores():
-    scores = PlayerHoleScore.query.all()
-    return jsonify([{
-        'id': str(score.id),
-        'game_id': str(score.game_id),
-        'player_number': score.player_number,
-        'hole_number': score.hole_number,
-        'player_score': score.player_score,
-        'net_score': score.net_score,
-        'gross_score': score.gross_score,
-        'player_money': float(score.player_money),
-        'wolf_score': score.wolf_score,
-        'prox_score': score.prox_score
-    } for score in scores])
+    try:
+        fields = requested_fields(PlayerHoleScore)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    query = project(PlayerHoleScore.query, PlayerHoleScore, fields)
+    serialize_score = serializer_for(PlayerHoleScore, fields)
+    if wants_stream():
+        return stream_json_array(query, serialize_score)
+    return jsonify([serialize_score(score) for score in query.all()])
 
-@player_hole_scores_bp.route('/player-hole-scores/<score_id>', methods=['GET'])
+@player_hole_scores_bp.route('/player-hole-scores/<uuid:score_id>', methods=['GET'])
 @auth_required()
+@with_query_budget(2)
 def get_player_hole_score(score_id):
-    score = PlayerHoleScore.query.get_or_404(score_id)
-    return jsonify({
-        'id': str(score.id),
-        'game_id': str(score.game_id),
-        'player_number': score.player_number,
-        'hole_number': score.hole_number,
-        'player_score': score.player_score,
-        'net_score': score.net_score,
-        'gross_score': score.gross_score,
-        'player_money': float(score.player_money),
-        'wolf_score': score.wolf_score,
-        'prox_score': score.prox_score
-    })
+    try:
+        fields = requested_fields(PlayerHoleScore)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    def load():
+        score = project(PlayerHoleScore.query, PlayerHoleScore, fields, 'game_id', 'version').options(
+            with_game_version(PlayerHoleScore)
+        ).get_or_404(score_id)
+        return score.game_id, game_version(score.game), row_etag(score), serializer_for(PlayerHoleScore, fields)(score)
+    return cached_json(f'player_hole_scores:{score_id}', load, fields)
 
 @player_hole_scores_bp.route('/player-hole-scores', methods=['POST'])
 @auth_required()
 def create_player_hole_score():
     data = request.json
     score = PlayerHoleScore(
-        game_id=data['game_id'],
+        game_id=uuid.UUID(data['game_id']),
         player_number=data['player_number'],
         hole_number=data['hole_number'],
         player_score=data.get('player_score', 0),
@@ -58,10 +68,146 @@ def create_player_hole_score():
     db.session.commit()
     return jsonify({'id': str(score.id)}), 201
 
-@player_hole_scores_bp.route('/player-hole-scores/<score_id>', methods=['PUT'])
+def _batch_row_error(row, seen):
+    if not isinstance(row, dict):
+        return 'row must be an object'
+    player_number = row.get('player_number')
+    hole_number = row.get('hole_number')
+    if not isinstance(player_number, int) or isinstance(player_number, bool) or not 1 <= player_number <= 9:
+        return 'player_number must be an integer from 1 to 9'
+    if not isinstance(hole_number, int) or isinstance(hole_number, bool) or not 1 <= hole_number <= 18:
+        return 'hole_number must be an integer from 1 to 18'
+    for field in (*SCORE_INT_FIELDS, 'player_money'):
+        error = value_error(PlayerHoleScore, field, row.get(field, 0))
+        if error:
+            return error
+    if (player_number, hole_number) in seen:
+        return 'score already exists for this player and hole'
+    return None
+
+@player_hole_scores_bp.route('/games/<uuid:game_id>/scores:batch', methods=['POST'])
+@auth_required()
+def create_player_hole_scores_batch(game_id):
+    Game.query.get_or_404(game_id)
+    data = request.json
+    rows = data.get('scores') if isinstance(data, dict) else None
+    if not isinstance(rows, list) or not rows:
+        return jsonify({'error': 'scores must be a non-empty list'}), 400
+    if len(rows) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'at most {MAX_BATCH_SIZE} scores per batch'}), 400
+    
+    seen = set(db.session.execute(
+        db.select(PlayerHoleScore.player_number, PlayerHoleScore.hole_number)
+        .where(PlayerHoleScore.game_id == game_id)
+    ).tuples())
+    results = []
+    values = []
+    for index, row in enumerate(rows):
+        error = _batch_row_error(row, seen)
+        if error:
+            results.append({'index': index, 'error': error})
+            continue
+        seen.add((row['player_number'], row['hole_number']))
+        score_id = uuid.uuid4()
+        values.append({
+            'id': score_id,
+            'game_id': game_id,
+            'player_number': row['player_number'],
+            'hole_number': row['hole_number'],
+            'player_score': row.get('player_score', 0),
+            'net_score': row.get('net_score', 0),
+            'gross_score': row.get('gross_score', 0),
+            'player_money': row.get('player_money', 0.0),
+            'wolf_score': row.get('wolf_score', 0),
+            'prox_score': row.get('prox_score', 0)
+        })
+        results.append({'index': index, 'id': str(score_id)})
+    
+    if values:
+        try:
+            db.session.execute(insert(PlayerHoleScore), values)
+            apply_standing_deltas(db.session, score_deltas(values))
+            bump_child_version(db.session, [game_id])
+            patch_scorecards(db.session, values)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': 'scores conflict with a concurrent write, retry the batch'}), 409
+    
+    if not values:
+        return jsonify({'results': results}), 400
+    return jsonify({'results': results}), 201 if len(values) == len(rows) else 207
+
+@player_hole_scores_bp.route('/games/<uuid:game_id>/holes/<int:hole_number>/players/<int:player_number>/score', methods=['PUT'])
+@auth_required()
+def upsert_player_hole_score(game_id, hole_number, player_number):
+    if not 1 <= hole_number <= 18 or not 1 <= player_number <= 9:
+        return jsonify({'error': 'hole_number must be 1-18 and player_number 1-9'}), 400
+    fields = ('player_score', 'net_score', 'gross_score', 'player_money', 'wolf_score', 'prox_score')
+    try:
+        values = upsert_values(PlayerHoleScore, request.json, fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        score = upsert(
+            PlayerHoleScore,
+            {'game_id': game_id, 'player_number': player_number, 'hole_number': hole_number},
+            values,
+            returning=score_columns()
+        )
+        score_id = score.id
+        refresh_standings(db.session, [(game_id, player_number)])
+        patch_scorecards(db.session, [score._mapping])
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if is_foreign_key_violation(e):
+            return jsonify({'error': 'Game not found'}), 404
+        return jsonify({'error': 'write conflicts with existing data'}), 409
+    return jsonify({'id': str(score_id)})
+
+@player_hole_scores_bp.route('/games/<uuid:game_id>/scorecard', methods=['GET'])
+@auth_required()
+@with_query_budget(3)
+def get_scorecard(game_id):
+    def load():
+        row = db.session.execute(
+            db.select(Game.id, Game.updated_at, Game.child_version, GameScorecard.cells)
+            .outerjoin(GameScorecard, GameScorecard.game_id == Game.id)
+            .where(Game.id == game_id)
+        ).one_or_none()
+        if row is None:
+            abort(404)
+        card = unpack(row.cells) if row.cells is not None else card_from_scores(db.session, game_id)
+        version = game_version(row)
+        return game_id, version, version, {
+            'game_id': str(game_id),
+            **card_to_json(card)
+        }
+    return cached_json(f'games:{game_id}:scorecard', load)
+
+@player_hole_scores_bp.route('/games/<uuid:game_id>/scorecard', methods=['PUT'])
+@auth_required()
+def update_scorecard(game_id):
+    game = Game.query.get_or_404(game_id)
+    failed = precondition_failed(game_etag(game.id, game.updated_at, game.child_version))
+    if failed:
+        return failed
+    try:
+        card = card_from_json(request.json)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+    write_scorecard(db.session, game_id, card)
+    db.session.commit()
+    return jsonify({'message': 'Scorecard updated successfully'})
+
+@player_hole_scores_bp.route('/player-hole-scores/<uuid:score_id>', methods=['PUT'])
 @auth_required()
 def update_player_hole_score(score_id):
     score = PlayerHoleScore.query.get_or_404(score_id)
+    failed = precondition_failed(row_etag(score))
+    if failed:
+        return failed
     data = request.json
     
     score.player_score = data.get('player_score', score.player_score)
@@ -74,10 +220,13 @@ def update_player_hole_score(score_id):
     db.session.commit()
     return jsonify({'message': 'PlayerHoleScore updated successfully'})
 
-@player_hole_scores_bp.route('/player-hole-scores/<score_id>', methods=['DELETE'])
+@player_hole_scores_bp.route('/player-hole-scores/<uuid:score_id>', methods=['DELETE'])
 @auth_required()
 def delete_player_hole_score(score_id):
     score = PlayerHoleScore.query.get_or_404(score_id)
+    failed = precondition_failed(row_etag(score))
+    if failed:
+        return failed
     db.session.delete(score)
     db.session.commit()
     return jsonify({'message': 'PlayerHoleScore deleted successfully'})
\ No newline at end of file
@@ -2,59 +2,73 @@ from flask import Blueprint, request, jsonify
 from flask_security import auth_required
 from app import db
 from app.models import SavedGameMeta
+from app.serializers import serializer_for, requested_fields, project
+from app.streaming import stream_json_array, wants_stream
+from app.cache import cached_json, game_version, with_game_version
+from app.query_budget import with_query_budget
+from datetime import datetime
+import uuid
 
 saved_game_meta_bp = Blueprint('saved_game_meta', __name__)
 
 @saved_game_meta_bp.route('/saved-game-meta', methods=['GET'])
 @auth_required()
+@with_query_budget(1)
 def get_saved_game_meta():
-    metas = SavedGameMeta.query.all()
-    return jsonify([{
-        'id': str(meta.id),
-        'name': meta.name,
-        'saved_at': meta.saved_at.isoformat(),
-        'hole': meta.hole
-    } for meta in metas])
+    try:
+        fields = requested_fields(SavedGameMeta)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    query = project(SavedGameMeta.query, SavedGameMeta, fields)
+    serialize_meta = serializer_for(SavedGameMeta, fields)
+    if wants_stream():
+        return stream_json_array(query, serialize_meta)
+    return jsonify([serialize_meta(meta) for meta in query.all()])
 
-@saved_game_meta_bp.route('/saved-game-meta/<meta_id>', methods=['GET'])
+@saved_game_meta_bp.route('/saved-game-meta/<uuid:meta_id>', methods=['GET'])
 @auth_required()
+@with_query_budget(2)
 def get_saved_game_meta_by_id(meta_id):
-    meta = SavedGameMeta.query.get_or_404(meta_id)
-    return jsonify({
-        'id': str(meta.id),
-        'name': meta.name,
-        'saved_at': meta.saved_at.isoformat(),
-        'hole': meta.hole
-    })
+    try:
+        fields = requested_fields(SavedGameMeta)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    def load():
+        meta = project(SavedGameMeta.query, SavedGameMeta, fields).options(
+            with_game_version(SavedGameMeta)
+        ).get_or_404(meta_id)
+        return meta.id, game_version(meta.game), None, serializer_for(SavedGameMeta, fields)(meta)
+    return cached_json(f'saved_game_meta:{meta_id}', load, fields)
 
 @saved_game_meta_bp.route('/saved-game-meta', methods=['POST'])
 @auth_required()
 def create_saved_game_meta():
     data = request.json
     meta = SavedGameMeta(
-        id=data['id'],
+        id=uuid.UUID(data['id']),
         name=data['name'],
-        saved_at=data['saved_at'],
+        saved_at=datetime.fromisoformat(data['saved_at']),
         hole=data['hole']
     )
     db.session.add(meta)
     db.session.commit()
     return jsonify({'id': str(meta.id)}), 201
 
-@saved_game_meta_bp.route('/saved-game-meta/<meta_id>', methods=['PUT'])
+@saved_game_meta_bp.route('/saved-game-meta/<uuid:meta_id>', methods=['PUT'])
 @auth_required()
 def update_saved_game_meta(meta_id):
     meta = SavedGameMeta.query.get_or_404(meta_id)
     data = request.json
     
     meta.name = data.get('name', meta.name)
-    meta.saved_at = data.get('saved_at', meta.saved_at)
+    if 'saved_at' in data:
+        meta.saved_at = datetime.fromisoformat(data['saved_at'])
     meta.hole = data.get('hole', meta.hole)
     
     db.session.commit()
     return jsonify({'message': 'SavedGameMeta updated successfully'})
 
-@saved_game_meta_bp.route('/saved-game-meta/<meta_id>', methods=['DELETE'])
+@saved_game_meta_bp.route('/saved-game-meta/<uuid:meta_id>', methods=['DELETE'])
 @auth_required()
 def delete_saved_game_meta(meta_id):
     meta = SavedGameMeta.query.get_or_404(meta_id)
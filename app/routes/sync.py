@@ -0,0 +1,79 @@
+from flask import Blueprint, request, jsonify
+from flask_security import auth_required
+from app.models import Game, SavedGameMeta, GameHoleData, GamePlayer, PlayerHoleScore, Tombstone
+from app.serializers import all_fields, serializer_for
+from app.query_budget import with_query_budget
+from sqlalchemy import tuple_
+import base64
+import json
+import uuid
+
+sync_bp = Blueprint('sync', __name__)
+
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+
+SYNC_MODELS = (Game, SavedGameMeta, GameHoleData, GamePlayer, PlayerHoleScore)
+
+def _encode_cursor(position):
+    raw = json.dumps(position)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    position = json.loads(base64.urlsafe_b64decode(padded))
+    if not isinstance(position, dict):
+        raise ValueError('invalid cursor')
+    for name, value in position.items():
+        row_id_type = int if name == 'tombstones' else str
+        if (not isinstance(value, list) or len(value) != 2 or not all(
+                isinstance(item, kind) and not isinstance(item, bool) for item, kind in zip(value, (int, row_id_type)))):
+            raise ValueError('invalid cursor')
+    return position
+
+@sync_bp.route('/sync', methods=['GET'])
+@auth_required()
+@with_query_budget(6)
+def get_sync():
+    try:
+        limit = min(max(int(request.args.get('limit', DEFAULT_SYNC_LIMIT)), 1), MAX_SYNC_LIMIT)
+        position = _decode_cursor(request.args['since']) if 'since' in request.args else {}
+        changes = {}
+        has_more = False
+        for model in SYNC_MODELS:
+            name = model.__tablename__
+            query = model.query.filter(model.change_seq.isnot(None))
+            if name in position:
+                change_seq, row_id = position[name]
+                query = query.filter(tuple_(model.change_seq, model.id) > tuple_(int(change_seq), uuid.UUID(row_id)))
+            rows = query.order_by(model.change_seq, model.id).limit(limit + 1).all()
+            has_more = has_more or len(rows) > limit
+            rows = rows[:limit]
+            serialize_row = serializer_for(model, all_fields(model))
+            changes[name] = [serialize_row(row) for row in rows]
+            if rows:
+                position[name] = [rows[-1].change_seq, str(rows[-1].id)]
+        
+        query = Tombstone.query.filter(Tombstone.change_seq.isnot(None))
+        if 'tombstones' in position:
+            change_seq, tombstone_id = position['tombstones']
+            query = query.filter(tuple_(Tombstone.change_seq, Tombstone.id) > tuple_(int(change_seq), int(tombstone_id)))
+        tombstones = query.order_by(Tombstone.change_seq, Tombstone.id).limit(limit + 1).all()
+        has_more = has_more or len(tombstones) > limit
+        tombstones = tombstones[:limit]
+        if tombstones:
+            position['tombstones'] = [tombstones[-1].change_seq, tombstones[-1].id]
+    except (ValueError, TypeError, KeyError) as e:
+        return jsonify({'error': f'invalid sync parameters: {e}'}), 400
+    
+    return jsonify({
+        'changes': changes,
+        'deleted': [{
+            'entity': tombstone.entity,
+            'id': str(tombstone.row_id),
+            'game_id': str(tombstone.game_id),
+            'deleted_at': tombstone.deleted_at.isoformat()
+        } for tombstone in tombstones],
+        'cursor': _encode_cursor(position),
+        'has_more': has_more
+    })
@@ -0,0 +1,219 @@
+import uuid
+import numpy as np
+from decimal import Decimal
+from sqlalchemy import event, inspect, tuple_
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Game, GameScorecard, PlayerHoleScore, Tombstone, bump_child_version
+from app.scoring import PLAYERS, HOLES
+from app.standings import refresh_standings
+from app.upsert import dialect_insert
+from datetime import datetime
+
+INT_FIELDS = ('player_score', 'net_score', 'gross_score', 'wolf_score', 'prox_score')
+SCORECARD_FIELDS = INT_FIELDS + ('player_money',)
+SCORECARD_DTYPE = np.dtype([('entered', '?')] + [(field, '<i4') for field in INT_FIELDS] + [('player_money', '<i8')])
+
+def empty_card():
+    return np.zeros((PLAYERS, HOLES), dtype=SCORECARD_DTYPE)
+
+def pack(card):
+    return card.tobytes()
+
+EMPTY_CELLS = pack(empty_card())
+EMPTY_CELL = (False,) + (0,) * len(SCORECARD_FIELDS)
+KEY_FIELDS = ('game_id', 'player_number', 'hole_number')
+
+def unpack(cells):
+    return np.frombuffer(cells, dtype=SCORECARD_DTYPE).reshape(PLAYERS, HOLES)
+
+def _cents(value):
+    return int((Decimal(str(value or 0)) * 100).to_integral_value())
+
+def _cell(values):
+    cents = Decimal(str(values.get('player_money') or 0)) * 100
+    if cents != cents.to_integral_value():
+        return None
+    return (True, *(int(values.get(field) or 0) for field in INT_FIELDS), int(cents))
+
+def card_from_rows(rows):
+    card = empty_card()
+    for row in rows:
+        card[row.player_number - 1, row.hole_number - 1] = (
+            True, *(getattr(row, field) for field in INT_FIELDS), _cents(row.player_money))
+    return card
+
+def card_to_json(card):
+    return {
+        'entered': card['entered'].tolist(),
+        **{field: card[field].tolist() for field in INT_FIELDS},
+        'player_money': (card['player_money'] / 100).tolist(),
+    }
+
+def card_from_json(data):
+    if not isinstance(data, dict) or 'entered' not in data:
+        raise ValueError('entered is required')
+    unknown = set(data) - {'entered', *SCORECARD_FIELDS}
+    if unknown:
+        raise ValueError(f'unknown fields: {", ".join(sorted(unknown))}')
+    card = empty_card()
+    for field in ('entered',) + SCORECARD_FIELDS:
+        if field not in data:
+            continue
+        values = np.asarray(data[field])
+        if values.shape != (PLAYERS, HOLES):
+            raise ValueError(f'{field} must be a {PLAYERS}x{HOLES} matrix')
+        if field == 'entered':
+            if values.dtype != bool:
+                raise ValueError('entered must contain booleans')
+            card['entered'] = values
+        elif field == 'player_money':
+            if values.dtype.kind not in 'iuf' or not np.isfinite(values).all() or np.abs(values).max() >= 10 ** 8:
+                raise ValueError('player_money must contain amounts below 100000000')
+            card['player_money'] = np.round(values * 100)
+        else:
+            if values.dtype.kind not in 'iu' or np.abs(values).max() > np.iinfo(np.int32).max:
+                raise ValueError(f'{field} must contain 32-bit integers')
+            card[field] = values
+    card[~card['entered']] = empty_card()[0, 0]
+    return card
+
+def score_columns():
+    scores = PlayerHoleScore.__table__.c
+    return [scores[field] for field in KEY_FIELDS + SCORECARD_FIELDS]
+
+def store_scorecards(session, cards):
+    if not cards:
+        return
+    table = GameScorecard.__table__
+    stmt = dialect_insert(session, table)
+    stmt = stmt.on_conflict_do_update(index_elements=['game_id'], set_={'cells': stmt.excluded.cells})
+    session.execute(stmt, [{'game_id': game_id, 'cells': pack(card)} for game_id, card in cards.items()])
+
+def refresh_scorecards(session, game_ids):
+    game_ids = session.scalars(db.select(Game.id).where(Game.id.in_(list(game_ids)))).all()
+    if not game_ids:
+        return
+    rows = {game_id: [] for game_id in game_ids}
+    for row in session.execute(db.select(*score_columns()).where(PlayerHoleScore.game_id.in_(game_ids))):
+        rows[row.game_id].append(row)
+    store_scorecards(session, {game_id: card_from_rows(game_rows) for game_id, game_rows in rows.items()})
+
+def apply_scorecard_patches(session, patches):
+    if not patches:
+        return
+    cards = {}
+    for game_id, cells in session.execute(
+            db.select(GameScorecard.game_id, GameScorecard.cells).where(GameScorecard.game_id.in_(list(patches)))):
+        card = unpack(cells).copy()
+        for (player_number, hole_number), cell in patches[game_id].items():
+            card[player_number - 1, hole_number - 1] = cell
+        cards[game_id] = card
+    store_scorecards(session, cards)
+
+def card_from_scores(session, game_id):
+    return card_from_rows(session.execute(
+        db.select(*score_columns()).where(PlayerHoleScore.game_id == game_id)))
+
+def load_scorecard(session, game_id):
+    cells = session.scalar(db.select(GameScorecard.cells).where(GameScorecard.game_id == game_id))
+    if cells is not None:
+        return unpack(cells)
+    return card_from_scores(session, game_id)
+
+def write_scorecard(session, game_id, card):
+    bump_child_version(session, [game_id])
+    session.flush()
+    if game_id in session.info.get('changed_scorecards', ()) or game_id in session.info.get('scorecard_patches', ()):
+        refresh_scorecards(session, [game_id])
+    current = load_scorecard(session, game_id)
+    changed = card != current
+    written = changed & card['entered']
+    cleared = current['entered'] & ~card['entered']
+    table = PlayerHoleScore.__table__
+    if written.any():
+        stmt = dialect_insert(session, table)
+        updated = {field: stmt.excluded[field] for field in SCORECARD_FIELDS}
+        updated['version'] = table.c.version + 1
+        updated['updated_at'] = datetime.utcnow()
+        updated['change_seq'] = db.null()
+        stmt = stmt.on_conflict_do_update(index_elements=['game_id', 'player_number', 'hole_number'], set_=updated)
+        session.execute(stmt, [{
+            'game_id': game_id,
+            'player_number': int(p) + 1,
+            'hole_number': int(h) + 1,
+            **{field: int(card[field][p, h]) for field in INT_FIELDS},
+            'player_money': Decimal(int(card['player_money'][p, h])) / 100,
+        } for p, h in zip(*np.nonzero(written))])
+    if cleared.any():
+        deleted = session.scalars(db.delete(table).where(
+            table.c.game_id == game_id,
+            tuple_(table.c.player_number, table.c.hole_number).in_(
+                [(int(p) + 1, int(h) + 1) for p, h in zip(*np.nonzero(cleared))])
+        ).returning(table.c.id)).all()
+        session.execute(db.insert(Tombstone), [
+            {'entity': table.name, 'row_id': row_id, 'game_id': game_id} for row_id in deleted])
+    players = np.nonzero(changed.any(axis=1))[0]
+    refresh_standings(session, [(game_id, int(p) + 1) for p in players])
+    store_scorecards(session, {game_id: card})
+    session.info.get('changed_scorecards', set()).discard(game_id)
+    session.info.get('scorecard_patches', {}).pop(game_id, None)
+
+def mark_scorecards_changed(session, game_ids):
+    session.info.setdefault('changed_scorecards', set()).update(game_ids)
+
+def patch_scorecards(session, scores):
+    patches = session.info.setdefault('scorecard_patches', {})
+    for score in scores:
+        cell = _cell(score)
+        if cell is None:
+            mark_scorecards_changed(session, [score['game_id']])
+        else:
+            patches.setdefault(score['game_id'], {})[score['player_number'], score['hole_number']] = cell
+
+def _clear_scorecard_cells(session, scores):
+    patches = session.info.setdefault('scorecard_patches', {})
+    for score in scores:
+        patches.setdefault(score['game_id'], {})[score['player_number'], score['hole_number']] = EMPTY_CELL
+
+@event.listens_for(Session, 'before_flush')
+def _add_empty_scorecards(session, flush_context, instances):
+    for obj in list(session.new):
+        if isinstance(obj, Game):
+            if obj.id is None:
+                obj.id = uuid.uuid4()
+            session.add(GameScorecard(game_id=obj.id, cells=EMPTY_CELLS))
+
+@event.listens_for(Session, 'after_flush')
+def _track_scorecard_changes(session, flush_context):
+    written, cleared = [], []
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, PlayerHoleScore):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        if obj in session.dirty and any(state.attrs[field].history.deleted for field in KEY_FIELDS):
+            mark_scorecards_changed(session, {obj.game_id, *state.attrs.game_id.history.deleted})
+        elif obj in session.deleted and all(field in state.dict for field in KEY_FIELDS):
+            cleared.append(state.dict)
+        elif obj not in session.deleted and all(field in state.dict for field in KEY_FIELDS + SCORECARD_FIELDS):
+            written.append(state.dict)
+        else:
+            mark_scorecards_changed(session, [obj.game_id])
+    patch_scorecards(session, written)
+    _clear_scorecard_cells(session, cleared)
+
+@event.listens_for(Session, 'before_commit')
+def _refresh_changed_scorecards(session):
+    session.flush()
+    game_ids = session.info.pop('changed_scorecards', set())
+    patches = session.info.pop('scorecard_patches', {})
+    if game_ids:
+        refresh_scorecards(session, game_ids)
+    apply_scorecard_patches(session, {game_id: cells for game_id, cells in patches.items() if game_id not in game_ids})
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_scorecards(session):
+    session.info.pop('changed_scorecards', None)
+    session.info.pop('scorecard_patches', None)
@@ -0,0 +1,161 @@
+import numpy as np
+from decimal import Decimal
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import selectinload
+from app import db
+from app.models import Game, GameHoleData, GamePlayer, PlayerHoleScore, bump_child_version
+from app.standings import refresh_standings
+
+PLAYERS = 9
+HOLES = 18
+
+POINT_FIELDS = ('wolf_birdie_points', 'wolf_eagle_points', 'wolf_non_eagle_points', 'non_wolf_birdie_points')
+
+def empty_arrays(game_count):
+    return {
+        'strokes': np.zeros((game_count, PLAYERS, HOLES), dtype=np.int32),
+        'handicap': np.zeros((game_count, PLAYERS), dtype=np.int32),
+        'active': np.zeros((game_count, PLAYERS), dtype=bool),
+        'par': np.full((game_count, HOLES), 4, dtype=np.int32),
+        'hole_handicap': np.zeros((game_count, HOLES), dtype=np.int32),
+        'hole_dollars': np.zeros((game_count, HOLES), dtype=np.float64),
+        'wolf': np.zeros((game_count, HOLES), dtype=np.int32),
+        'partner': np.zeros((game_count, HOLES), dtype=np.int32),
+        'alone': np.zeros((game_count, HOLES), dtype=bool),
+        'doublings': np.zeros((game_count, HOLES), dtype=np.int32),
+        'points': np.zeros((game_count, len(POINT_FIELDS)), dtype=np.int32),
+    }
+
+def build_arrays(games):
+    arrays = empty_arrays(len(games))
+    for g, game in enumerate(games):
+        arrays['points'][g] = [getattr(game, field) for field in POINT_FIELDS]
+        for player in game.players:
+            arrays['handicap'][g, player.player_number - 1] = player.handicap
+            arrays['active'][g, player.player_number - 1] = player.is_activated
+        for hole in game.holes:
+            h = hole.hole_number - 1
+            arrays['par'][g, h] = hole.hole_par
+            arrays['hole_handicap'][g, h] = hole.hole_handicap
+            arrays['hole_dollars'][g, h] = hole.hole_dollars
+            arrays['wolf'][g, h] = hole.wolf_hole
+            arrays['partner'][g, h] = hole.wolf_partner
+            arrays['alone'][g, h] = hole.alone_pushed
+            arrays['doublings'][g, h] = hole.alone_pushed + hole.roll_pushed + hole.re_roll_pushed + hole.pressed_count
+        for score in game.scores:
+            arrays['strokes'][g, score.player_number - 1, score.hole_number - 1] = score.player_score
+    return arrays
+
+def compute(arrays):
+    strokes = arrays['strokes']
+    active = arrays['active'][:, :, None]
+    handicap = arrays['handicap'][:, :, None]
+    hole_handicap = arrays['hole_handicap'][:, None, :]
+    wolf = arrays['wolf'][:, None, :]
+    partner = arrays['partner'][:, None, :]
+    numbers = np.arange(1, PLAYERS + 1, dtype=np.int32)[None, :, None]
+
+    entered = strokes > 0
+    received = handicap // HOLES + ((hole_handicap >= 1) & (hole_handicap <= handicap % HOLES))
+    net = np.where(entered, strokes - received, 0)
+
+    is_wolf = active & (numbers == wolf)
+    on_wolf_team = is_wolf | (active & ~arrays['alone'][:, None, :] & (partner > 0) & (numbers == partner))
+    opponents = active & ~on_wolf_team
+    wolf_count = on_wolf_team.sum(axis=1)
+    opponent_count = opponents.sum(axis=1)
+    valid = ((entered | ~active).all(axis=1) & active.any(axis=1)
+             & (arrays['wolf'] > 0) & (wolf_count > 0) & (opponent_count > 0))
+
+    # Best ball decides the hole; each loser pays the stake to each winner.
+    no_score = 10_000
+    wolf_best = np.where(on_wolf_team, net, no_score).min(axis=1)
+    opponent_best = np.where(opponents, net, no_score).min(axis=1)
+    outcome = np.sign(opponent_best - wolf_best) * valid
+    stake = arrays['hole_dollars'] * np.exp2(arrays['doublings']) * valid
+    per_player = (outcome * stake)[:, None, :]
+    money = (np.where(on_wolf_team, per_player * opponent_count[:, None, :], 0.0)
+             - np.where(opponents, per_player * wolf_count[:, None, :], 0.0))
+
+    to_par = np.where(entered, strokes - arrays['par'][:, None, :], 0)
+    wolf_won = is_wolf & (outcome > 0)[:, None, :]
+    categories = np.stack([
+        wolf_won & (to_par == -1),
+        wolf_won & (to_par <= -2),
+        wolf_won & (to_par >= 0),
+        opponents & entered & (to_par <= -1),
+    ], axis=-1) & valid[:, None, :, None]
+    hole_points = categories * arrays['points'][:, None, None, :]
+
+    return {
+        'net': net,
+        'money': np.round(money, 2),
+        'wolf_score': hole_points.sum(axis=-1),
+        'point_totals': hole_points.sum(axis=2),
+        'activated_dollars': np.round(stake, 2),
+    }
+
+SCORE_RESULT_FIELDS = ('gross_score', 'net_score', 'player_money', 'wolf_score')
+
+def _changed(obj, values):
+    return any(getattr(obj, field) != value for field, value in values.items())
+
+def changed_results(games, results):
+    scores, holes, players = [], [], []
+    for g, game in enumerate(games):
+        for score in game.scores:
+            p, h = score.player_number - 1, score.hole_number - 1
+            values = {
+                'gross_score': score.player_score,
+                'net_score': int(results['net'][g, p, h]),
+                'player_money': Decimal(f"{results['money'][g, p, h]:.2f}"),
+                'wolf_score': int(results['wolf_score'][g, p, h]),
+            }
+            if _changed(score, values):
+                scores.append((score, values))
+        for hole in game.holes:
+            values = {'activated_dollars': Decimal(f"{results['activated_dollars'][g, hole.hole_number - 1]:.2f}")}
+            if _changed(hole, values):
+                holes.append((hole, values))
+        for player in game.players:
+            values = {field: int(results['point_totals'][g, player.player_number - 1, i])
+                      for i, field in enumerate(POINT_FIELDS)}
+            if _changed(player, values):
+                players.append((player, values))
+    return scores, holes, players
+
+def _update_rows(session, model, fields, changes):
+    if not changes:
+        return
+    table = model.__table__
+    stmt = update(table).where(table.c.id == bindparam('row_id')).values(
+        version=table.c.version + 1, **{field: bindparam(f'new_{field}') for field in fields})
+    session.execute(stmt, [{'row_id': obj.id, **{f'new_{field}': values[field] for field in fields}}
+                           for obj, values in changes])
+
+def apply_results(session, games, results):
+    from app.scorecards import KEY_FIELDS, SCORECARD_FIELDS, patch_scorecards
+    scores, holes, players = changed_results(games, results)
+    _update_rows(session, PlayerHoleScore, SCORE_RESULT_FIELDS, scores)
+    _update_rows(session, GameHoleData, ('activated_dollars',), holes)
+    _update_rows(session, GamePlayer, POINT_FIELDS, players)
+    game_ids = {obj.game_id for obj, _ in scores + holes + players}
+    bump_child_version(session, game_ids)
+    refresh_standings(session, {(score.game_id, score.player_number) for score, _ in scores})
+    patch_scorecards(session, [{**{field: getattr(score, field) for field in KEY_FIELDS + SCORECARD_FIELDS}, **values}
+                               for score, values in scores])
+    for obj, values in scores + holes + players:
+        session.expire(obj, [*values, 'version', 'updated_at'])
+
+def load_games(game_ids):
+    return Game.query.options(
+        selectinload(Game.players),
+        selectinload(Game.holes),
+        selectinload(Game.scores)
+    ).filter(Game.id.in_(game_ids)).all()
+
+def recompute_games(game_ids):
+    games = load_games(game_ids)
+    results = compute(build_arrays(games))
+    apply_results(db.session, games, results)
+    return games, results
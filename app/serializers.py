@@ -0,0 +1,65 @@
+from flask import request
+from sqlalchemy import Numeric
+from sqlalchemy.orm import load_only
+from app.models import Game, SavedGameMeta, GameHoleData, GamePlayer, PlayerHoleScore, GameStanding, Tombstone
+
+_SERIALIZERS = {}
+
+def _field_expression(key, column):
+    value = f'obj.{key}'
+    if isinstance(column.type, Numeric) and column.type.asdecimal:
+        if column.nullable:
+            return f'(None if {value} is None else float({value}))'
+        return f'float({value})'
+    return value
+
+def all_fields(model):
+    return frozenset(model.__mapper__.column_attrs.keys())
+
+def public_fields(model):
+    mapper = model.__mapper__
+    return frozenset(mapper.get_property_by_column(column).key
+                     for column in model.__table__.columns if not column.info.get('internal'))
+
+def build_serializer(model, only=None):
+    mapper = model.__mapper__
+    if only is None:
+        only = public_fields(model)
+    fields = []
+    for column in model.__table__.columns:
+        key = mapper.get_property_by_column(column).key
+        if key not in only:
+            continue
+        fields.append(f'        {key!r}: {_field_expression(key, column)},\n')
+    source = f'def serialize_{model.__tablename__}(obj):\n    return {{\n{"".join(fields)}    }}\n'
+    namespace = {}
+    exec(compile(source, f'<serializer {model.__name__}>', 'exec'), namespace)
+    return namespace[f'serialize_{model.__tablename__}']
+
+def serializer_for(model, only=None):
+    key = (model, only)
+    serializer = _SERIALIZERS.get(key)
+    if serializer is None:
+        serializer = _SERIALIZERS[key] = build_serializer(model, only)
+    return serializer
+
+def serialize(obj):
+    return serializer_for(type(obj))(obj)
+
+def requested_fields(model):
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+    fields = frozenset(name.strip() for name in raw.split(',') if name.strip())
+    unknown = fields - public_fields(model)
+    if not fields or unknown:
+        raise ValueError(f"unknown fields: {', '.join(sorted(unknown)) or raw}")
+    return fields
+
+def project(query, model, only, *required):
+    if only is None:
+        return query
+    return query.options(load_only(*(getattr(model, key) for key in only.union(required))))
+
+for _model in (Game, SavedGameMeta, GameHoleData, GamePlayer, PlayerHoleScore, GameStanding, Tombstone):
+    serializer_for(_model)
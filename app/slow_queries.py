@@ -0,0 +1,166 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from app.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_QUEUE_SIZE = 16
+MAX_STATEMENT_LENGTH = 2000
+EXPLAIN_PREFIXES = {
+    'postgresql': 'EXPLAIN (ANALYZE, BUFFERS) ',
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+}
+
+class RateLimiter:
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.suppressed = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                self.suppressed += 1
+                return False, 0
+            self.tokens -= 1
+            suppressed, self.suppressed = self.suppressed, 0
+            return True, suppressed
+
+def parameter_shape(parameters):
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+class SlowQueryLog:
+    def __init__(self, app):
+        config = app.config
+        self.threshold = config['SLOW_QUERY_THRESHOLD_MS'] / 1000
+        self.explain = config['SLOW_QUERY_EXPLAIN']
+        self.explain_timeout_ms = config['SLOW_QUERY_EXPLAIN_TIMEOUT_MS']
+        self.limiter = RateLimiter(config['SLOW_QUERY_LOG_PER_MINUTE'])
+        self.explained = LRUCache(max_entries=1000, ttl=config['SLOW_QUERY_EXPLAIN_INTERVAL'])
+        self.queue = queue.Queue(maxsize=EXPLAIN_QUEUE_SIZE)
+        self._worker_pid = None
+        self._worker_lock = threading.Lock()
+
+    def listen(self, engine):
+        event.listen(engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_slow_query_started', None)
+        if started is None or not context.execution_options.get('slow_query_log', True):
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed >= self.threshold:
+            self.record(conn.engine, statement, parameters, executemany, elapsed)
+
+    def record(self, engine, statement, parameters, executemany, elapsed):
+        allowed, suppressed = self.limiter.allow()
+        if not allowed:
+            return
+        entry = {
+            'duration_ms': round(elapsed * 1000, 3),
+            'endpoint': request.endpoint if has_request_context() else None,
+            'method': request.method if has_request_context() else None,
+            'statement': ' '.join(statement.split())[:MAX_STATEMENT_LENGTH],
+        }
+        if executemany:
+            entry['rows'] = len(parameters)
+            entry['parameters'] = parameter_shape(parameters[0]) if parameters else []
+        else:
+            entry['parameters'] = parameter_shape(parameters)
+        if suppressed:
+            entry['suppressed'] = suppressed
+        if not executemany and self._should_explain(engine, statement):
+            try:
+                self.queue.put_nowait((engine, statement, parameters, entry))
+                self._ensure_worker()
+                return
+            except queue.Full:
+                entry['plan_skipped'] = 'explain queue full'
+        logger.warning(json.dumps(entry))
+
+    def _should_explain(self, engine, statement):
+        if not self.explain or engine.dialect.name not in EXPLAIN_PREFIXES:
+            return False
+        if not statement.lstrip().upper().startswith('SELECT'):
+            return False
+        if self.explained.get(statement) is not None:
+            return False
+        self.explained.set(statement, True)
+        return True
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker_pid == os.getpid():
+                return
+            self._worker_pid = os.getpid()
+            threading.Thread(target=self._work, name='slow-query-explain', daemon=True).start()
+
+    def _work(self):
+        while True:
+            engine, statement, parameters, entry = self.queue.get()
+            try:
+                entry['plan'] = self._explain_plan(engine, statement, parameters)
+            except Exception as e:
+                entry['plan_error'] = str(e)
+            logger.warning(json.dumps(entry))
+            self.queue.task_done()
+
+    def _explain_plan(self, engine, statement, parameters):
+        if engine.dialect.is_async:
+            return asyncio.run(self._explain_async(engine.url, statement, parameters))
+        with engine.connect() as conn:
+            return self._run_explain(conn, statement, parameters)
+
+    async def _explain_async(self, url, statement, parameters):
+        engine = create_async_engine(url, poolclass=NullPool)
+        try:
+            async with engine.connect() as conn:
+                return await conn.run_sync(self._run_explain, statement, parameters)
+        finally:
+            await engine.dispose()
+
+    def _run_explain(self, conn, statement, parameters):
+        dialect = conn.dialect.name
+        conn = conn.execution_options(slow_query_log=False)
+        transaction = conn.begin()
+        try:
+            if dialect == 'postgresql':
+                conn.exec_driver_sql(f'SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}')
+            rows = conn.exec_driver_sql(EXPLAIN_PREFIXES[dialect] + statement, parameters).all()
+        finally:
+            transaction.rollback()
+        return '\n'.join(str(row[-1]) for row in rows)
+
+def init_slow_queries(app):
+    if app.config['SLOW_QUERY_THRESHOLD_MS'] <= 0:
+        return
+    from app import db
+    slow_queries = app.extensions['slow_queries'] = SlowQueryLog(app)
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        slow_queries.listen(engine)
@@ -0,0 +1,124 @@
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy import event, func, case, inspect, tuple_
+from sqlalchemy.orm import Session
+from app import db
+from app.models import GameStanding, PlayerHoleScore
+from app.upsert import dialect_insert
+
+KEY_FIELDS = ('game_id', 'player_number')
+TRACKED_FIELDS = KEY_FIELDS + ('player_score', 'player_money', 'wolf_score')
+
+def _standing_delta(player_score, player_money, wolf_score, sign=1):
+    return [
+        sign * Decimal(str(player_money or 0)),
+        sign * int((player_score or 0) > 0),
+        sign * (wolf_score or 0),
+    ]
+
+def _add_delta(deltas, key, delta):
+    current = deltas[key]
+    for i, value in enumerate(delta):
+        current[i] += value
+
+def apply_standing_deltas(session, deltas):
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+    table = GameStanding.__table__
+    stmt = dialect_insert(session, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(KEY_FIELDS),
+        set_={
+            'total_money': table.c.total_money + stmt.excluded.total_money,
+            'holes_played': table.c.holes_played + stmt.excluded.holes_played,
+            'total_points': table.c.total_points + stmt.excluded.total_points,
+        }
+    )
+    session.execute(stmt, [{
+        'game_id': game_id,
+        'player_number': player_number,
+        'total_money': money,
+        'holes_played': holes_played,
+        'total_points': points,
+    } for (game_id, player_number), (money, holes_played, points) in deltas.items()])
+
+def score_deltas(rows):
+    deltas = defaultdict(lambda: [Decimal('0'), 0, 0])
+    for row in rows:
+        _add_delta(deltas, (row['game_id'], row['player_number']),
+                   _standing_delta(row.get('player_score'), row.get('player_money'), row.get('wolf_score')))
+    return deltas
+
+def _aggregate_scores(keys=None):
+    scores = PlayerHoleScore.__table__.c
+    query = db.select(
+        scores.game_id,
+        scores.player_number,
+        func.coalesce(func.sum(scores.player_money), 0),
+        func.sum(case((scores.player_score > 0, 1), else_=0)),
+        func.coalesce(func.sum(scores.wolf_score), 0),
+    ).group_by(scores.game_id, scores.player_number)
+    if keys is not None:
+        query = query.where(tuple_(scores.game_id, scores.player_number).in_(list(keys)))
+    return query
+
+def refresh_standings(session, keys):
+    keys = list(keys)
+    if not keys:
+        return
+    standings = GameStanding.__table__
+    session.execute(db.delete(standings).where(
+        tuple_(standings.c.game_id, standings.c.player_number).in_(keys)))
+    session.execute(db.insert(standings).from_select(
+        ['game_id', 'player_number', 'total_money', 'holes_played', 'total_points'],
+        _aggregate_scores(keys)
+    ))
+
+def rebuild_standings(session):
+    standings = GameStanding.__table__
+    session.execute(db.delete(standings))
+    session.execute(db.insert(standings).from_select(
+        ['game_id', 'player_number', 'total_money', 'holes_played', 'total_points'],
+        _aggregate_scores()
+    ))
+
+def _committed_values(obj):
+    attrs = inspect(obj).attrs
+    values = {}
+    for field in TRACKED_FIELDS:
+        history = attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        else:
+            return None
+    return values
+
+@event.listens_for(Session, 'after_flush')
+def _maintain_standings_after_flush(session, flush_context):
+    deltas = defaultdict(lambda: [Decimal('0'), 0, 0])
+    stale_keys = set()
+    for obj in session.new:
+        if isinstance(obj, PlayerHoleScore):
+            _add_delta(deltas, (obj.game_id, obj.player_number),
+                       _standing_delta(obj.player_score, obj.player_money, obj.wolf_score))
+    for obj in list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, PlayerHoleScore):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        old = _committed_values(obj)
+        if old is None:
+            stale_keys.add((obj.game_id, obj.player_number))
+            continue
+        _add_delta(deltas, (old['game_id'], old['player_number']),
+                   _standing_delta(old['player_score'], old['player_money'], old['wolf_score'], sign=-1))
+        if obj in session.dirty:
+            _add_delta(deltas, (obj.game_id, obj.player_number),
+                       _standing_delta(obj.player_score, obj.player_money, obj.wolf_score))
+    for key in stale_keys:
+        deltas.pop(key, None)
+    apply_standing_deltas(session, deltas)
+    refresh_standings(session, stale_keys)
@@ -0,0 +1,22 @@
+from flask import current_app, request, stream_with_context
+
+STREAM_BATCH_SIZE = 1000
+
+def wants_stream():
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+def stream_json_array(query, serialize, batch_size=STREAM_BATCH_SIZE):
+    def generate():
+        yield '['
+        separator = ''
+        chunk = []
+        for row in query.yield_per(batch_size):
+            chunk.append(current_app.json.dumps(serialize(row)))
+            if len(chunk) == batch_size:
+                yield separator + ','.join(chunk)
+                separator = ','
+                chunk = []
+        if chunk:
+            yield separator + ','.join(chunk)
+        yield ']'
+    return current_app.response_class(stream_with_context(generate()), mimetype='application/json')
@@ -0,0 +1,116 @@
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from flask import request, request_started
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_timing', default=None)
+
+class RequestTiming:
+    __slots__ = ('started', 'sql_count', 'sql_time', 'durations', 'active')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.durations = {}
+        self.active = set()
+
+@contextmanager
+def measure(name):
+    timing = _current.get()
+    if timing is None or name in timing.active:
+        yield
+        return
+    timing.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.active.discard(name)
+        timing.durations[name] = timing.durations.get(name, 0.0) + time.perf_counter() - started
+
+def _measured(name, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with measure(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context._timing_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = _current.get()
+    started = getattr(context, '_timing_started', None)
+    if timing is None or started is None:
+        return
+    timing.sql_count += 1
+    timing.sql_time += time.perf_counter() - started
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+def server_timing(timing, total):
+    metrics = [f'db;dur={_ms(timing.sql_time)};desc="{timing.sql_count} queries"']
+    metrics.extend(f'{name};dur={_ms(seconds)}' for name, seconds in sorted(timing.durations.items()))
+    metrics.append(f'total;dur={_ms(total)}')
+    return ', '.join(metrics)
+
+def start_timing(sample_rate):
+    timing = RequestTiming() if sample_rate >= 1 or random.random() < sample_rate else None
+    _current.set(timing)
+    return timing
+
+def finish_timing(timing, method, path, endpoint, status):
+    total = time.perf_counter() - timing.started
+    logger.info(json.dumps({
+        'method': method,
+        'path': path,
+        'endpoint': endpoint,
+        'status': status,
+        'total_ms': _ms(total),
+        'db_ms': _ms(timing.sql_time),
+        'db_queries': timing.sql_count,
+        **{f'{name}_ms': _ms(seconds) for name, seconds in timing.durations.items()},
+    }))
+    return server_timing(timing, total)
+
+def listen_timing(engine):
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+def _start_request(app, **extra):
+    start_timing(app.config['TIMING_SAMPLE_RATE'])
+
+def _finish_request(response):
+    timing = _current.get()
+    if timing is None:
+        return response
+    response.headers['Server-Timing'] = finish_timing(timing, request.method, request.path, request.endpoint,
+                                                      response.status_code)
+    return response
+
+def _end_request(exc):
+    _current.set(None)
+
+def init_timing(app):
+    if app.config['TIMING_SAMPLE_RATE'] <= 0:
+        return
+    from app import db
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        listen_timing(engine)
+    app.json.dumps = _measured('serialize', app.json.dumps)
+    app.json.response = _measured('serialize', app.json.response)
+    request_started.connect(_start_request, app)
+    app.after_request(_finish_request)
+    app.teardown_request(_end_request)
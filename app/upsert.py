@@ -0,0 +1,57 @@
+import math
+from datetime import datetime
+from sqlalchemy import Boolean, Integer, Numeric, String
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models import bump_child_version
+
+_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+def dialect_insert(session, table):
+    return _INSERTS[session.get_bind().dialect.name](table)
+
+MAX_NUMERIC = 10 ** 8
+
+def value_error(model, field, value):
+    column_type = model.__table__.c[field].type
+    if isinstance(column_type, Boolean):
+        return None if isinstance(value, bool) else f'{field} must be a boolean'
+    if isinstance(column_type, Integer):
+        if not isinstance(value, int) or isinstance(value, bool) or not -2 ** 31 <= value < 2 ** 31:
+            return f'{field} must be a 32-bit integer'
+    elif isinstance(column_type, Numeric):
+        if (not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value)
+                or not abs(value) < MAX_NUMERIC):
+            return f'{field} must be a number below {MAX_NUMERIC}'
+    elif isinstance(column_type, String):
+        if not isinstance(value, str) or len(value) > column_type.length:
+            return f'{field} must be a string of at most {column_type.length} characters'
+    return None
+
+def upsert_values(model, data, fields):
+    if not isinstance(data, dict):
+        raise ValueError('request body must be a JSON object')
+    values = {field: data[field] for field in fields if field in data}
+    for field, value in values.items():
+        error = value_error(model, field, value)
+        if error:
+            raise ValueError(error)
+    return values
+
+def upsert_statement(dialect_name, model, key, values, returning=()):
+    table = model.__table__
+    stmt = _INSERTS[dialect_name](table).values(**key, **values)
+    updated = {name: stmt.excluded[name] for name in values}
+    updated['version'] = table.c.version + 1
+    updated['updated_at'] = datetime.utcnow()
+    updated['change_seq'] = db.null()
+    return stmt.on_conflict_do_update(index_elements=list(key), set_=updated).returning(table.c.id, *returning)
+
+def upsert(model, key, values, returning=()):
+    stmt = upsert_statement(db.session.get_bind().dialect.name, model, key, values, returning)
+    row = db.session.execute(stmt).one()
+    bump_child_version(db.session, [key['game_id']])
+    return row
@@ -0,0 +1,8 @@
+from app import create_app
+from app.asgi import create_asgi_app
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+app = create_asgi_app(create_app(os.environ.get('FLASK_ENV', 'default')))
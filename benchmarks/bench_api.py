@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from sqlalchemy.engine import make_url
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLUEPRINTS = ('index', 'games', 'saved_game_meta', 'game_hole_data', 'game_players', 'player_hole_scores',
+              'sync', 'cache', 'metrics')
+
+CASES = {
+    'index.index': lambda c: ('GET', '/', None),
+    'games.get_games': lambda c: ('GET', '/api/games?limit=100', None),
+    'games.get_game': lambda c: ('GET', f'/api/games/{c.game()}', None),
+    'games.get_game_full': lambda c: ('GET', f'/api/games/{c.game()}/full', None),
+    'games.get_game_standings': lambda c: ('GET', f'/api/games/{c.game()}/standings', None),
+    'games.recompute_game': lambda c: ('POST', f'/api/games/{c.game()}/recompute', None),
+    'games.create_game': lambda c: ('POST', '/api/games', {'game_name': 'Bench Game'}),
+    'games.update_game': lambda c: ('PUT', f'/api/games/{c.game()}', {'hole': c.rng.randint(1, 18)}),
+    'games.delete_game': lambda c: ('DELETE', f'/api/games/{c.new_game()}', None),
+    'saved_game_meta.get_saved_game_meta': lambda c: ('GET', '/api/saved-game-meta', None),
+    'saved_game_meta.get_saved_game_meta_by_id': lambda c: ('GET', f'/api/saved-game-meta/{c.row("metas")}', None),
+    'saved_game_meta.create_saved_game_meta': lambda c: ('POST', '/api/saved-game-meta', {
+        'id': c.new_game(), 'name': 'Bench Save', 'saved_at': datetime.utcnow().isoformat(), 'hole': 9}),
+    'saved_game_meta.update_saved_game_meta': lambda c: ('PUT', f'/api/saved-game-meta/{c.row("metas")}',
+                                                         {'hole': c.rng.randint(1, 18)}),
+    'saved_game_meta.delete_saved_game_meta': lambda c: ('DELETE', f'/api/saved-game-meta/{c.new_game(meta=True)}',
+                                                         None),
+    'game_hole_data.get_game_hole_data': lambda c: ('GET', '/api/game-hole-data', None),
+    'game_hole_data.get_game_hole_data_by_id': lambda c: ('GET', f'/api/game-hole-data/{c.row("holes")}', None),
+    'game_hole_data.create_game_hole_data': lambda c: ('POST', '/api/game-hole-data', {
+        'game_id': c.new_game(), 'hole_number': 1, 'wolf_hole': 1}),
+    'game_hole_data.upsert_game_hole_data': lambda c: ('PUT', f'/api/games/{c.game()}/holes/{c.rng.randint(1, 18)}',
+                                                       {'alone_pushed': c.rng.random() < 0.2}),
+    'game_hole_data.update_game_hole_data': lambda c: ('PUT', f'/api/game-hole-data/{c.row("holes")}',
+                                                       {'roll_pushed': c.rng.random() < 0.2}),
+    'game_hole_data.delete_game_hole_data': lambda c: ('DELETE', f'/api/game-hole-data/{c.new_child("holes")}', None),
+    'game_players.get_game_players': lambda c: ('GET', '/api/game-players', None),
+    'game_players.get_game_player': lambda c: ('GET', f'/api/game-players/{c.row("players")}', None),
+    'game_players.create_game_player': lambda c: ('POST', '/api/game-players', {
+        'game_id': c.new_game(), 'player_number': 1, 'player_name': 'Bench Player'}),
+    'game_players.upsert_game_player': lambda c: ('PUT', f'/api/games/{c.game()}/players/{c.rng.randint(1, 4)}',
+                                                  {'handicap': c.rng.randint(0, 24)}),
+    'game_players.update_game_player': lambda c: ('PUT', f'/api/game-players/{c.row("players")}',
+                                                  {'handicap': c.rng.randint(0, 24)}),
+    'game_players.delete_game_player': lambda c: ('DELETE', f'/api/game-players/{c.new_child("players")}', None),
+    'player_hole_scores.get_player_hole_scores': lambda c: ('GET', '/api/player-hole-scores', None),
+    'player_hole_scores.get_player_hole_score': lambda c: ('GET', f'/api/player-hole-scores/{c.row("scores")}', None),
+    'player_hole_scores.create_player_hole_score': lambda c: ('POST', '/api/player-hole-scores', {
+        'game_id': c.new_game(), 'player_number': 1, 'hole_number': 1, 'player_score': 4}),
+    'player_hole_scores.create_player_hole_scores_batch': lambda c: ('POST', f'/api/games/{c.new_game()}/scores:batch', {
+        'scores': [{'player_number': p, 'hole_number': h, 'player_score': c.rng.randint(3, 7)}
+                   for p in range(1, 5) for h in range(1, 19)]}),
+    'player_hole_scores.upsert_player_hole_score': lambda c: (
+        'PUT', f'/api/games/{c.game()}/holes/{c.rng.randint(1, 18)}/players/{c.rng.randint(1, 4)}/score',
+        {'player_score': c.rng.randint(3, 7), 'player_money': c.rng.choice((-2.0, 0.0, 2.0))}),
+    'player_hole_scores.get_scorecard': lambda c: ('GET', f'/api/games/{c.game()}/scorecard', None),
+    'player_hole_scores.update_scorecard': lambda c: c.update_scorecard(),
+    'player_hole_scores.update_player_hole_score': lambda c: ('PUT', f'/api/player-hole-scores/{c.row("scores")}',
+                                                              {'player_score': c.rng.randint(3, 7)}),
+    'player_hole_scores.delete_player_hole_score': lambda c: ('DELETE', f'/api/player-hole-scores/{c.new_child("scores")}',
+                                                              None),
+    'sync.get_sync': lambda c: ('GET', '/api/sync?limit=500', None),
+    'cache.get_cache_stats': lambda c: ('GET', '/api/cache/stats', None),
+    'metrics.get_metrics': lambda c: ('GET', '/metrics', None),
+}
+
+class BenchContext:
+    def __init__(self, app, game_ids, seed):
+        from app import db
+        from app.models import GameHoleData, GamePlayer, PlayerHoleScore, SavedGameMeta
+        self.app = app
+        self.rng = random.Random(seed)
+        self.game_ids = [str(game_id) for game_id in game_ids]
+        with app.app_context():
+            self.rows = {
+                name: [str(row_id) for row_id in db.session.scalars(
+                    db.select(model.id).where(model.id.in_(game_ids) if model is SavedGameMeta
+                                              else model.game_id.in_(game_ids)))]
+                for name, model in (('metas', SavedGameMeta), ('holes', GameHoleData),
+                                    ('players', GamePlayer), ('scores', PlayerHoleScore))
+            }
+
+    def game(self):
+        return self.rng.choice(self.game_ids)
+
+    def row(self, name):
+        return self.rng.choice(self.rows[name])
+
+    def update_scorecard(self):
+        from app import db
+        from app.scorecards import card_to_json, load_scorecard
+        game_id = self.game()
+        with self.app.app_context():
+            card = card_to_json(load_scorecard(db.session, uuid.UUID(game_id)))
+        for _ in range(3):
+            p, h = self.rng.randrange(9), self.rng.randrange(18)
+            if card['entered'][p][h]:
+                card['player_score'][p][h] = self.rng.randint(3, 7)
+        return 'PUT', f'/api/games/{game_id}/scorecard', card
+
+    def new_game(self, meta=False):
+        from app import db
+        from app.models import Game, SavedGameMeta
+        with self.app.app_context():
+            game = Game(game_name='Bench Scratch Game')
+            if meta:
+                game.meta = SavedGameMeta(name='Bench Scratch Save', saved_at=datetime.utcnow(), hole=1)
+            db.session.add(game)
+            db.session.commit()
+            return str(game.id)
+
+    def new_child(self, name):
+        from app import db
+        from app.models import Game, GameHoleData, GamePlayer, PlayerHoleScore
+        with self.app.app_context():
+            game = Game(game_name='Bench Scratch Game')
+            child = {
+                'holes': lambda: GameHoleData(hole_number=1, wolf_hole=1),
+                'players': lambda: GamePlayer(player_number=1, player_name='Scratch'),
+                'scores': lambda: PlayerHoleScore(player_number=1, hole_number=1, player_score=4),
+            }[name]()
+            getattr(game, name).append(child)
+            db.session.add(game)
+            db.session.commit()
+            return str(child.id)
+
+def summarize(latencies, errors):
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        'requests': count,
+        'errors': errors,
+        'p50_ms': round(latencies[count // 2] * 1000, 3),
+        'p99_ms': round(latencies[min(count - 1, int(count * 0.99))] * 1000, 3),
+        'rps': round(count / sum(latencies), 1),
+    }
+
+def bench_endpoint(client, headers, context, case, args):
+    for _ in range(args.warmup):
+        method, url, body = case(context)
+        client.open(url, method=method, json=body, headers=headers).get_data()
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + args.max_seconds
+    while len(latencies) < args.requests and (len(latencies) < args.min_requests or time.monotonic() < deadline):
+        method, url, body = case(context)
+        started = time.perf_counter()
+        response = client.open(url, method=method, json=body, headers=headers)
+        response.get_data()
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors += 1
+    return summarize(latencies, errors)
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f'\n{"size":>6} {"endpoint":56} {"p50 ms":>9} {"base":>9} {"change":>8}')
+    for size, endpoints in results['results'].items():
+        for endpoint, current in endpoints.items():
+            previous = baseline['results'].get(size, {}).get(endpoint)
+            if previous is None:
+                continue
+            change = current['p50_ms'] / previous['p50_ms'] - 1 if previous['p50_ms'] else 0
+            flag = ''
+            if change > threshold:
+                flag = '  REGRESSION'
+                regressions.append((size, endpoint))
+            print(f'{size:>6} {endpoint:56} {current["p50_ms"]:9.2f} {previous["p50_ms"]:9.2f} {change:+8.0%}{flag}')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure latency and throughput of every API endpoint.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000], help='Game counts to benchmark.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and size.')
+    parser.add_argument('--min-requests', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=5, help='Time budget per endpoint and size.')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--endpoints', nargs='+', choices=sorted(CASES), help='Only benchmark these endpoints.')
+    parser.add_argument('--database-url', help='Scratch database to use instead of a temporary SQLite file.')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the read cache.')
+    parser.add_argument('--output', help='Write results as JSON to this path.')
+    parser.add_argument('--baseline', help='Compare against results previously written with --output.')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed p50 slowdown before failing.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = args.database_url or f'sqlite:///{os.path.join(tmp, "bench.db")}'
+        if args.no_cache:
+            os.environ['CACHE_BACKEND'] = 'app.cache.NullCache'
+        sys.path.insert(0, ROOT)
+        from app import create_app, db
+        from benchmarks.datagen import create_bench_user, generate_games
+        app = create_app('production')
+        with app.app_context():
+            db.create_all()
+            user = create_bench_user(db.session)
+            with app.test_request_context():
+                token = user.get_auth_token()
+        headers = {'Authentication-Token': token, 'Accept': 'application/json'}
+        client = app.test_client(use_cookies=False)
+
+        covered = {rule.endpoint for rule in app.url_map.iter_rules() if rule.endpoint.split('.')[0] in BLUEPRINTS}
+        missing = covered - set(CASES)
+        if missing:
+            print(f'warning: no benchmark case for {", ".join(sorted(missing))}', file=sys.stderr)
+
+        results = {
+            'meta': {
+                'created_at': datetime.utcnow().isoformat(),
+                'seed': args.seed,
+                'database': make_url(os.environ['DATABASE_URL']).get_backend_name(),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'cache': not args.no_cache,
+            },
+            'results': {},
+        }
+        game_ids = []
+        for size in sorted(args.sizes):
+            with app.app_context():
+                game_ids += generate_games(db.session, size - len(game_ids), seed=args.seed, start=len(game_ids))
+            context = BenchContext(app, game_ids, args.seed)
+            print(f'\n{size} games')
+            print(f'{"endpoint":56} {"req/s":>9} {"p50 ms":>9} {"p99 ms":>9} {"n":>5}')
+            size_results = results['results'][str(size)] = {}
+            for endpoint in args.endpoints or CASES:
+                result = size_results[endpoint] = bench_endpoint(client, headers, context, CASES[endpoint], args)
+                errors = f'  {result["errors"]} errors' if result['errors'] else ''
+                print(f'{endpoint:56} {result["rps"]:9.1f} {result["p50_ms"]:9.2f} {result["p99_ms"]:9.2f} '
+                      f'{result["requests"]:5}{errors}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} endpoints regressed by more than {args.threshold:.0%}')
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
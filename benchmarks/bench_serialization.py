@@ -0,0 +1,63 @@
+import json
+import timeit
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.json_provider import FastJSONProvider
+from app.models import PlayerHoleScore
+from app.serializers import serializer_for
+
+ROWS = 5000
+REPEAT = 5
+
+def make_rows():
+    game_id = uuid.uuid4()
+    now = datetime.utcnow()
+    return [PlayerHoleScore(
+        id=uuid.uuid4(),
+        game_id=game_id,
+        hole_number=i % 18 + 1,
+        player_number=i % 9 + 1,
+        player_score=4,
+        player_money=Decimal('2.50'),
+        wolf_score=1,
+        gross_score=4,
+        net_score=3,
+        prox_score=0,
+        version=1,
+        updated_at=now
+    ) for i in range(ROWS)]
+
+def handwritten(score):
+    return {
+        'id': str(score.id),
+        'game_id': str(score.game_id),
+        'hole_number': score.hole_number,
+        'player_number': score.player_number,
+        'player_score': score.player_score,
+        'player_money': float(score.player_money),
+        'wolf_score': score.wolf_score,
+        'gross_score': score.gross_score,
+        'net_score': score.net_score,
+        'prox_score': score.prox_score
+    }
+
+def main():
+    rows = make_rows()
+    app = Flask(__name__)
+    baseline = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    serialize = serializer_for(PlayerHoleScore)
+    cases = {
+        'handwritten + DefaultJSONProvider': lambda: baseline.dumps([handwritten(row) for row in rows]),
+        'registry + FastJSONProvider': lambda: fast.dumps([serialize(row) for row in rows]),
+    }
+    assert json.loads(cases['handwritten + DefaultJSONProvider']()) == json.loads(cases['registry + FastJSONProvider']())
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=REPEAT))
+        print(f'{name:36} {best * 1e6 / ROWS:8.2f} us/row')
+
+if __name__ == '__main__':
+    main()
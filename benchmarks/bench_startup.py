@@ -0,0 +1,53 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import json, resource, sys, time
+started = time.perf_counter()
+from app import create_app
+app = create_app(sys.argv[1], api_only=sys.argv[2] == 'api')
+elapsed = time.perf_counter() - started
+rss = None
+try:
+    with open('/proc/self/status') as status:
+        rss = next(int(line.split()[1]) for line in status if line.startswith('VmRSS:')) * 1024
+except OSError:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+print(json.dumps({'seconds': elapsed, 'rss': rss, 'modules': len(sys.modules)}))
+'''
+
+def probe(mode, config_name, env):
+    output = subprocess.run([sys.executable, '-c', PROBE, config_name, mode], cwd=ROOT, env=env,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare cold-start time and memory of the full and API-only apps.')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters per mode.')
+    parser.add_argument('--config', default='production')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, 'DATABASE_URL': os.environ.get('DATABASE_URL') or f'sqlite:///{os.path.join(tmp, "bench.db")}'}
+        env.pop('API_ONLY', None)
+        results = {mode: [] for mode in ('full', 'api')}
+        for _ in range(args.runs):
+            for mode in results:
+                results[mode].append(probe(mode, args.config, env))
+
+    print(f'{"mode":6} {"startup ms":>11} {"RSS MB":>8} {"modules":>8}')
+    for mode, runs in results.items():
+        seconds = statistics.median(run['seconds'] for run in runs)
+        rss = statistics.median(run['rss'] for run in runs)
+        modules = statistics.median(run['modules'] for run in runs)
+        print(f'{mode:6} {seconds * 1000:11.0f} {rss / 2 ** 20:8.1f} {modules:8.0f}')
+
+if __name__ == '__main__':
+    main()
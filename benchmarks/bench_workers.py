@@ -0,0 +1,115 @@
+import argparse
+import http.client
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ('sync', 'gthread', 'gevent')
+
+def seed(database_url, games):
+    os.environ['DATABASE_URL'] = database_url
+    sys.path.insert(0, ROOT)
+    from app import create_app, db
+    from benchmarks.datagen import create_bench_user, generate_games
+    app = create_app('production')
+    with app.app_context():
+        db.create_all()
+        user = create_bench_user(db.session)
+        game_ids = [str(game_id) for game_id in generate_games(db.session, games)]
+        with app.test_request_context():
+            token = user.get_auth_token()
+    return token, game_ids
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not start on port {port}')
+
+def run_load(port, token, paths, concurrency, duration):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        failed = 0
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', random.choice(paths), headers={'Authentication-Token': token})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / duration,
+        'p50': latencies[len(latencies) // 2] * 1000 if latencies else 0,
+        'p99': latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0,
+        'errors': errors[0],
+    }
+
+def bench_mode(mode, port, env, token, paths, args):
+    env = dict(env, PORT=str(port), GUNICORN_WORKER_CLASS=mode)
+    if args.workers:
+        env['WEB_CONCURRENCY'] = str(args.workers)
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        run_load(port, token, paths, args.concurrency, 2)
+        return run_load(port, token, paths, args.concurrency, args.duration)
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare gunicorn worker classes against the API.')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f'sqlite:///{os.path.join(tmp, "bench.db")}'
+        token, game_ids = seed(database_url, args.games)
+        paths = ['/api/games?limit=50'] + [f'/api/games/{game_id}/full' for game_id in game_ids]
+        env = dict(os.environ, DATABASE_URL=database_url, FLASK_ENV='production')
+        print(f'{"mode":10} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"errors":>7}')
+        for mode in args.modes:
+            result = bench_mode(mode, args.port, env, token, paths, args)
+            print(f'{mode:10} {result["rps"]:9.1f} {result["p50"]:8.1f} {result["p99"]:8.1f} {result["errors"]:7}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import random
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app import db
+from app.models import Game, GameHoleData, GamePlayer, PlayerHoleScore, Role, SavedGameMeta, User
+from app.scorecards import refresh_scorecards
+from app.standings import rebuild_standings
+
+HOLES = 18
+PARS = (4, 4, 3, 5, 4, 4, 3, 4, 5, 4, 3, 4, 5, 4, 4, 3, 4, 5)
+EPOCH = datetime(2026, 1, 1, 8, 0)
+STROKES_OVER_PAR = (-1, 0, 0, 0, 1, 1, 1, 2, 3)
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+def generate_game(seed, index):
+    rng = random.Random(f'{seed}:{index}')
+    game_id = _uuid(rng)
+    started = EPOCH + timedelta(minutes=index * 17 + rng.randint(0, 16))
+    player_count = rng.randint(4, 9)
+    dollars = Decimal(rng.choice(('1.00', '2.00', '5.00')))
+    game = {
+        'id': game_id,
+        'game_name': f'Round {index}',
+        'hole': HOLES,
+        'last_saved': started + timedelta(hours=4),
+        'created_at': started,
+        'updated_at': started + timedelta(hours=4),
+        'dollars': dollars,
+        'is_continuing_game': rng.random() < 0.2,
+        'wolf': rng.randint(1, player_count),
+        'wolf_birdie_points': 2,
+        'wolf_eagle_points': 4,
+        'wolf_non_eagle_points': 1,
+        'non_wolf_birdie_points': 1,
+    }
+    players = [{
+        'id': _uuid(rng),
+        'game_id': game_id,
+        'player_number': number,
+        'player_name': f'Player {number}',
+        'handicap': rng.randint(0, 24),
+    } for number in range(1, player_count + 1)]
+    hole_handicaps = rng.sample(range(1, HOLES + 1), HOLES)
+    holes = []
+    for h in range(HOLES):
+        wolf = h % player_count + 1
+        holes.append({
+            'id': _uuid(rng),
+            'game_id': game_id,
+            'hole_number': h + 1,
+            'hole_par': PARS[h],
+            'hole_handicap': hole_handicaps[h],
+            'hole_dollars': dollars,
+            'wolf_hole': wolf,
+            'wolf_partner': rng.choice([0] + [p for p in range(1, player_count + 1) if p != wolf]),
+            'alone_pushed': rng.random() < 0.15,
+            'roll_pushed': rng.random() < 0.05,
+        })
+    scores = []
+    for player in players:
+        for h in range(HOLES):
+            gross = PARS[h] + rng.choice(STROKES_OVER_PAR)
+            received = player['handicap'] // HOLES + (hole_handicaps[h] <= player['handicap'] % HOLES)
+            scores.append({
+                'id': _uuid(rng),
+                'game_id': game_id,
+                'player_number': player['player_number'],
+                'hole_number': h + 1,
+                'player_score': gross,
+                'gross_score': gross,
+                'net_score': gross - received,
+                'player_money': dollars * rng.choice((-3, -2, -1, -1, 0, 1, 1, 2, 3)),
+                'wolf_score': rng.choice((0, 0, 0, 1, 2)),
+                'prox_score': int(PARS[h] == 3 and rng.random() < 0.3),
+            })
+    meta = None
+    if rng.random() < 0.5:
+        meta = {'id': game_id, 'name': f'Round {index}', 'saved_at': game['last_saved'], 'hole': HOLES}
+    return game, players, holes, scores, meta
+
+def generate_games(session, count, seed=0, start=0, batch_size=200):
+    game_ids = []
+    for offset in range(start, start + count, batch_size):
+        rows = {Game: [], GamePlayer: [], GameHoleData: [], PlayerHoleScore: [], SavedGameMeta: []}
+        for index in range(offset, min(offset + batch_size, start + count)):
+            game, players, holes, scores, meta = generate_game(seed, index)
+            rows[Game].append(game)
+            rows[GamePlayer].extend(players)
+            rows[GameHoleData].extend(holes)
+            rows[PlayerHoleScore].extend(scores)
+            if meta:
+                rows[SavedGameMeta].append(meta)
+        for model, values in rows.items():
+            if values:
+                session.execute(db.insert(model), values)
+        batch_ids = [game['id'] for game in rows[Game]]
+        refresh_scorecards(session, batch_ids)
+        game_ids.extend(batch_ids)
+    rebuild_standings(session)
+    session.commit()
+    return game_ids
+
+def create_bench_user(session, email='bench@example.com', password='bench-password'):
+    from flask_security import hash_password
+    user = User(email=email, password=hash_password(password), active=True,
+                fs_uniquifier=uuid.uuid4().hex, confirmed_at=datetime.utcnow())
+    user.roles.append(Role(name='user'))
+    session.add(user)
+    session.commit()
+    return user
@@ -1,5 +1,38 @@
 import os
 
+def _env_flag(name, default='false'):
+    return os.environ.get(name, default).lower() in ['true', 'on', '1']
+
+def engine_options(database_uri, pool_size, max_overflow):
+    options = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE') or pool_size),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW') or max_overflow),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT') or 10),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE') or 1800),
+        'pool_pre_ping': _env_flag('DB_POOL_PRE_PING', 'true'),
+    }
+    if not database_uri.startswith('postgresql'):
+        return options
+    if _env_flag('DB_PGBOUNCER'):
+        if database_uri.startswith('postgresql+psycopg:'):
+            options['connect_args'] = {'prepare_threshold': None}
+        elif database_uri.startswith('postgresql+asyncpg:'):
+            options['connect_args'] = {'statement_cache_size': 0, 'prepared_statement_cache_size': 0}
+        return options
+    statement_timeout = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS') or 30000)
+    if database_uri.startswith('postgresql+asyncpg:'):
+        options['connect_args'] = {'server_settings': {'statement_timeout': str(statement_timeout)}}
+    else:
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
+def async_database_uri(database_uri):
+    if database_uri.startswith('postgresql://'):
+        return database_uri.replace('postgresql://', 'postgresql+asyncpg://', 1)
+    if database_uri.startswith('sqlite://'):
+        return database_uri.replace('sqlite://', 'sqlite+aiosqlite://', 1)
+    return database_uri
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
     DATABASE_URL = os.environ.get('DATABASE_URL')
@@ -7,6 +40,35 @@ class Config:
         DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
     SQLALCHEMY_DATABASE_URI = DATABASE_URL or 'sqlite:///wolf_scoring.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, pool_size=5, max_overflow=10)
+    ASYNC_DATABASE_URI = os.environ.get('ASYNC_DATABASE_URL') or async_database_uri(SQLALCHEMY_DATABASE_URI)
+    ASYNC_ENGINE_OPTIONS = engine_options(ASYNC_DATABASE_URI, pool_size=20, max_overflow=10)
+    DB_PGBOUNCER = _env_flag('DB_PGBOUNCER')
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS') or 30000)
+    
+    API_ONLY = _env_flag('API_ONLY')
+    
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER') or 'app.json_provider.FastJSONProvider'
+    
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or 500)
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL') or 6)
+    COMPRESS_BR_LEVEL = int(os.environ.get('COMPRESS_BR_LEVEL') or 4)
+    COMPRESS_MIMETYPES = ('application/json', 'text/html', 'text/css', 'text/plain', 'application/javascript')
+    MAX_DECOMPRESSED_REQUEST_SIZE = int(os.environ.get('MAX_DECOMPRESSED_REQUEST_SIZE') or 10 * 1024 * 1024)
+    
+    TIMING_SAMPLE_RATE = float(os.environ.get('TIMING_SAMPLE_RATE') or 0)
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS') or 0)
+    SLOW_QUERY_LOG_PER_MINUTE = int(os.environ.get('SLOW_QUERY_LOG_PER_MINUTE') or 60)
+    SLOW_QUERY_EXPLAIN = _env_flag('SLOW_QUERY_EXPLAIN')
+    SLOW_QUERY_EXPLAIN_INTERVAL = int(os.environ.get('SLOW_QUERY_EXPLAIN_INTERVAL') or 300)
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.environ.get('SLOW_QUERY_EXPLAIN_TIMEOUT_MS') or 10000)
+    QUERY_BUDGET_ACTION = os.environ.get('QUERY_BUDGET_ACTION') or 'off'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND') or 'app.cache.LRUCache'
+    CACHE_TTL = int(os.environ.get('CACHE_TTL') or 60)
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES') or 10000)
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL') or os.environ.get('REDIS_URL')
     
     SECURITY_PASSWORD_SALT = os.environ.get('SECURITY_PASSWORD_SALT') or 'default-salt'
     SECURITY_REGISTERABLE = True
@@ -23,6 +85,11 @@ class Config:
     SECURITY_SEND_REGISTER_EMAIL = False
     SECURITY_SEND_PASSWORD_CHANGE_EMAIL = False
     SECURITY_SEND_PASSWORD_RESET_EMAIL = False
+    SECURITY_TOKEN_AUTHENTICATION_HEADER = 'Authentication-Token'
+    SECURITY_TOKEN_MAX_AGE = int(os.environ.get('SECURITY_TOKEN_MAX_AGE') or 30 * 24 * 3600)
+    
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL') or 30)
+    IDENTITY_CACHE_MAX_ENTRIES = int(os.environ.get('IDENTITY_CACHE_MAX_ENTRIES') or 10000)
     
     FLASK_ADMIN_SWATCH = 'cerulean'
     
@@ -35,6 +102,8 @@ class Config:
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config.SQLALCHEMY_DATABASE_URI, pool_size=2, max_overflow=3)
+    QUERY_BUDGET_ACTION = os.environ.get('QUERY_BUDGET_ACTION') or 'warn'
     SECURITY_PASSWORD_SALT = 'dev-salt'
     SECURITY_REGISTERABLE = True
     SECURITY_SEND_REGISTER_EMAIL = False
@@ -42,6 +111,7 @@ class DevelopmentConfig(Config):
 
 class ProductionConfig(Config):
     DEBUG = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config.SQLALCHEMY_DATABASE_URI, pool_size=5, max_overflow=5)
     SECURITY_REGISTERABLE = False
     SECURITY_SEND_REGISTER_EMAIL = True
     SECURITY_SEND_PASSWORD_CHANGE_EMAIL = True
@@ -53,6 +123,10 @@ class TestingConfig(Config):
     TESTING = True
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    ASYNC_DATABASE_URI = 'sqlite+aiosqlite:///:memory:'
+    ASYNC_ENGINE_OPTIONS = {}
+    QUERY_BUDGET_ACTION = 'raise'
     WTF_CSRF_ENABLED = False
     SECURITY_PASSWORD_SALT = 'test-salt'
     SECURITY_REGISTERABLE = True
@@ -2,21 +2,30 @@ import pytest
 import tempfile
 import os
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
-from flask_security import Security, SQLAlchemyUserDatastore
+from werkzeug.utils import import_string
+from app import db
+from flask_security import Security
 from app.models import User, Role, Game, GamePlayer, GameHoleData, PlayerHoleScore, SavedGameMeta
 from config import TestingConfig
 
-db = SQLAlchemy()
 
-def create_test_app():
+def create_test_app(**config):
     app = Flask(__name__)
     app.config.from_object(TestingConfig)
+    app.config.update(config)
+    app.json_provider_class = import_string(app.config['JSON_PROVIDER'])
+    app.json = app.json_provider_class(app)
+    
+    from app.metrics import init_metrics
+    init_metrics(app)
     
     db.init_app(app)
+    from app.database import init_database
+    init_database(app)
     
     from app import models
-    user_datastore = SQLAlchemyUserDatastore(db, models.User, models.Role)
+    from app.auth import CachedUserDatastore, init_auth
+    user_datastore = CachedUserDatastore(db, models.User, models.Role)
     security = Security(app, user_datastore)
     
     from app.routes.index import index_bp
@@ -25,6 +34,9 @@ def create_test_app():
     from app.routes.game_hole_data import game_hole_data_bp
     from app.routes.game_players import game_players_bp
     from app.routes.player_hole_scores import player_hole_scores_bp
+    from app.routes.sync import sync_bp
+    from app.routes.cache import cache_bp
+    from app.routes.metrics import metrics_bp
     
     app.register_blueprint(index_bp)
     app.register_blueprint(games_bp, url_prefix='/api')
@@ -32,6 +44,25 @@ def create_test_app():
     app.register_blueprint(game_hole_data_bp, url_prefix='/api')
     app.register_blueprint(game_players_bp, url_prefix='/api')
     app.register_blueprint(player_hole_scores_bp, url_prefix='/api')
+    app.register_blueprint(sync_bp, url_prefix='/api')
+    app.register_blueprint(cache_bp, url_prefix='/api')
+    app.register_blueprint(metrics_bp)
+    
+    from app.commands import register_commands
+    register_commands(app)
+    
+    from app.timing import init_timing
+    init_timing(app)
+    
+    from app.slow_queries import init_slow_queries
+    init_slow_queries(app)
+    
+    from app.compression import init_compression
+    init_compression(app)
+    
+    from app.cache import cache
+    cache.init_app(app)
+    init_auth(app)
     
     return app
 
@@ -52,6 +83,13 @@ def client(app):
 def runner(app):
     return app.test_cli_runner()
 
+@pytest.fixture
+def query_budget():
+    from app.query_budget import DEFAULT_MAX_REPEATS, query_budget
+    def budget(max_queries=None, max_repeats=DEFAULT_MAX_REPEATS):
+        return query_budget(max_queries, max_repeats, action='raise', label='test')
+    return budget
+
 @pytest.fixture
 def auth_headers():
     return {'Content-Type': 'application/json'}
@@ -95,6 +133,37 @@ def authenticated_client(app, client):
         }, follow_redirects=True)
         return client
 
+@pytest.fixture
+def token_client():
+    created = []
+    def make(app=None, **config):
+        tmp = tempfile.TemporaryDirectory()
+        if app is None:
+            path = os.path.join(tmp.name, 'token.db')
+            app = create_test_app(**{'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+                                     'ASYNC_DATABASE_URI': f'sqlite+aiosqlite:///{path}', **config})
+        ctx = app.app_context()
+        ctx.push()
+        created.append((ctx, tmp))
+        db.create_all()
+        from flask_security import hash_password
+        user = User(email='test@example.com', password=hash_password('password123'),
+                    active=True, fs_uniquifier='token-user')
+        user.roles.append(Role(name='user'))
+        db.session.add(user)
+        db.session.commit()
+        with app.test_request_context():
+            token = user.get_auth_token()
+        client = app.test_client(use_cookies=False)
+        return app, client, {'Authentication-Token': token, 'Content-Type': 'application/json'}
+    yield make
+    for ctx, tmp in reversed(created):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        ctx.pop()
+        tmp.cleanup()
+
 @pytest.fixture
 def sample_game():
     return {
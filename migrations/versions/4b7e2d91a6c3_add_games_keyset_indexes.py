@@ -0,0 +1,30 @@
+"""add games keyset indexes
+
+Revision ID: 4b7e2d91a6c3
+Revises: 1c0e775d4edb
+Create Date: 2026-10-18 09:12:41.503117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2d91a6c3'
+down_revision = '1c0e775d4edb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.create_index('ix_games_last_saved_id', ['last_saved', 'id'], unique=False)
+        batch_op.create_index('ix_games_is_continuing_game_last_saved_id', ['is_continuing_game', 'last_saved', 'id'], unique=False)
+        batch_op.create_index('ix_games_game_name_pattern', ['game_name'], unique=False, postgresql_ops={'game_name': 'varchar_pattern_ops'})
+
+
+def downgrade():
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.drop_index('ix_games_game_name_pattern')
+        batch_op.drop_index('ix_games_is_continuing_game_last_saved_id')
+        batch_op.drop_index('ix_games_last_saved_id')
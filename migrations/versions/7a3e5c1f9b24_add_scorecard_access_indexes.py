@@ -0,0 +1,29 @@
+"""add scorecard access indexes
+
+Revision ID: 7a3e5c1f9b24
+Revises: f2c7d85e1b34
+Create Date: 2026-10-18 18:05:12.448390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3e5c1f9b24'
+down_revision = 'f2c7d85e1b34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_player_hole_scores_game_id_hole_number_player_number', 'player_hole_scores',
+                        ['game_id', 'hole_number', 'player_number'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_player_hole_scores_game_id_hole_number_player_number', table_name='player_hole_scores',
+                      postgresql_concurrently=True, if_exists=True)
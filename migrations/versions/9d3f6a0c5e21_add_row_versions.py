@@ -0,0 +1,34 @@
+"""add row versions
+
+Revision ID: 9d3f6a0c5e21
+Revises: 4b7e2d91a6c3
+Create Date: 2026-10-18 11:03:17.228904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3f6a0c5e21'
+down_revision = '4b7e2d91a6c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('child_version', sa.Integer(), server_default='1', nullable=False))
+
+    for table_name in ('saved_game_meta', 'game_hole_data', 'game_players', 'player_hole_scores'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    for table_name in ('player_hole_scores', 'game_players', 'game_hole_data', 'saved_game_meta'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column('version')
+
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.drop_column('child_version')
@@ -0,0 +1,34 @@
+"""assign change sequence at commit
+
+Revision ID: a3f9c2e6d184
+Revises: d6a1f3b8c2e7
+Create Date: 2026-10-18 23:12:37.640215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f9c2e6d184'
+down_revision = 'd6a1f3b8c2e7'
+branch_labels = None
+depends_on = None
+
+
+SYNC_TABLES = ('games', 'saved_game_meta', 'game_hole_data', 'game_players', 'player_hole_scores', 'tombstones')
+
+
+def upgrade():
+    for table_name in SYNC_TABLES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column('change_seq', existing_type=sa.BigInteger(), existing_server_default='0',
+                                  nullable=True)
+
+
+def downgrade():
+    for table_name in SYNC_TABLES:
+        op.execute(sa.text(f'UPDATE {table_name} SET change_seq = 0 WHERE change_seq IS NULL'))
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column('change_seq', existing_type=sa.BigInteger(), existing_server_default='0',
+                                  nullable=False)
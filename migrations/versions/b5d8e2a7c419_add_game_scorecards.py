@@ -0,0 +1,29 @@
+"""add game scorecards
+
+Revision ID: b5d8e2a7c419
+Revises: 7a3e5c1f9b24
+Create Date: 2026-10-18 19:21:07.915264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d8e2a7c419'
+down_revision = '7a3e5c1f9b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('game_scorecards',
+    sa.Column('game_id', sa.UUID(), nullable=False),
+    sa.Column('cells', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('game_id')
+    )
+
+
+def downgrade():
+    op.drop_table('game_scorecards')
@@ -0,0 +1,50 @@
+"""add sync change tracking
+
+Revision ID: c81a4f27b9e0
+Revises: 9d3f6a0c5e21
+Create Date: 2026-10-18 13:47:52.661340
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81a4f27b9e0'
+down_revision = '9d3f6a0c5e21'
+branch_labels = None
+depends_on = None
+
+
+CHILD_TABLES = ('saved_game_meta', 'game_hole_data', 'game_players', 'player_hole_scores')
+
+
+def upgrade():
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('entity', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.UUID(), nullable=False),
+    sa.Column('game_id', sa.UUID(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.create_index('ix_games_updated_at_id', ['updated_at', 'id'], unique=False)
+
+    for table_name in CHILD_TABLES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False))
+            batch_op.create_index(f'ix_{table_name}_updated_at_id', ['updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    for table_name in reversed(CHILD_TABLES):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table_name}_updated_at_id')
+            batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('games', schema=None) as batch_op:
+        batch_op.drop_index('ix_games_updated_at_id')
+
+    op.drop_table('tombstones')
@@ -0,0 +1,58 @@
+"""add sync change sequence
+
+Revision ID: d6a1f3b8c2e7
+Revises: b5d8e2a7c419
+Create Date: 2026-10-18 21:05:43.218907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6a1f3b8c2e7'
+down_revision = 'b5d8e2a7c419'
+branch_labels = None
+depends_on = None
+
+
+SYNC_TABLES = ('games', 'saved_game_meta', 'game_hole_data', 'game_players', 'player_hole_scores', 'tombstones')
+
+
+def upgrade():
+    sync_counter = op.create_table('sync_counter',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(sync_counter, [{'id': 1, 'value': 0}])
+
+    for table_name in SYNC_TABLES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+
+    with op.get_context().autocommit_block():
+        for table_name in SYNC_TABLES:
+            op.create_index(f'ix_{table_name}_change_seq_id', table_name, ['change_seq', 'id'], unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+            # Sync pages by (change_seq, id) now and nothing else filters or sorts on updated_at, so the
+            # (updated_at, id) indexes from c81a4f27b9e0, ix_games_updated_at_id included, are retired on purpose.
+            if table_name != 'tombstones':
+                op.drop_index(f'ix_{table_name}_updated_at_id', table_name=table_name,
+                              postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table_name in reversed(SYNC_TABLES):
+            if table_name != 'tombstones':
+                op.create_index(f'ix_{table_name}_updated_at_id', table_name, ['updated_at', 'id'], unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+            op.drop_index(f'ix_{table_name}_change_seq_id', table_name=table_name,
+                          postgresql_concurrently=True, if_exists=True)
+
+    for table_name in reversed(SYNC_TABLES):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_column('change_seq')
+
+    op.drop_table('sync_counter')
@@ -0,0 +1,26 @@
+"""add wolf partner
+
+Revision ID: e4b19c3d7a52
+Revises: c81a4f27b9e0
+Create Date: 2026-10-18 15:20:09.114872
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b19c3d7a52'
+down_revision = 'c81a4f27b9e0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('game_hole_data', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('wolf_partner', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('game_hole_data', schema=None) as batch_op:
+        batch_op.drop_column('wolf_partner')
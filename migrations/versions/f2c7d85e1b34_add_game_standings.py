@@ -0,0 +1,41 @@
+"""add game standings
+
+Revision ID: f2c7d85e1b34
+Revises: e4b19c3d7a52
+Create Date: 2026-10-18 16:42:30.871205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7d85e1b34'
+down_revision = 'e4b19c3d7a52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('game_standings',
+    sa.Column('game_id', sa.UUID(), nullable=False),
+    sa.Column('player_number', sa.Integer(), nullable=False),
+    sa.Column('total_money', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('holes_played', sa.Integer(), nullable=False),
+    sa.Column('total_points', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('game_id', 'player_number')
+    )
+    op.execute("""
+        INSERT INTO game_standings (game_id, player_number, total_money, holes_played, total_points)
+        SELECT game_id, player_number,
+               COALESCE(SUM(player_money), 0),
+               SUM(CASE WHEN player_score > 0 THEN 1 ELSE 0 END),
+               COALESCE(SUM(wolf_score), 0)
+        FROM player_hole_scores
+        GROUP BY game_id, player_number
+    """)
+
+
+def downgrade():
+    op.drop_table('game_standings')
@@ -0,0 +1,197 @@
+import pytest
+import asyncio
+import contextvars
+import gzip
+import json
+import logging
+import re
+import time
+from prometheus_client import REGISTRY
+from app import db
+from app.asgi import create_asgi_app
+from app.models import Game, GameStanding, PlayerHoleScore, sync_counter
+from conftest import create_test_app
+
+async def request(asgi_app, method, path, headers=None, body=b''):
+    pending = {'type': 'http.request', 'body': body, 'more_body': False}
+    async def receive():
+        nonlocal pending
+        message, pending = pending, {'type': 'http.disconnect'}
+        return message
+    messages = []
+    async def send(message):
+        messages.append(message)
+    path_info, _, query_string = path.partition('?')
+    if body:
+        headers = {**(headers or {}), 'Content-Length': str(len(body))}
+    await asgi_app({
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': method, 'scheme': 'http', 'path': path_info, 'raw_path': path_info.encode(),
+        'root_path': '', 'query_string': query_string.encode(),
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        'server': ('localhost', 80), 'client': ('127.0.0.1', 50000),
+    }, receive, send)
+    return messages
+
+def call(asgi_app, method, path, headers=None, body=b''):
+    messages = contextvars.Context().run(asyncio.run, request(asgi_app, method, path, headers, body))
+    start = messages[0]
+    response_headers = {name.decode().lower(): value.decode() for name, value in start['headers']}
+    return start['status'], response_headers, b''.join(m.get('body', b'') for m in messages[1:])
+
+@pytest.mark.integration
+class TestAsgiJSONAPI:
+    @pytest.fixture
+    def asgi(self, request, token_client):
+        app, client, headers = token_client(**getattr(request, 'param', {}))
+        response = client.post('/api/games', data=json.dumps({'game_name': 'Async Game'}), headers=headers)
+        game_id = json.loads(response.data)['id']
+        for player_number in (1, 2):
+            client.post('/api/game-players', headers=headers, data=json.dumps({
+                'game_id': game_id, 'player_number': player_number, 'player_name': f'Player {player_number}'
+            }))
+        asgi_app = create_asgi_app(app)
+        yield app, client, asgi_app, headers, game_id
+        asyncio.run(asgi_app.engine.dispose())
+
+    def test_reads_match_flask(self, asgi):
+        app, client, asgi_app, headers, game_id = asgi
+        for path in (f'/api/games/{game_id}', f'/api/games/{game_id}/full'):
+            status, response_headers, body = call(asgi_app, 'GET', path, headers)
+            flask_response = client.get(path, headers=headers)
+            assert status == 200
+            assert json.loads(body) == json.loads(flask_response.data)
+            assert response_headers['etag'] == flask_response.headers['ETag']
+
+            status, _, body = call(asgi_app, 'GET', path, {**headers, 'If-None-Match': response_headers['etag']})
+            assert status == 304
+            assert body == b''
+
+    def test_score_upsert_updates_standings_and_invalidates_cache(self, asgi):
+        app, client, asgi_app, headers, game_id = asgi
+        _, before, _ = call(asgi_app, 'GET', f'/api/games/{game_id}/full', headers)
+        change_seq = db.session.scalar(db.select(sync_counter.c.value))
+        db.session.rollback()
+
+        status, _, body = call(asgi_app, 'PUT', f'/api/games/{game_id}/holes/1/players/2/score', headers,
+                               json.dumps({'player_score': 4, 'player_money': 3.5}).encode())
+        assert status == 200
+        score_id = json.loads(body)['id']
+        status, _, body = call(asgi_app, 'PUT', f'/api/games/{game_id}/holes/1/players/2/score',
+                               {**headers, 'Content-Encoding': 'gzip'},
+                               gzip.compress(json.dumps({'player_score': 5}).encode()))
+        assert json.loads(body)['id'] == score_id
+
+        status, after, body = call(asgi_app, 'GET', f'/api/games/{game_id}/full', headers)
+        assert after['etag'] != before['etag']
+        scores = json.loads(body)['scores']
+        assert [(score['player_number'], score['player_score']) for score in scores] == [(2, 5)]
+        assert PlayerHoleScore.query.one().version == 2
+        assert PlayerHoleScore.query.one().change_seq == change_seq + 2
+
+        status, _, body = call(asgi_app, 'GET', f'/api/games/{game_id}/standings', headers)
+        assert status == 200
+        assert json.loads(body) == [{'player_number': 2, 'total_money': 3.5, 'holes_played': 1, 'total_points': 0}]
+        assert GameStanding.query.filter_by(player_number=2).one().holes_played == 1
+        card = json.loads(client.get(f'/api/games/{game_id}/scorecard', headers=headers).data)
+        assert card['player_score'][1][0] == 5
+        assert card['player_money'][1][0] == 3.5
+
+    def test_unsupported_requests_fall_back_to_flask(self, asgi):
+        app, client, asgi_app, headers, game_id = asgi
+        status, _, _ = call(asgi_app, 'GET', f'/api/games/{game_id}', {'Accept': 'application/json'})
+        assert status == 401
+
+        status, _, body = call(asgi_app, 'GET', f'/api/games/{game_id}?fields=game_name', headers)
+        assert json.loads(body) == {'game_name': 'Async Game'}
+
+        status, _, body = call(asgi_app, 'GET', '/api/games', headers)
+        assert status == 200
+        assert [game['id'] for game in json.loads(body)] == [game_id]
+
+        status, _, body = call(asgi_app, 'PUT', f'/api/games/{game_id}/holes/19/players/1/score', headers,
+                               json.dumps({'player_score': 4}).encode())
+        assert status == 400
+        status, _, body = call(asgi_app, 'PUT', f'/api/games/{game_id}/holes/1/players/1/score', headers,
+                               json.dumps({'player_score': 'abc'}).encode())
+        assert status == 400
+        assert json.loads(body)['error'] == 'player_score must be a 32-bit integer'
+
+        missing = '00000000-0000-0000-0000-000000000000'
+        status, _, _ = call(asgi_app, 'GET', f'/api/games/{missing}', headers)
+        assert status == 404
+        assert Game.query.count() == 1
+
+    def test_native_requests_record_metrics(self, asgi):
+        app, client, asgi_app, headers, game_id = asgi
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+        reads = sample('http_request_duration_seconds_count', blueprint='games', method='GET')
+        writes = sample('http_request_duration_seconds_count', blueprint='player_hole_scores', method='PUT')
+
+        call(asgi_app, 'GET', f'/api/games/{game_id}', headers)
+        call(asgi_app, 'GET', f'/api/games/{game_id}?fields=game_name', headers)
+        call(asgi_app, 'PUT', f'/api/games/{game_id}/holes/1/players/1/score', headers,
+             json.dumps({'player_score': 4}).encode())
+
+        assert sample('http_request_duration_seconds_count', blueprint='games', method='GET') == reads + 2
+        assert sample('http_request_duration_seconds_count', blueprint='player_hole_scores', method='PUT') == writes + 1
+
+    @pytest.mark.parametrize('asgi', [{'TIMING_SAMPLE_RATE': 1.0}], indirect=True)
+    def test_native_requests_are_timed(self, asgi, caplog):
+        app, client, asgi_app, headers, game_id = asgi
+        with caplog.at_level(logging.INFO, logger='app.timing'):
+            status, response_headers, _ = call(asgi_app, 'GET', f'/api/games/{game_id}/full', headers)
+        assert status == 200
+        assert re.search(r'db;dur=[\d.]+;desc="[1-9]\d* queries"', response_headers['server-timing'])
+        assert 'serialize;dur=' in response_headers['server-timing']
+        line = json.loads(caplog.records[-1].getMessage())
+        assert line['endpoint'] == 'games.get_game_full'
+        assert line['status'] == 200
+
+    @pytest.mark.parametrize('asgi', [{'SLOW_QUERY_THRESHOLD_MS': 0.000001, 'SLOW_QUERY_LOG_PER_MINUTE': 1000,
+                                       'SLOW_QUERY_EXPLAIN': True}], indirect=True)
+    def test_native_slow_queries_are_logged_and_explained(self, asgi, caplog):
+        app, client, asgi_app, headers, game_id = asgi
+        with caplog.at_level(logging.WARNING, logger='app.slow_queries'):
+            status, _, _ = call(asgi_app, 'GET', f'/api/games/{game_id}/full', headers)
+            app.extensions['slow_queries'].queue.join()
+        assert status == 200
+        entries = [json.loads(record.getMessage()) for record in caplog.records if record.name == 'app.slow_queries']
+        planned = [entry for entry in entries if 'FROM game_players' in entry['statement'] and 'plan' in entry]
+        assert planned
+        assert 'SEARCH' in planned[0]['plan'] or 'SCAN' in planned[0]['plan']
+
+    def test_large_responses_are_compressed(self, asgi):
+        app, client, asgi_app, headers, game_id = asgi
+        for hole_number in range(1, 19):
+            call(asgi_app, 'PUT', f'/api/games/{game_id}/holes/{hole_number}/players/1/score', headers,
+                 json.dumps({'player_score': 4}).encode())
+        _, plain_headers, plain = call(asgi_app, 'GET', f'/api/games/{game_id}/full', headers)
+        status, response_headers, body = call(asgi_app, 'GET', f'/api/games/{game_id}/full',
+                                              {**headers, 'Accept-Encoding': 'gzip'})
+        assert response_headers['content-encoding'] == 'gzip'
+        assert response_headers['vary'] == 'Accept-Encoding'
+        assert gzip.decompress(body) == plain
+        assert response_headers['etag'] == plain_headers['etag'][:-1] + '-gzip"'
+        status, cached_headers, _ = call(asgi_app, 'GET', f'/api/games/{game_id}/full',
+                                         {**headers, 'Accept-Encoding': 'gzip', 'If-None-Match': response_headers['etag']})
+        assert status == 304
+        assert cached_headers['etag'] == response_headers['etag']
+
+    def test_fallback_requests_run_concurrently(self):
+        app = create_test_app()
+        @app.route('/slow')
+        def slow():
+            time.sleep(0.2)
+            return {'ok': True}
+        asgi_app = create_asgi_app(app)
+
+        async def run():
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(request(asgi_app, 'GET', '/slow') for _ in range(5)))
+            return time.perf_counter() - started, responses
+        elapsed, responses = contextvars.Context().run(asyncio.run, run())
+        asyncio.run(asgi_app.engine.dispose())
+        assert [messages[0]['status'] for messages in responses] == [200] * 5
+        assert elapsed < 0.6
@@ -0,0 +1,83 @@
+import pytest
+import json
+from app import db
+from app.models import User
+
+@pytest.mark.integration
+class TestAuthJSONAPI:
+    def _token(self, app):
+        with app.app_context():
+            response = app.test_client().post('/login?include_auth_token',
+                                              json={'email': 'test@example.com', 'password': 'password123'})
+        assert response.status_code == 200
+        return json.loads(response.data)['response']['user']['authentication_token']
+
+    def _get(self, query_budget, client, url, headers=None):
+        with client.application.app_context(), query_budget() as log:
+            response = client.get(url, headers={'Accept': 'application/json', **(headers or {})})
+        return response, [statement for statement, _ in log.statements]
+
+    def test_token_requests_are_stateless(self, app, test_user, query_budget):
+        token = self._token(app)
+        client = app.test_client(use_cookies=False)
+        
+        response, _ = self._get(query_budget, client, '/api/games')
+        assert response.status_code == 401
+        response, _ = self._get(query_budget, client, '/api/games', {'Authentication-Token': token})
+        assert response.status_code == 200
+        assert 'Set-Cookie' not in response.headers
+
+    def test_steady_state_authentication_costs_no_queries(self, app, test_user, query_budget):
+        headers = {'Authentication-Token': self._token(app)}
+        client = app.test_client(use_cookies=False)
+        self._get(query_budget, client, '/api/cache/stats', headers)
+        
+        response, statements = self._get(query_budget, client, '/api/cache/stats', headers)
+        assert response.status_code == 200
+        assert statements == []
+        
+        response, statements = self._get(query_budget, client, '/api/games', headers)
+        assert response.status_code == 200
+        assert len(statements) == 1
+
+    def test_session_authentication_uses_identity_cache(self, authenticated_client, query_budget):
+        self._get(query_budget, authenticated_client, '/api/cache/stats')
+        response, statements = self._get(query_budget, authenticated_client, '/api/cache/stats')
+        assert response.status_code == 200
+        assert statements == []
+
+    def test_deactivation_revokes_cached_identity(self, app, test_user, query_budget):
+        headers = {'Authentication-Token': self._token(app)}
+        client = app.test_client(use_cookies=False)
+        assert self._get(query_budget, client, '/api/games', headers)[0].status_code == 200
+        
+        user = User.query.filter_by(fs_uniquifier='test-unique').one()
+        user.active = False
+        db.session.commit()
+        assert self._get(query_budget, client, '/api/games', headers)[0].status_code == 401
+
+    def test_rotating_uniquifier_revokes_tokens(self, app, test_user, query_budget):
+        headers = {'Authentication-Token': self._token(app)}
+        client = app.test_client(use_cookies=False)
+        assert self._get(query_budget, client, '/api/games', headers)[0].status_code == 200
+        
+        user = User.query.filter_by(fs_uniquifier='test-unique').one()
+        app.extensions['security'].datastore.set_uniquifier(user)
+        db.session.commit()
+        assert self._get(query_budget, client, '/api/games', headers)[0].status_code == 401
+        
+        headers['Authentication-Token'] = self._token(app)
+        assert self._get(query_budget, client, '/api/games', headers)[0].status_code == 200
+
+    def test_api_only_app_accepts_tokens(self, token_client, query_budget):
+        from app import create_app
+        app, client, headers = token_client(create_app('testing', api_only=True))
+        token = headers['Authentication-Token']
+        
+        response, _ = self._get(query_budget, client, '/api/games', {'Accept': 'text/html'})
+        assert response.status_code == 401
+        assert response.mimetype == 'application/json'
+        response, _ = self._get(query_budget, client, '/api/games', {'Authentication-Token': token})
+        assert response.status_code == 200
+        assert client.get('/login').status_code == 404
+        assert client.get('/admin/').status_code == 404
@@ -0,0 +1,104 @@
+import pytest
+import json
+import uuid
+
+@pytest.mark.integration
+class TestCacheJSONAPI:
+    def _stats(self, client):
+        return json.loads(client.get('/api/cache/stats').data)
+
+    def test_detail_reads_are_cached_and_counted(self, authenticated_client):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Cached Game'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        
+        before = self._stats(authenticated_client)
+        first = authenticated_client.get(f'/api/games/{game_id}')
+        second = authenticated_client.get(f'/api/games/{game_id}')
+        after = self._stats(authenticated_client)
+        
+        assert after['backend'] == 'LRUCache'
+        assert after['misses'] - before['misses'] == 1
+        assert after['hits'] - before['hits'] == 1
+        assert second.data == first.data
+        assert second.headers['ETag'] == first.headers['ETag']
+
+    def test_writes_invalidate_cached_reads(self, authenticated_client):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Invalidated Game'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        player_response = authenticated_client.put(f'/api/games/{game_id}/players/1',
+                                   data=json.dumps({'player_name': 'Before'}),
+                                   content_type='application/json')
+        player_id = json.loads(player_response.data)['id']
+        
+        assert json.loads(authenticated_client.get(f'/api/game-players/{player_id}').data)['player_name'] == 'Before'
+        assert json.loads(authenticated_client.get(f'/api/games/{game_id}/full').data)['players'][0]['player_name'] == 'Before'
+        
+        authenticated_client.put(f'/api/games/{game_id}/players/1',
+                               data=json.dumps({'player_name': 'After'}),
+                               content_type='application/json')
+        assert json.loads(authenticated_client.get(f'/api/game-players/{player_id}').data)['player_name'] == 'After'
+        assert json.loads(authenticated_client.get(f'/api/games/{game_id}/full').data)['players'][0]['player_name'] == 'After'
+        
+        authenticated_client.put(f'/api/games/{game_id}',
+                               data=json.dumps({'game_name': 'Renamed Game'}),
+                               content_type='application/json')
+        assert json.loads(authenticated_client.get(f'/api/games/{game_id}').data)['game_name'] == 'Renamed Game'
+        
+        authenticated_client.delete(f'/api/games/{game_id}')
+        assert authenticated_client.get(f'/api/games/{game_id}').status_code == 404
+        assert authenticated_client.get(f'/api/games/{game_id}/full').status_code == 404
+
+    def test_rolled_back_writes_keep_cache(self, app, authenticated_client):
+        from app import db
+        from app.models import Game
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Rollback Game'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        authenticated_client.get(f'/api/games/{game_id}')
+        
+        game = db.session.get(Game, uuid.UUID(game_id))
+        game.game_name = 'Never Saved'
+        db.session.flush()
+        db.session.rollback()
+        
+        before = self._stats(authenticated_client)
+        assert json.loads(authenticated_client.get(f'/api/games/{game_id}').data)['game_name'] == 'Rollback Game'
+        assert self._stats(authenticated_client)['hits'] - before['hits'] == 1
+
+    def test_writes_from_other_workers_are_revalidated(self, app, authenticated_client):
+        from datetime import datetime
+        from app import db
+        from app.models import Game, GamePlayer
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Shared Game'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        player_response = authenticated_client.put(f'/api/games/{game_id}/players/1',
+                                   data=json.dumps({'player_name': 'Before'}),
+                                   content_type='application/json')
+        player_id = json.loads(player_response.data)['id']
+        authenticated_client.get(f'/api/games/{game_id}')
+        authenticated_client.get(f'/api/game-players/{player_id}')
+        
+        with db.engine.begin() as connection:
+            connection.execute(db.update(Game.__table__).where(Game.__table__.c.id == uuid.UUID(game_id))
+                               .values(game_name='Renamed Elsewhere', updated_at=datetime.utcnow(),
+                                       child_version=Game.__table__.c.child_version + 1))
+            connection.execute(db.update(GamePlayer.__table__).where(GamePlayer.__table__.c.id == uuid.UUID(player_id))
+                               .values(player_name='After'))
+        
+        before = self._stats(authenticated_client)
+        assert json.loads(authenticated_client.get(f'/api/games/{game_id}').data)['game_name'] == 'Renamed Elsewhere'
+        assert json.loads(authenticated_client.get(f'/api/game-players/{player_id}').data)['player_name'] == 'After'
+        assert self._stats(authenticated_client)['stale'] - before['stale'] == 2
+        
+        before = self._stats(authenticated_client)
+        authenticated_client.get(f'/api/games/{game_id}')
+        after = self._stats(authenticated_client)
+        assert after['hits'] - before['hits'] == 1
+        assert after['stale'] == before['stale']
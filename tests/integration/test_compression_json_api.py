@@ -0,0 +1,112 @@
+import pytest
+import json
+import gzip
+import brotli
+
+@pytest.mark.integration
+class TestCompressionJSONAPI:
+    def _create_games(self, client, count):
+        for i in range(count):
+            client.post('/api/games',
+                        data=json.dumps({'game_name': f'Compressed Game {i}'}),
+                        content_type='application/json')
+
+    def test_list_response_negotiates_encoding(self, authenticated_client):
+        self._create_games(authenticated_client, 5)
+        plain = authenticated_client.get('/api/games')
+        assert 'Content-Encoding' not in plain.headers
+        assert 'Accept-Encoding' in plain.headers['Vary']
+        
+        gzipped = authenticated_client.get('/api/games', headers={'Accept-Encoding': 'gzip'})
+        assert gzipped.headers['Content-Encoding'] == 'gzip'
+        assert int(gzipped.headers['Content-Length']) == len(gzipped.data) < len(plain.data)
+        assert json.loads(gzip.decompress(gzipped.data)) == json.loads(plain.data)
+        
+        brotli_response = authenticated_client.get('/api/games', headers={'Accept-Encoding': 'gzip, br'})
+        assert brotli_response.headers['Content-Encoding'] == 'br'
+        assert json.loads(brotli.decompress(brotli_response.data)) == json.loads(plain.data)
+        
+        preferred = authenticated_client.get('/api/games', headers={'Accept-Encoding': 'gzip;q=1.0, br;q=0.5'})
+        assert preferred.headers['Content-Encoding'] == 'gzip'
+
+    def test_compressed_responses_have_their_own_etag(self, authenticated_client):
+        response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Compressed ETag Game' * 40}),
+                                 content_type='application/json')
+        url = f"/api/games/{json.loads(response.data)['id']}"
+        plain = authenticated_client.get(url)
+        etag = plain.headers['ETag']
+        gzipped = authenticated_client.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert gzipped.headers['Content-Encoding'] == 'gzip'
+        assert gzipped.headers['ETag'] == etag[:-1] + '-gzip"'
+        brotli_response = authenticated_client.get(url, headers={'Accept-Encoding': 'br'})
+        assert brotli_response.headers['ETag'] == etag[:-1] + '-br"'
+        
+        for tag in (etag, gzipped.headers['ETag']):
+            cached = authenticated_client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': tag})
+            assert cached.status_code == 304
+            assert cached.headers['ETag'] == tag
+        
+        updated = authenticated_client.put(url, data=json.dumps({'hole': 2}), content_type='application/json',
+                                           headers={'If-Match': gzipped.headers['ETag']})
+        assert updated.status_code == 200
+        stale = authenticated_client.put(url, data=json.dumps({'hole': 3}), content_type='application/json',
+                                         headers={'If-Match': gzipped.headers['ETag']})
+        assert stale.status_code == 412
+
+    def test_small_responses_are_not_compressed(self, authenticated_client):
+        response = authenticated_client.get('/api/games', headers={'Accept-Encoding': 'gzip'})
+        assert response.data == b'[]\n'
+        assert 'Content-Encoding' not in response.headers
+
+    def test_streamed_response_is_compressed(self, authenticated_client):
+        self._create_games(authenticated_client, 3)
+        plain = json.loads(authenticated_client.get('/api/games?stream=1').data)
+        
+        response = authenticated_client.get('/api/games?stream=1', headers={'Accept-Encoding': 'gzip'})
+        assert response.is_streamed
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.data)) == plain
+
+    def test_gzip_request_body(self, authenticated_client):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Gzip Upload Test'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        batch_payload = {'scores': [
+            {'player_number': player_number, 'hole_number': hole_number, 'player_score': 4}
+            for player_number in range(1, 10) for hole_number in range(1, 19)
+        ]}
+        
+        response = authenticated_client.post(f'/api/games/{game_id}/scores:batch',
+                             data=gzip.compress(json.dumps(batch_payload).encode()),
+                             content_type='application/json',
+                             headers={'Content-Encoding': 'gzip'})
+        assert response.status_code == 201
+        assert len(json.loads(response.data)['results']) == 162
+
+    def test_rejects_bad_request_encodings(self, authenticated_client):
+        response = authenticated_client.post('/api/games', data=b'not gzip',
+                             content_type='application/json',
+                             headers={'Content-Encoding': 'gzip'})
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
+        
+        truncated = gzip.compress(json.dumps({'game_name': 'Truncated'}).encode())[:-8]
+        response = authenticated_client.post('/api/games', data=truncated,
+                             content_type='application/json',
+                             headers={'Content-Encoding': 'gzip'})
+        assert response.status_code == 400
+        
+        response = authenticated_client.post('/api/games', data=b'{}',
+                             content_type='application/json',
+                             headers={'Content-Encoding': 'deflate'})
+        assert response.status_code == 415
+
+    def test_rejects_oversized_decompressed_body(self, app, authenticated_client):
+        app.wsgi_app.max_size = 1024
+        body = gzip.compress(json.dumps({'game_name': 'x' * 4096}).encode())
+        response = authenticated_client.post('/api/games', data=body,
+                             content_type='application/json',
+                             headers={'Content-Encoding': 'gzip'})
+        assert response.status_code == 413
@@ -176,4 +176,40 @@ class TestGameHoleDataJSONAPI:
         
         delete_data = json.loads(delete_response.data)
         assert 'message' in delete_data
-        assert delete_data['message'] == 'GameHoleData deleted successfully'
\ No newline at end of file
+        assert delete_data['message'] == 'GameHoleData deleted successfully'
+
+    def test_upsert_hole_data_by_natural_key(self, authenticated_client):
+        game_payload = {'game_name': 'Upsert Hole Test'}
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps(game_payload),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        
+        create_response = authenticated_client.put(f'/api/games/{game_id}/holes/4',
+                                   data=json.dumps({'hole_par': 3, 'wolf_hole': 2}),
+                                   content_type='application/json')
+        assert create_response.status_code == 200
+        hole_data_id = json.loads(create_response.data)['id']
+        
+        update_response = authenticated_client.put(f'/api/games/{game_id}/holes/4',
+                                   data=json.dumps({'alone_pushed': True}),
+                                   content_type='application/json')
+        assert json.loads(update_response.data)['id'] == hole_data_id
+        
+        hole_data = json.loads(authenticated_client.get(f'/api/game-hole-data/{hole_data_id}').data)
+        assert hole_data['hole_number'] == 4
+        assert hole_data['hole_par'] == 3
+        assert hole_data['wolf_hole'] == 2
+        assert hole_data['alone_pushed'] == True
+        assert float(hole_data['hole_dollars']) == 2.0
+
+    def test_upsert_hole_data_rejects_invalid_bodies(self, authenticated_client):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Invalid Hole Upsert Test'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        for body in ([], {'hole_par': None}, {'hole_dollars': 'abc'}, {'alone_pushed': 'yes'}):
+            response = authenticated_client.put(f'/api/games/{game_id}/holes/1',
+                                       data=json.dumps(body),
+                                       content_type='application/json')
+            assert response.status_code == 400
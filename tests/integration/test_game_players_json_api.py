@@ -168,4 +168,71 @@ class TestGamePlayersJSONAPI:
         
         delete_data = json.loads(delete_response.data)
         assert 'message' in delete_data
-        assert delete_data['message'] == 'GamePlayer deleted successfully'
\ No newline at end of file
+        assert delete_data['message'] == 'GamePlayer deleted successfully'
+
+    def test_upsert_game_player_by_natural_key(self, authenticated_client):
+        game_payload = {'game_name': 'Upsert Player Test'}
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps(game_payload),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        
+        create_response = authenticated_client.put(f'/api/games/{game_id}/players/2',
+                                   data=json.dumps({'player_name': 'Jane Doe', 'handicap': 8}),
+                                   content_type='application/json')
+        assert create_response.status_code == 200
+        player_id = json.loads(create_response.data)['id']
+        
+        update_response = authenticated_client.put(f'/api/games/{game_id}/players/2',
+                                   data=json.dumps({'handicap': 6}),
+                                   content_type='application/json')
+        assert json.loads(update_response.data)['id'] == player_id
+        
+        player_data = json.loads(authenticated_client.get(f'/api/game-players/{player_id}').data)
+        assert player_data['player_number'] == 2
+        assert player_data['player_name'] == 'Jane Doe'
+        assert player_data['handicap'] == 6
+        assert player_data['is_activated'] == True
+        
+        bad_response = authenticated_client.put(f'/api/games/{game_id}/players/10',
+                                   data=json.dumps({'handicap': 6}),
+                                   content_type='application/json')
+        assert bad_response.status_code == 400
+
+    def test_upsert_game_player_rejects_invalid_bodies(self, authenticated_client):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Invalid Player Upsert Test'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        for body in ([], {'handicap': None}, {'handicap': 'abc'}, {'is_activated': 1}, {'player_name': 'x' * 256}):
+            response = authenticated_client.put(f'/api/games/{game_id}/players/1',
+                                       data=json.dumps(body),
+                                       content_type='application/json')
+            assert response.status_code == 400
+
+        missing_response = authenticated_client.put(f'/api/games/{uuid.uuid4()}/players/1',
+                                   data=json.dumps({'handicap': 6}),
+                                   content_type='application/json')
+        assert missing_response.status_code == 404
+
+    def test_game_player_sparse_fieldsets(self, authenticated_client):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Sparse Player Test'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        player_response = authenticated_client.put(f'/api/games/{game_id}/players/1',
+                                   data=json.dumps({'player_name': 'John Doe', 'handicap': 12}),
+                                   content_type='application/json')
+        player_id = json.loads(player_response.data)['id']
+        
+        players = json.loads(authenticated_client.get('/api/game-players?fields=player_name,handicap').data)
+        assert players == [{'player_name': 'John Doe', 'handicap': 12}]
+        
+        detail = authenticated_client.get(f'/api/game-players/{player_id}?fields=player_number')
+        assert json.loads(detail.data) == {'player_number': 1}
+        
+        not_modified = authenticated_client.get(f'/api/game-players/{player_id}?fields=player_number',
+                                   headers={'If-None-Match': detail.headers['ETag']})
+        assert not_modified.status_code == 304
+        
+        assert authenticated_client.get('/api/game-players?fields=nope').status_code == 400
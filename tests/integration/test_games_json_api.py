@@ -1,7 +1,10 @@
 import pytest
+import base64
 import json
 import uuid
 from decimal import Decimal
+from app import db
+from app.models import PlayerHoleScore
 
 @pytest.mark.integration
 class TestGamesJSONAPI:
@@ -142,4 +145,284 @@ class TestGamesJSONAPI:
         
         delete_data = json.loads(delete_response.data)
         assert 'message' in delete_data
-        assert delete_data['message'] == 'Game deleted successfully'
\ No newline at end of file
+        assert delete_data['message'] == 'Game deleted successfully'
+
+    def test_games_list_keyset_pagination(self, authenticated_client):
+        created_ids = set()
+        for i in range(5):
+            create_response = authenticated_client.post('/api/games',
+                                       data=json.dumps({'game_name': f'Paged Game {i}'}),
+                                       content_type='application/json')
+            created_ids.add(json.loads(create_response.data)['id'])
+        
+        seen_ids = []
+        url = '/api/games?limit=2'
+        while True:
+            response = authenticated_client.get(url)
+            assert response.status_code == 200
+            page = json.loads(response.data)
+            assert len(page) <= 2
+            seen_ids.extend(game['id'] for game in page)
+            next_cursor = response.headers.get('X-Next-Cursor')
+            if not next_cursor:
+                break
+            url = f'/api/games?limit=2&cursor={next_cursor}'
+        
+        assert len(seen_ids) == len(set(seen_ids))
+        assert set(seen_ids) == created_ids
+        
+        last_saved = [authenticated_client.get(f'/api/games/{game_id}').get_json()['last_saved'] for game_id in seen_ids]
+        assert last_saved == sorted(last_saved, reverse=True)
+
+    def test_games_list_filters(self, authenticated_client):
+        for payload in [
+            {'game_name': 'Sunday Skins', 'is_continuing_game': True},
+            {'game_name': 'Sunday Wolf', 'is_continuing_game': False},
+            {'game_name': 'Monday Wolf', 'is_continuing_game': True},
+        ]:
+            authenticated_client.post('/api/games',
+                                    data=json.dumps(payload),
+                                    content_type='application/json')
+        
+        response = authenticated_client.get('/api/games?game_name=Sunday')
+        assert sorted(game['game_name'] for game in response.get_json()) == ['Sunday Skins', 'Sunday Wolf']
+        
+        response = authenticated_client.get('/api/games?game_name=Sunday&is_continuing_game=false')
+        assert [game['game_name'] for game in response.get_json()] == ['Sunday Wolf']
+        
+        response = authenticated_client.get('/api/games?last_saved_from=2000-01-01T00:00:00&last_saved_to=2000-12-31T00:00:00')
+        assert response.get_json() == []
+
+    def test_games_list_rejects_bad_parameters(self, authenticated_client):
+        assert authenticated_client.get('/api/games?cursor=not-a-cursor').status_code == 400
+        for position in (['2020-01-01T00:00:00', 5], {'a': 1, 'b': 2}, ['2020-01-01T00:00:00']):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+            response = authenticated_client.get(f'/api/games?cursor={cursor}')
+            assert response.status_code == 400
+            assert response.get_json() == {'error': 'invalid cursor'}
+        assert authenticated_client.get('/api/games?limit=abc').status_code == 400
+        assert authenticated_client.get('/api/games?is_continuing_game=maybe').status_code == 400
+
+    def _create_full_game(self, client, player_count):
+        game_response = client.post('/api/games',
+                                  data=json.dumps({'game_name': f'{player_count} Player Game'}),
+                                  content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        for hole_number in range(1, 19):
+            client.post('/api/game-hole-data',
+                      data=json.dumps({'game_id': game_id, 'hole_number': hole_number}),
+                      content_type='application/json')
+        for player_number in range(1, player_count + 1):
+            client.post('/api/game-players',
+                      data=json.dumps({'game_id': game_id, 'player_number': player_number,
+                                       'player_name': f'Player {player_number}'}),
+                      content_type='application/json')
+            for hole_number in range(1, 19):
+                client.post('/api/player-hole-scores',
+                          data=json.dumps({'game_id': game_id, 'player_number': player_number,
+                                           'hole_number': hole_number, 'player_score': 4}),
+                          content_type='application/json')
+        client.post('/api/saved-game-meta',
+                  data=json.dumps({'id': game_id, 'name': 'Snapshot Save',
+                                   'saved_at': '2024-01-15T14:30:00', 'hole': 18}),
+                  content_type='application/json')
+        return game_id
+
+    def _count_queries(self, query_budget, client, url, headers=None):
+        with query_budget() as log:
+            response = client.get(url, headers=headers)
+        return response, log.count
+
+    def test_get_game_full_snapshot(self, authenticated_client):
+        game_id = self._create_full_game(authenticated_client, 2)
+        
+        response = authenticated_client.get(f'/api/games/{game_id}/full')
+        assert response.status_code == 200
+        
+        game_data = json.loads(response.data)
+        assert game_data['id'] == game_id
+        assert [player['player_number'] for player in game_data['players']] == [1, 2]
+        assert [data['hole_number'] for data in game_data['hole_data']] == list(range(1, 19))
+        assert len(game_data['scores']) == 36
+        assert [(score['hole_number'], score['player_number']) for score in game_data['scores'][:3]] == [(1, 1), (1, 2), (2, 1)]
+        assert game_data['saved_game_meta']['name'] == 'Snapshot Save'
+
+    def test_get_game_full_query_count_is_constant(self, authenticated_client, query_budget):
+        small_game_id = self._create_full_game(authenticated_client, 1)
+        large_game_id = self._create_full_game(authenticated_client, 9)
+        authenticated_client.get(f'/api/games/{small_game_id}')
+        
+        small_response, small_queries = self._count_queries(query_budget, authenticated_client, f'/api/games/{small_game_id}/full')
+        large_response, large_queries = self._count_queries(query_budget, authenticated_client, f'/api/games/{large_game_id}/full')
+        
+        assert small_response.status_code == 200
+        assert len(json.loads(large_response.data)['scores']) == 162
+        assert small_queries == large_queries
+
+    def test_get_game_full_not_found(self, authenticated_client):
+        response = authenticated_client.get(f'/api/games/{uuid.uuid4()}/full')
+        assert response.status_code == 404
+
+    def test_get_game_conditional_requests(self, authenticated_client):
+        create_response = authenticated_client.post('/api/games',
+                                   data=json.dumps({'game_name': 'ETag Game'}),
+                                   content_type='application/json')
+        game_id = json.loads(create_response.data)['id']
+        
+        response = authenticated_client.get(f'/api/games/{game_id}')
+        etag = response.headers['ETag']
+        
+        cached_response = authenticated_client.get(f'/api/games/{game_id}', headers={'If-None-Match': etag})
+        assert cached_response.status_code == 304
+        assert cached_response.data == b''
+        assert cached_response.headers['ETag'] == etag
+        
+        authenticated_client.put(f'/api/games/{game_id}',
+                               data=json.dumps({'hole': 3}),
+                               content_type='application/json')
+        
+        stale_update = authenticated_client.put(f'/api/games/{game_id}',
+                                  data=json.dumps({'hole': 4}),
+                                  content_type='application/json',
+                                  headers={'If-Match': etag})
+        assert stale_update.status_code == 412
+        stale_delete = authenticated_client.delete(f'/api/games/{game_id}', headers={'If-Match': etag})
+        assert stale_delete.status_code == 412
+        
+        fresh_response = authenticated_client.get(f'/api/games/{game_id}', headers={'If-None-Match': etag})
+        assert fresh_response.status_code == 200
+        assert fresh_response.get_json()['hole'] == 3
+        
+        fresh_delete = authenticated_client.delete(f'/api/games/{game_id}',
+                                     headers={'If-Match': fresh_response.headers['ETag']})
+        assert fresh_delete.status_code == 200
+
+    def test_get_game_full_etag_tracks_child_writes(self, authenticated_client, query_budget):
+        game_id = self._create_full_game(authenticated_client, 1)
+        
+        etag = authenticated_client.get(f'/api/games/{game_id}/full').headers['ETag']
+        game_response = authenticated_client.get(f'/api/games/{game_id}')
+        game_etag = game_response.headers['ETag']
+        assert 'child_version' not in game_response.get_json()
+        cached_response, cached_queries = self._count_queries(
+            query_budget, authenticated_client, f'/api/games/{game_id}/full', headers={'If-None-Match': etag})
+        assert cached_response.status_code == 304
+        assert cached_queries == 1
+        
+        authenticated_client.put(f'/api/games/{game_id}/holes/1/players/1/score',
+                               data=json.dumps({'player_score': 6}),
+                               content_type='application/json')
+        
+        response = authenticated_client.get(f'/api/games/{game_id}/full', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert response.get_json()['scores'][0]['player_score'] == 6
+        assert authenticated_client.get(f'/api/games/{game_id}',
+                                        headers={'If-None-Match': game_etag}).status_code == 304
+        assert authenticated_client.get(f'/api/games/{game_id}').get_json() == game_response.get_json()
+
+    def test_recompute_game_scores(self, authenticated_client, query_budget):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Recompute Game', 'wolf_non_eagle_points': 1}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        for player_number in range(1, 5):
+            authenticated_client.put(f'/api/games/{game_id}/players/{player_number}',
+                                   data=json.dumps({'player_name': f'Player {player_number}'}),
+                                   content_type='application/json')
+        authenticated_client.put(f'/api/games/{game_id}/holes/1',
+                               data=json.dumps({'wolf_hole': 1, 'wolf_partner': 2, 'hole_dollars': 3.0}),
+                               content_type='application/json')
+        for player_number, strokes in enumerate([4, 5, 5, 6], start=1):
+            authenticated_client.put(f'/api/games/{game_id}/holes/1/players/{player_number}/score',
+                                   data=json.dumps({'player_score': strokes, 'player_money': 99.0}),
+                                   content_type='application/json')
+        
+        with query_budget(20):
+            response = authenticated_client.post(f'/api/games/{game_id}/recompute')
+        assert response.status_code == 200
+        players = json.loads(response.data)['players']
+        assert [player['player_money'] for player in players] == [6.0, 6.0, -6.0, -6.0]
+        assert players[0]['wolf_non_eagle_points'] == 1
+        
+        snapshot = authenticated_client.get(f'/api/games/{game_id}/full').get_json()
+        assert [float(score['player_money']) for score in snapshot['scores']] == [6.0, 6.0, -6.0, -6.0]
+        assert snapshot['scores'][0]['gross_score'] == 4
+        assert float(snapshot['hole_data'][0]['activated_dollars']) == 3.0
+        assert snapshot['players'][0]['wolf_non_eagle_points'] == 1
+        
+        standings = authenticated_client.get(f'/api/games/{game_id}/standings').get_json()
+        assert [(row['player_number'], row['total_money']) for row in standings] == [
+            (1, 6.0), (2, 6.0), (3, -6.0), (4, -6.0)]
+        card = authenticated_client.get(f'/api/games/{game_id}/scorecard').get_json()
+        assert [row[0] for row in card['player_money'][:4]] == [6.0, 6.0, -6.0, -6.0]
+        assert {score.version for score in PlayerHoleScore.query} == {2}
+        
+        with query_budget(10):
+            unchanged = authenticated_client.post(f'/api/games/{game_id}/recompute')
+        assert unchanged.get_json()['players'] == players
+        assert {score.version for score in PlayerHoleScore.query} == {2}
+        
+        assert authenticated_client.post(f'/api/games/{uuid.uuid4()}/recompute').status_code == 404
+
+    def test_recompute_scores_command(self, app, authenticated_client):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Command Game'}),
+                                 content_type='application/json')
+        
+        result = app.test_cli_runner().invoke(args=['recompute-scores', '--batch-size', '10'])
+        
+        assert result.exit_code == 0
+        assert 'Recomputed 1 games' in result.output
+
+    def test_games_list_streaming_mode(self, authenticated_client):
+        for i in range(5):
+            authenticated_client.post('/api/games',
+                                    data=json.dumps({'game_name': f'Streamed Game {i}'}),
+                                    content_type='application/json')
+        
+        paged = json.loads(authenticated_client.get('/api/games?limit=500').data)
+        response = authenticated_client.get('/api/games?stream=true&limit=2')
+        
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.data) == paged
+        assert 'X-Next-Cursor' not in response.headers
+        
+        filtered = json.loads(authenticated_client.get('/api/games?stream=1&game_name=Nothing').data)
+        assert filtered == []
+
+    def test_games_sparse_fieldsets(self, authenticated_client, query_budget):
+        response = authenticated_client.post('/api/games',
+                                data=json.dumps({'game_name': 'Sparse Game', 'hole': 3}),
+                                content_type='application/json')
+        game_id = json.loads(response.data)['id']
+        
+        with query_budget() as log:
+            response = authenticated_client.get('/api/games?fields=id,game_name,hole,last_saved')
+        
+        assert response.status_code == 200
+        assert json.loads(response.data) == [{
+            'id': game_id,
+            'game_name': 'Sparse Game',
+            'hole': 3,
+            'last_saved': json.loads(response.data)[0]['last_saved']
+        }]
+        games_select = [s for s, _ in log.statements if 'FROM games' in s][0]
+        assert 'games.game_name' in games_select
+        assert 'games.dollars' not in games_select
+        
+        detail = authenticated_client.get(f'/api/games/{game_id}?fields=game_name')
+        assert json.loads(detail.data) == {'game_name': 'Sparse Game'}
+        assert detail.headers['ETag']
+        
+        full = json.loads(authenticated_client.get(f'/api/games/{game_id}/full?fields=id,hole').data)
+        assert set(full) == {'id', 'hole', 'players', 'hole_data', 'scores', 'saved_game_meta'}
+        
+        streamed = json.loads(authenticated_client.get('/api/games?stream=1&fields=game_name').data)
+        assert streamed == [{'game_name': 'Sparse Game'}]
+        
+        bad_response = authenticated_client.get('/api/games?fields=id,password')
+        assert bad_response.status_code == 400
+        assert 'password' in json.loads(bad_response.data)['error']
@@ -0,0 +1,86 @@
+import pytest
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from prometheus_client import REGISTRY
+from app import db
+from app.metrics import MeteredQueuePool
+from conftest import create_test_app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+@pytest.mark.integration
+class TestMetricsJSONAPI:
+    def test_request_latency_and_errors(self, authenticated_client):
+        count = sample('http_request_duration_seconds_count', blueprint='games', method='GET')
+        errors = sample('http_request_errors_total', blueprint='games', method='GET', status='404')
+
+        authenticated_client.get('/api/games')
+        authenticated_client.get('/api/games/00000000-0000-0000-0000-000000000000')
+
+        assert sample('http_request_duration_seconds_count', blueprint='games', method='GET') == count + 2
+        assert sample('http_request_errors_total', blueprint='games', method='GET', status='404') == errors + 1
+
+        response = authenticated_client.get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        body = response.get_data(as_text=True)
+        assert 'http_request_duration_seconds_bucket{blueprint="games",le="0.005",method="GET"}' in body
+        assert 'auth_lookup_duration_seconds_count' in body
+        assert 'db_pool_checked_out_connections' in body
+
+    def test_cache_lookups(self, authenticated_client):
+        response = authenticated_client.post('/api/games', data=json.dumps({'game_name': 'Metrics Game'}),
+                                             content_type='application/json')
+        game_id = json.loads(response.data)['id']
+        hits = sample('cache_requests_total', cache='read', result='hit')
+        misses = sample('cache_requests_total', cache='read', result='miss')
+
+        authenticated_client.get(f'/api/games/{game_id}')
+        authenticated_client.get(f'/api/games/{game_id}')
+
+        assert sample('cache_requests_total', cache='read', result='miss') == misses + 1
+        assert sample('cache_requests_total', cache='read', result='hit') == hits + 1
+
+    def test_metrics_token(self, app, client):
+        app.config['METRICS_TOKEN'] = 'scrape-secret'
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+    def test_pool_gauges(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_test_app(SQLALCHEMY_DATABASE_URI=f'sqlite:///{os.path.join(tmp, "pool.db")}',
+                                  SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 2, 'max_overflow': 1})
+            with app.app_context():
+                assert isinstance(db.engine.pool, MeteredQueuePool)
+                waits = sample('db_pool_checkout_wait_seconds_count')
+                first = db.engine.connect()
+                second = db.engine.connect()
+                third = db.engine.connect()
+                assert sample('db_pool_checked_out_connections') == 3
+                assert sample('db_pool_overflow_connections') == 1
+                for connection in (first, second, third):
+                    connection.close()
+                assert sample('db_pool_checked_out_connections') == 0
+                assert sample('db_pool_checkout_wait_seconds_count') == waits + 3
+                assert sample('db_pool_waiting_checkouts') == 0
+                db.engine.dispose()
+
+    def test_multiprocess_aggregation(self):
+        observe = ('from app.metrics import REQUEST_LATENCY, POOL_CHECKED_OUT\n'
+                   'REQUEST_LATENCY.labels("games", "GET").observe(0.01)\n'
+                   'POOL_CHECKED_OUT.set(2)\n')
+        render = 'from app.metrics import render_metrics\nprint(render_metrics()[0].decode())\n'
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': tmp}
+            for _ in range(2):
+                subprocess.run([sys.executable, '-c', observe], cwd=ROOT, env=env, check=True)
+            output = subprocess.run([sys.executable, '-c', render], cwd=ROOT, env=env, check=True,
+                                    capture_output=True, text=True).stdout
+        assert 'http_request_duration_seconds_count{blueprint="games",method="GET"} 2.0' in output
@@ -1,5 +1,6 @@
 import pytest
 import json
+import uuid
 
 @pytest.mark.integration
 class TestPlayerHoleScoresJSONAPI:
@@ -174,4 +175,297 @@ class TestPlayerHoleScoresJSONAPI:
         
         delete_data = json.loads(delete_response.data)
         assert 'message' in delete_data
-        assert delete_data['message'] == 'PlayerHoleScore deleted successfully'
\ No newline at end of file
+        assert delete_data['message'] == 'PlayerHoleScore deleted successfully'
+
+    def test_create_player_hole_scores_batch(self, authenticated_client):
+        game_payload = {'game_name': 'Batch Score Test'}
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps(game_payload),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        
+        batch_payload = {'scores': [
+            {'player_number': player_number, 'hole_number': 1, 'player_score': 3 + player_number, 'player_money': 1.5}
+            for player_number in range(1, 10)
+        ]}
+        
+        response = authenticated_client.post(f'/api/games/{game_id}/scores:batch',
+                             data=json.dumps(batch_payload),
+                             content_type='application/json')
+        
+        assert response.status_code == 201
+        results = json.loads(response.data)['results']
+        assert [result['index'] for result in results] == list(range(9))
+        
+        get_response = authenticated_client.get(f'/api/player-hole-scores/{results[8]["id"]}')
+        score_data = json.loads(get_response.data)
+        assert score_data['game_id'] == game_id
+        assert score_data['player_number'] == 9
+        assert score_data['hole_number'] == 1
+        assert score_data['player_score'] == 12
+        assert float(score_data['player_money']) == 1.5
+
+    def test_create_player_hole_scores_batch_reports_row_errors(self, authenticated_client):
+        game_payload = {'game_name': 'Batch Error Test'}
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps(game_payload),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        authenticated_client.post('/api/player-hole-scores',
+                                data=json.dumps({'game_id': game_id, 'player_number': 1, 'hole_number': 2}),
+                                content_type='application/json')
+        
+        batch_payload = {'scores': [
+            {'player_number': 1, 'hole_number': 1},
+            {'player_number': 1, 'hole_number': 1},
+            {'player_number': 1, 'hole_number': 2},
+            {'player_number': 10, 'hole_number': 3},
+            {'player_number': 2, 'hole_number': 19}
+        ]}
+        
+        response = authenticated_client.post(f'/api/games/{game_id}/scores:batch',
+                             data=json.dumps(batch_payload),
+                             content_type='application/json')
+        
+        assert response.status_code == 207
+        results = json.loads(response.data)['results']
+        assert 'id' in results[0]
+        assert all('error' in result for result in results[1:])
+        
+        scores = json.loads(authenticated_client.get('/api/player-hole-scores').data)
+        assert len([score for score in scores if score['game_id'] == game_id]) == 2
+
+    def test_create_player_hole_scores_batch_reports_bad_values(self, authenticated_client):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Batch Values Test'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        
+        batch_payload = {'scores': [
+            {'player_number': 1, 'hole_number': 1, 'player_score': 4, 'player_money': 1.5},
+            {'player_number': 1, 'hole_number': 2, 'player_money': 'abc'},
+            {'player_number': 1, 'hole_number': 3, 'player_score': 'x'},
+            {'player_number': 1, 'hole_number': 4, 'wolf_score': True},
+            {'player_number': 1, 'hole_number': 5, 'net_score': 2 ** 40},
+            {'player_number': 1, 'hole_number': 6, 'player_money': 10 ** 9},
+            {'player_number': 1, 'hole_number': 7, 'player_score': 5}
+        ]}
+        
+        response = authenticated_client.post(f'/api/games/{game_id}/scores:batch',
+                             data=json.dumps(batch_payload),
+                             content_type='application/json')
+        
+        assert response.status_code == 207
+        results = json.loads(response.data)['results']
+        assert 'id' in results[0] and 'id' in results[6]
+        assert [result['error'] for result in results[1:6]] == [
+            'player_money must be a number below 100000000',
+            'player_score must be a 32-bit integer',
+            'wolf_score must be a 32-bit integer',
+            'net_score must be a 32-bit integer',
+            'player_money must be a number below 100000000'
+        ]
+        
+        scores = json.loads(authenticated_client.get('/api/player-hole-scores').data)
+        assert sorted(score['hole_number'] for score in scores) == [1, 7]
+
+    def test_create_player_hole_scores_batch_rejects_bad_requests(self, authenticated_client):
+        response = authenticated_client.post(f'/api/games/{uuid.uuid4()}/scores:batch',
+                             data=json.dumps({'scores': [{'player_number': 1, 'hole_number': 1}]}),
+                             content_type='application/json')
+        assert response.status_code == 404
+        
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Batch Reject Test'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        response = authenticated_client.post(f'/api/games/{game_id}/scores:batch',
+                             data=json.dumps({'scores': []}),
+                             content_type='application/json')
+        assert response.status_code == 400
+
+    def test_upsert_player_hole_score_by_natural_key(self, authenticated_client):
+        game_payload = {'game_name': 'Upsert Score Test'}
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps(game_payload),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        url = f'/api/games/{game_id}/holes/7/players/3/score'
+        
+        create_response = authenticated_client.put(url,
+                                   data=json.dumps({'player_score': 5, 'player_money': 2.0}),
+                                   content_type='application/json')
+        assert create_response.status_code == 200
+        score_id = json.loads(create_response.data)['id']
+        
+        update_response = authenticated_client.put(url,
+                                   data=json.dumps({'player_score': 4}),
+                                   content_type='application/json')
+        assert update_response.status_code == 200
+        assert json.loads(update_response.data)['id'] == score_id
+        
+        score_data = json.loads(authenticated_client.get(f'/api/player-hole-scores/{score_id}').data)
+        assert score_data['player_number'] == 3
+        assert score_data['hole_number'] == 7
+        assert score_data['player_score'] == 4
+        assert float(score_data['player_money']) == 2.0
+        
+        bad_response = authenticated_client.put(f'/api/games/{game_id}/holes/19/players/3/score',
+                                   data=json.dumps({'player_score': 4}),
+                                   content_type='application/json')
+        assert bad_response.status_code == 400
+
+    def test_upsert_player_hole_score_for_missing_game(self, authenticated_client):
+        from app.models import GameStanding, PlayerHoleScore
+        missing_id = uuid.uuid4()
+        response = authenticated_client.put(f'/api/games/{missing_id}/holes/1/players/1/score',
+                                   data=json.dumps({'player_score': 4, 'player_money': 1.0}),
+                                   content_type='application/json')
+        assert response.status_code == 404
+        assert json.loads(response.data)['error'] == 'Game not found'
+        assert PlayerHoleScore.query.count() == 0
+        assert GameStanding.query.count() == 0
+
+    def test_upsert_player_hole_score_rejects_invalid_bodies(self, authenticated_client):
+        from app.models import PlayerHoleScore
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Invalid Upsert Test'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        url = f'/api/games/{game_id}/holes/1/players/1/score'
+        for body, error in [
+            ([], 'request body must be a JSON object'),
+            ({'player_score': None}, 'player_score must be a 32-bit integer'),
+            ({'player_score': 'abc'}, 'player_score must be a 32-bit integer'),
+            ({'player_money': 'abc'}, 'player_money must be a number below 100000000')
+        ]:
+            response = authenticated_client.put(url, data=json.dumps(body), content_type='application/json')
+            assert response.status_code == 400
+            assert json.loads(response.data)['error'] == error
+        assert PlayerHoleScore.query.count() == 0
+
+    def test_player_hole_score_conditional_requests(self, authenticated_client):
+        game_payload = {'game_name': 'ETag Score Test'}
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps(game_payload),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        create_response = authenticated_client.post('/api/player-hole-scores',
+                                   data=json.dumps({'game_id': game_id, 'player_number': 1, 'hole_number': 1}),
+                                   content_type='application/json')
+        score_id = json.loads(create_response.data)['id']
+        
+        etag = authenticated_client.get(f'/api/player-hole-scores/{score_id}').headers['ETag']
+        cached_response = authenticated_client.get(f'/api/player-hole-scores/{score_id}',
+                                     headers={'If-None-Match': etag})
+        assert cached_response.status_code == 304
+        
+        update_response = authenticated_client.put(f'/api/player-hole-scores/{score_id}',
+                                   data=json.dumps({'player_score': 5}),
+                                   content_type='application/json',
+                                   headers={'If-Match': etag})
+        assert update_response.status_code == 200
+        
+        stale_response = authenticated_client.put(f'/api/player-hole-scores/{score_id}',
+                                   data=json.dumps({'player_score': 6}),
+                                   content_type='application/json',
+                                   headers={'If-Match': etag})
+        assert stale_response.status_code == 412
+        
+        new_etag = authenticated_client.get(f'/api/player-hole-scores/{score_id}',
+                                            headers={'If-None-Match': etag}).headers['ETag']
+        assert new_etag != etag
+        assert authenticated_client.delete(f'/api/player-hole-scores/{score_id}',
+                                           headers={'If-Match': etag}).status_code == 412
+        assert authenticated_client.delete(f'/api/player-hole-scores/{score_id}',
+                                           headers={'If-Match': new_etag}).status_code == 200
+
+    def test_standings_follow_every_score_write(self, app, authenticated_client):
+        game_payload = {'game_name': 'Standings Test'}
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps(game_payload),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        
+        def standings():
+            response = authenticated_client.get(f'/api/games/{game_id}/standings')
+            assert response.status_code == 200
+            return {row['player_number']: (row['total_money'], row['holes_played'], row['total_points'])
+                    for row in json.loads(response.data)}
+        
+        create_response = authenticated_client.post('/api/player-hole-scores',
+                                   data=json.dumps({'game_id': game_id, 'player_number': 1, 'hole_number': 1,
+                                                    'player_score': 4, 'player_money': 2.5, 'wolf_score': 1}),
+                                   content_type='application/json')
+        score_id = json.loads(create_response.data)['id']
+        assert standings() == {1: (2.5, 1, 1)}
+        
+        authenticated_client.put(f'/api/player-hole-scores/{score_id}',
+                               data=json.dumps({'player_money': -1.0}),
+                               content_type='application/json')
+        assert standings() == {1: (-1.0, 1, 1)}
+        
+        authenticated_client.post(f'/api/games/{game_id}/scores:batch',
+                                data=json.dumps({'scores': [
+                                    {'player_number': 1, 'hole_number': 2, 'player_score': 5, 'player_money': 3.0},
+                                    {'player_number': 2, 'hole_number': 2, 'player_score': 4, 'player_money': -3.0}
+                                ]}),
+                                content_type='application/json')
+        assert standings() == {1: (2.0, 2, 1), 2: (-3.0, 1, 0)}
+        
+        authenticated_client.put(f'/api/games/{game_id}/holes/2/players/2/score',
+                               data=json.dumps({'player_money': 4.0, 'wolf_score': 2}),
+                               content_type='application/json')
+        assert standings() == {1: (2.0, 2, 1), 2: (4.0, 1, 2)}
+        
+        authenticated_client.delete(f'/api/player-hole-scores/{score_id}')
+        assert standings() == {1: (3.0, 1, 0), 2: (4.0, 1, 2)}
+        
+        result = app.test_cli_runner().invoke(args=['rebuild-standings'])
+        assert result.exit_code == 0
+        assert standings() == {1: (3.0, 1, 0), 2: (4.0, 1, 2)}
+
+    def test_standings_for_scores_added_through_game(self, app, authenticated_client):
+        from app import db
+        from app.models import Game, PlayerHoleScore
+        game = Game(game_name='Relationship Standings Test')
+        game.scores = [PlayerHoleScore(player_number=1, hole_number=h, player_score=4, player_money=1.5)
+                       for h in range(1, 4)]
+        db.session.add(game)
+        db.session.commit()
+        
+        response = authenticated_client.get(f'/api/games/{game.id}/standings')
+        assert json.loads(response.data) == [
+            {'player_number': 1, 'total_money': 4.5, 'holes_played': 3, 'total_points': 0}
+        ]
+        
+        etag = authenticated_client.get(f'/api/games/{game.id}/full').headers['ETag']
+        game.scores.append(PlayerHoleScore(player_number=2, hole_number=1, player_score=5))
+        db.session.commit()
+        assert authenticated_client.get(f'/api/games/{game.id}/full',
+                                        headers={'If-None-Match': etag}).status_code == 200
+
+    def test_standings_for_missing_game(self, authenticated_client):
+        response = authenticated_client.get(f'/api/games/{uuid.uuid4()}/standings')
+        assert response.status_code == 404
+
+    def test_player_hole_scores_list_streaming_mode(self, authenticated_client):
+        game_payload = {'game_name': 'Stream Scores Test'}
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps(game_payload),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        authenticated_client.post(f'/api/games/{game_id}/scores:batch',
+                                data=json.dumps({'scores': [
+                                    {'player_number': player_number, 'hole_number': hole_number}
+                                    for player_number in range(1, 4) for hole_number in range(1, 19)
+                                ]}),
+                                content_type='application/json')
+        
+        response = authenticated_client.get('/api/player-hole-scores?stream=1')
+        
+        assert response.is_streamed
+        streamed = json.loads(response.data)
+        listed = json.loads(authenticated_client.get('/api/player-hole-scores').data)
+        assert len(streamed) == 54
+        assert sorted(streamed, key=lambda score: score['id']) == sorted(listed, key=lambda score: score['id'])
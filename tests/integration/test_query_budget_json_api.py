@@ -0,0 +1,64 @@
+import pytest
+import json
+import logging
+from flask import jsonify
+from flask_security import auth_required
+from app import db
+from app.models import Game, GameScorecard
+from app.query_budget import QueryBudgetExceeded, with_query_budget
+
+@pytest.mark.integration
+class TestQueryBudgetJSONAPI:
+    @pytest.fixture
+    def lazy_route(self, app):
+        @app.route('/api/lazy-games')
+        @auth_required()
+        @with_query_budget(1)
+        def lazy_games():
+            return jsonify([{'id': game.id, 'players': len(game.players)} for game in Game.query.all()])
+        return app
+
+    def _create_games(self, client, count):
+        for i in range(count):
+            response = client.post('/api/games', data=json.dumps({'game_name': f'Game {i}'}),
+                                   content_type='application/json')
+            game_id = json.loads(response.data)['id']
+            client.put(f'/api/games/{game_id}/players/1', data=json.dumps({'player_name': 'Alice'}),
+                       content_type='application/json')
+
+    def test_lazy_loads_fail_in_testing(self, lazy_route, authenticated_client):
+        self._create_games(authenticated_client, 3)
+        with pytest.raises(QueryBudgetExceeded, match='lazy_games: 4 queries, budget is 1.*possible N\\+1'):
+            authenticated_client.get('/api/lazy-games')
+
+    def test_lazy_loads_warn_in_development(self, lazy_route, authenticated_client, caplog):
+        self._create_games(authenticated_client, 3)
+        lazy_route.config['QUERY_BUDGET_ACTION'] = 'warn'
+        with caplog.at_level(logging.WARNING, logger='app.query_budget'):
+            response = authenticated_client.get('/api/lazy-games')
+        assert response.status_code == 200
+        assert 'possible N+1' in caplog.records[-1].getMessage()
+
+    def test_full_snapshot_stays_within_budget(self, app, authenticated_client, query_budget):
+        self._create_games(authenticated_client, 1)
+        game_id = json.loads(authenticated_client.get('/api/games').data)[0]['id']
+        app.extensions['read_cache']['backend'].clear()
+        with query_budget(6):
+            response = authenticated_client.get(f'/api/games/{game_id}/full')
+        assert response.status_code == 200
+        assert app.view_functions['games.get_game_full'].query_budget == (5, 2)
+
+    def test_scorecard_of_new_game_stays_within_budget(self, app, authenticated_client):
+        response = authenticated_client.post('/api/games', data=json.dumps({'game_name': 'Fresh Game'}),
+                                             content_type='application/json')
+        game_id = json.loads(response.data)['id']
+        response = authenticated_client.get(f'/api/games/{game_id}/scorecard')
+        assert response.status_code == 200
+        assert not any(map(any, json.loads(response.data)['entered']))
+
+        db.session.execute(db.delete(GameScorecard))
+        db.session.commit()
+        app.extensions['read_cache']['backend'].clear()
+        response = authenticated_client.get(f'/api/games/{game_id}/scorecard')
+        assert response.status_code == 200
+        assert app.view_functions['player_hole_scores.get_scorecard'].query_budget == (3, 2)
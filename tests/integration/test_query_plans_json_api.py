@@ -0,0 +1,62 @@
+import pytest
+import re
+from app import db
+from app.models import Game, GameHoleData, GamePlayer, PlayerHoleScore, SavedGameMeta
+from datetime import datetime
+
+GAME_TABLES = ('games', 'saved_game_meta', 'game_hole_data', 'game_players', 'player_hole_scores', 'game_standings')
+SEQUENTIAL_SCAN = re.compile(rf'^SCAN ({"|".join(GAME_TABLES)})$')
+
+@pytest.mark.integration
+class TestQueryPlansJSONAPI:
+    @pytest.fixture
+    def game_id(self, app):
+        game = Game(game_name='Plan Game')
+        game.meta = SavedGameMeta(name='Plan Game', saved_at=datetime.utcnow(), hole=1)
+        game.players = [GamePlayer(player_number=p, player_name=f'Player {p}') for p in range(1, 5)]
+        game.holes = [GameHoleData(hole_number=h, wolf_hole=h % 4 + 1) for h in range(1, 19)]
+        game.scores = [PlayerHoleScore(player_number=p, hole_number=h, player_score=4)
+                       for p in range(1, 5) for h in range(1, 19)]
+        db.session.add(game)
+        db.session.commit()
+        return game.id
+
+    def _plans(self, query_budget, client, method, url, **kwargs):
+        with query_budget(max_repeats=None) as log:
+            response = client.open(url, method=method, **kwargs)
+        assert response.status_code < 400
+        statements = [(statement, parameters) for statement, parameters in log.statements
+                      if statement.lstrip().upper().startswith('SELECT') and 'game' in statement]
+        with db.engine.connect() as connection:
+            return [(statement, [row[3] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)])
+                    for statement, parameters in statements]
+
+    def test_hot_queries_use_indexes(self, authenticated_client, game_id, query_budget):
+        requests = [
+            ('GET', '/api/games?limit=10'),
+            ('GET', '/api/games?is_continuing_game=true&order=asc'),
+            ('GET', f'/api/games/{game_id}'),
+            ('GET', f'/api/games/{game_id}/full'),
+            ('GET', f'/api/games/{game_id}/standings'),
+            ('GET', '/api/sync?limit=10'),
+        ]
+        for method, url in requests:
+            for statement, plan in self._plans(query_budget, authenticated_client, method, url):
+                scans = [step for step in plan if SEQUENTIAL_SCAN.match(step)]
+                assert not scans, f'{method} {url} scans a table: {plan}\n{statement}'
+
+    def test_scorecard_reads_are_index_ordered(self, authenticated_client, game_id, query_budget):
+        plans = self._plans(query_budget, authenticated_client, 'GET', f'/api/games/{game_id}/full')
+        assert any('player_hole_scores' in statement for statement, _ in plans)
+        for statement, plan in plans:
+            assert 'USE TEMP B-TREE FOR ORDER BY' not in plan, f'{plan}\n{statement}'
+
+    def test_per_hole_scores_use_composite_index(self, app, game_id):
+        query = db.select(PlayerHoleScore).where(
+            PlayerHoleScore.game_id == game_id, PlayerHoleScore.hole_number == 7
+        ).order_by(PlayerHoleScore.player_number)
+        compiled = query.compile(db.engine, compile_kwargs={'literal_binds': True})
+        with db.engine.connect() as connection:
+            plan = [row[3] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}')]
+        assert plan == ['SEARCH player_hole_scores USING INDEX '
+                        'ix_player_hole_scores_game_id_hole_number_player_number (game_id=? AND hole_number=?)']
@@ -0,0 +1,144 @@
+import pytest
+import json
+from app import db
+from app.models import GameScorecard, PlayerHoleScore, Tombstone
+from app.scorecards import unpack
+
+@pytest.mark.integration
+class TestScorecardsJSONAPI:
+    def _create_game(self, client):
+        response = client.post('/api/games', data=json.dumps({'game_name': 'Scorecard Game'}),
+                               content_type='application/json')
+        return json.loads(response.data)['id']
+
+    def _put_score(self, client, game_id, hole_number, player_number, **values):
+        return client.put(f'/api/games/{game_id}/holes/{hole_number}/players/{player_number}/score',
+                          data=json.dumps(values), content_type='application/json')
+
+    def _card(self, client, game_id):
+        response = client.get(f'/api/games/{game_id}/scorecard')
+        assert response.status_code == 200
+        return json.loads(response.data)
+
+    def test_row_api_writes_are_packed(self, authenticated_client):
+        game_id = self._create_game(authenticated_client)
+        self._put_score(authenticated_client, game_id, 3, 2, player_score=5, net_score=4, player_money=2.5)
+        authenticated_client.post('/api/player-hole-scores', content_type='application/json', data=json.dumps(
+            {'game_id': game_id, 'player_number': 1, 'hole_number': 18, 'player_score': 3, 'wolf_score': 2}))
+
+        card = self._card(authenticated_client, game_id)
+        assert len(card['entered']) == 9 and len(card['entered'][0]) == 18
+        assert sum(map(sum, card['entered'])) == 2
+        assert card['player_score'][1][2] == 5
+        assert card['net_score'][1][2] == 4
+        assert card['player_money'][1][2] == 2.5
+        assert card['player_score'][0][17] == 3
+        assert card['wolf_score'][0][17] == 2
+
+        score = PlayerHoleScore.query.filter_by(player_number=1, hole_number=18).one()
+        response = authenticated_client.put(f'/api/player-hole-scores/{score.id}', content_type='application/json',
+                                            data=json.dumps({'player_score': 4}))
+        assert response.status_code == 200
+        assert self._card(authenticated_client, game_id)['player_score'][0][17] == 4
+
+        authenticated_client.delete(f'/api/player-hole-scores/{score.id}')
+        card = self._card(authenticated_client, game_id)
+        assert card['entered'][0][17] is False
+        assert card['player_score'][0][17] == 0
+
+    def test_batch_scores_are_packed(self, authenticated_client):
+        game_id = self._create_game(authenticated_client)
+        response = authenticated_client.post(f'/api/games/{game_id}/scores:batch', content_type='application/json',
+                                             data=json.dumps({'scores': [
+                                                 {'player_number': p, 'hole_number': h, 'player_score': p + h}
+                                                 for p in range(1, 10) for h in range(1, 19)]}))
+        assert response.status_code == 201
+        card = self._card(authenticated_client, game_id)
+        assert all(all(row) for row in card['entered'])
+        assert card['player_score'][8][17] == 27
+
+    def test_scorecard_read_is_one_query(self, app, authenticated_client, query_budget):
+        game_id = self._create_game(authenticated_client)
+        self._put_score(authenticated_client, game_id, 1, 1, player_score=4)
+        app.extensions['read_cache']['backend'].clear()
+        with query_budget() as log:
+            self._card(authenticated_client, game_id)
+        statements = [statement for statement, _ in log.statements
+                      if 'game_scorecards' in statement or 'player_hole_scores' in statement]
+        assert len(statements) == 1
+        assert 'player_hole_scores' not in statements[0]
+
+    def test_score_writes_patch_the_card(self, authenticated_client, query_budget):
+        game_id = self._create_game(authenticated_client)
+        self._put_score(authenticated_client, game_id, 1, 1, player_score=4)
+        score = PlayerHoleScore.query.one()
+        with query_budget(max_repeats=None) as log:
+            self._put_score(authenticated_client, game_id, 2, 1, player_score=5, player_money=1.5)
+            authenticated_client.post(f'/api/games/{game_id}/scores:batch', content_type='application/json',
+                                      data=json.dumps({'scores': [{'player_number': 2, 'hole_number': 1, 'player_score': 6}]}))
+            authenticated_client.put(f'/api/player-hole-scores/{score.id}', content_type='application/json',
+                                     data=json.dumps({'player_score': 3}))
+        scans = [statement for statement, _ in log.statements
+                 if statement.startswith('SELECT') and 'player_hole_scores.game_id IN' in statement]
+        assert scans == []
+        
+        self._put_score(authenticated_client, game_id, 3, 1, player_money=0.125)
+        card = self._card(authenticated_client, game_id)
+        packed = unpack(db.session.get(GameScorecard, score.game_id).cells)
+        assert (card['player_score'][0][0], card['player_score'][0][1], card['player_score'][1][0]) == (3, 5, 6)
+        assert card['player_money'][0][1] == 1.5
+        assert packed['player_money'][0, 2] == round(float(PlayerHoleScore.query.filter_by(hole_number=3).one().player_money) * 100)
+        assert packed['entered'].sum() == 4
+
+    def test_new_games_start_with_an_empty_card(self, authenticated_client):
+        game_id = self._create_game(authenticated_client)
+        scorecard = GameScorecard.query.one()
+        assert str(scorecard.game_id) == game_id
+        assert not unpack(scorecard.cells)['entered'].any()
+        assert not any(map(any, self._card(authenticated_client, game_id)['entered']))
+
+    def test_scorecard_write_updates_rows(self, authenticated_client):
+        game_id = self._create_game(authenticated_client)
+        self._put_score(authenticated_client, game_id, 1, 1, player_score=4, player_money=1.0)
+        self._put_score(authenticated_client, game_id, 2, 1, player_score=6)
+        unchanged = PlayerHoleScore.query.filter_by(hole_number=1).one()
+
+        card = self._card(authenticated_client, game_id)
+        etag = authenticated_client.get(f'/api/games/{game_id}/scorecard').headers['ETag']
+        del card['game_id']
+        card['entered'][0][1] = False
+        card['entered'][3][4] = True
+        card['player_score'][3][4] = 5
+        card['player_money'][3][4] = -1.25
+        response = authenticated_client.put(f'/api/games/{game_id}/scorecard', data=json.dumps(card),
+                                            content_type='application/json', headers={'If-Match': etag})
+        assert response.status_code == 200
+
+        rows = {(s.player_number, s.hole_number): s for s in PlayerHoleScore.query.all()}
+        assert set(rows) == {(1, 1), (4, 5)}
+        assert rows[(1, 1)].version == unchanged.version
+        assert rows[(4, 5)].player_score == 5
+        assert float(rows[(4, 5)].player_money) == -1.25
+        assert Tombstone.query.filter_by(entity='player_hole_scores').count() == 1
+
+        packed = unpack(db.session.get(GameScorecard, rows[(1, 1)].game_id).cells)
+        assert packed['entered'].sum() == 2
+        assert packed['player_money'][3, 4] == -125
+        assert self._card(authenticated_client, game_id)['player_money'][3][4] == -1.25
+
+        standings = json.loads(authenticated_client.get(f'/api/games/{game_id}/standings').data)
+        assert {s['player_number']: s['total_money'] for s in standings} == {1: 1.0, 4: -1.25}
+
+        stale = authenticated_client.put(f'/api/games/{game_id}/scorecard', data=json.dumps(card),
+                                         content_type='application/json', headers={'If-Match': etag})
+        assert stale.status_code == 412
+
+    def test_invalid_scorecard(self, authenticated_client):
+        game_id = self._create_game(authenticated_client)
+        for payload in ({}, {'entered': [[True] * 18] * 8}, {'entered': [[True] * 18] * 9, 'player_score': [[1.5] * 18] * 9},
+                        {'entered': [[True] * 18] * 9, 'handicap': [[0] * 18] * 9}):
+            response = authenticated_client.put(f'/api/games/{game_id}/scorecard', data=json.dumps(payload),
+                                                content_type='application/json')
+            assert response.status_code == 400
+        missing = authenticated_client.get('/api/games/00000000-0000-0000-0000-000000000000/scorecard')
+        assert missing.status_code == 404
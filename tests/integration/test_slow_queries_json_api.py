@@ -0,0 +1,80 @@
+import pytest
+import json
+import logging
+from app.slow_queries import RateLimiter, parameter_shape
+
+@pytest.mark.integration
+class TestSlowQueriesJSONAPI:
+    @pytest.fixture
+    def slow_app(self, request, token_client):
+        app, client, headers = token_client(**{'SLOW_QUERY_THRESHOLD_MS': 0.000001, 'SLOW_QUERY_LOG_PER_MINUTE': 1000,
+                                               **getattr(request, 'param', {})})
+        client.environ_base['HTTP_AUTHENTICATION_TOKEN'] = headers['Authentication-Token']
+        yield app, client
+        app.extensions['slow_queries'].queue.join()
+
+    def _entries(self, caplog):
+        return [json.loads(record.getMessage()) for record in caplog.records if record.name == 'app.slow_queries']
+
+    def test_slow_statements_are_logged_with_endpoint(self, slow_app, caplog):
+        app, client = slow_app
+        response = client.post('/api/games', data=json.dumps({'game_name': 'Slow Game'}),
+                               content_type='application/json')
+        game_id = json.loads(response.data)['id']
+        with caplog.at_level(logging.WARNING, logger='app.slow_queries'):
+            client.get(f'/api/games/{game_id}')
+
+        entries = [e for e in self._entries(caplog) if 'FROM games' in e['statement']]
+        assert entries
+        entry = entries[-1]
+        assert entry['endpoint'] == 'games.get_game'
+        assert entry['method'] == 'GET'
+        assert entry['parameters'] == ['str']
+        assert 'plan' not in entry
+        assert game_id.replace('-', '') not in json.dumps(entry)
+
+    @pytest.mark.parametrize('slow_app', [{'SLOW_QUERY_EXPLAIN': True}], indirect=True)
+    def test_plans_are_captured_off_the_request_path(self, slow_app, caplog):
+        app, client = slow_app
+        response = client.post('/api/games', data=json.dumps({'game_name': 'Slow Game'}),
+                               content_type='application/json')
+        game_id = json.loads(response.data)['id']
+        slow_queries = app.extensions['slow_queries']
+        with caplog.at_level(logging.WARNING, logger='app.slow_queries'):
+            client.get(f'/api/games/{game_id}/full')
+            client.get(f'/api/games/{game_id}/standings')
+            slow_queries.queue.join()
+
+        selects = [e for e in self._entries(caplog) if e['statement'].startswith('SELECT')]
+        planned = [e for e in selects if 'plan' in e]
+        assert planned
+        assert all('SEARCH' in e['plan'] or 'SCAN' in e['plan'] for e in planned)
+        assert not any(e['statement'].startswith('EXPLAIN') for e in self._entries(caplog))
+        writes = [e for e in self._entries(caplog) if e['statement'].startswith(('INSERT', 'UPDATE'))]
+        assert not any('plan' in e for e in writes)
+
+        statements = [e['statement'] for e in planned]
+        assert len(statements) == len(set(statements))
+
+    @pytest.mark.parametrize('slow_app', [{'SLOW_QUERY_LOG_PER_MINUTE': 2}], indirect=True)
+    def test_logging_is_rate_limited(self, slow_app, caplog):
+        app, client = slow_app
+        with caplog.at_level(logging.WARNING, logger='app.slow_queries'):
+            for _ in range(5):
+                client.get('/api/games')
+        assert len(self._entries(caplog)) <= 2
+
+    def test_disabled_by_default(self, app):
+        assert 'slow_queries' not in app.extensions
+
+    def test_rate_limiter_reports_suppressed(self):
+        limiter = RateLimiter(per_minute=1)
+        assert limiter.allow() == (True, 0)
+        assert limiter.allow() == (False, 0)
+        assert limiter.allow() == (False, 0)
+        limiter.tokens = 1
+        assert limiter.allow() == (True, 2)
+
+    def test_parameter_shape(self):
+        assert parameter_shape({'id': 1, 'name': 'x'}) == {'id': 'int', 'name': 'str'}
+        assert parameter_shape((1.5, None)) == ['float', 'NoneType']
@@ -0,0 +1,129 @@
+import pytest
+import base64
+import json
+
+@pytest.mark.integration
+class TestSyncJSONAPI:
+    def test_sync_returns_all_rows_then_only_changes(self, authenticated_client):
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Sync Test Game'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        authenticated_client.put(f'/api/games/{game_id}/players/1',
+                               data=json.dumps({'player_name': 'Alice'}),
+                               content_type='application/json')
+        authenticated_client.put(f'/api/games/{game_id}/holes/1/players/1/score',
+                               data=json.dumps({'player_score': 4}),
+                               content_type='application/json')
+        
+        response = authenticated_client.get('/api/sync')
+        assert response.status_code == 200
+        sync_data = json.loads(response.data)
+        assert [game['id'] for game in sync_data['changes']['games']] == [game_id]
+        assert sync_data['changes']['game_players'][0]['player_name'] == 'Alice'
+        assert sync_data['changes']['player_hole_scores'][0]['player_score'] == 4
+        assert sync_data['changes']['player_hole_scores'][0]['version'] == 1
+        assert 'child_version' in sync_data['changes']['games'][0]
+        assert sync_data['deleted'] == []
+        assert sync_data['has_more'] == False
+        
+        response = authenticated_client.get(f'/api/sync?since={sync_data["cursor"]}')
+        unchanged = json.loads(response.data)
+        assert all(rows == [] for rows in unchanged['changes'].values())
+        
+        score_response = authenticated_client.put(f'/api/games/{game_id}/holes/1/players/1/score',
+                                 data=json.dumps({'player_score': 5}),
+                                 content_type='application/json')
+        score_id = json.loads(score_response.data)['id']
+        player_id = sync_data['changes']['game_players'][0]['id']
+        authenticated_client.delete(f'/api/game-players/{player_id}')
+        
+        response = authenticated_client.get(f'/api/sync?since={unchanged["cursor"]}')
+        delta = json.loads(response.data)
+        assert delta['changes']['games'] == []
+        assert delta['changes']['game_players'] == []
+        assert [score['player_score'] for score in delta['changes']['player_hole_scores']] == [5]
+        assert delta['changes']['player_hole_scores'][0]['id'] == score_id
+        assert delta['changes']['player_hole_scores'][0]['version'] == 2
+        assert delta['deleted'] == [{
+            'entity': 'game_players',
+            'id': player_id,
+            'game_id': game_id,
+            'deleted_at': delta['deleted'][0]['deleted_at']
+        }]
+
+    def test_sync_pages_with_limit(self, authenticated_client):
+        game_ids = []
+        for i in range(3):
+            game_response = authenticated_client.post('/api/games',
+                                     data=json.dumps({'game_name': f'Sync Page {i}'}),
+                                     content_type='application/json')
+            game_ids.append(json.loads(game_response.data)['id'])
+        
+        seen_ids = []
+        url = '/api/sync?limit=2'
+        while True:
+            sync_data = json.loads(authenticated_client.get(url).data)
+            seen_ids.extend(game['id'] for game in sync_data['changes']['games'])
+            if not sync_data['has_more']:
+                break
+            url = f'/api/sync?limit=2&since={sync_data["cursor"]}'
+        
+        assert sorted(seen_ids) == sorted(game_ids)
+
+    def test_sync_rejects_bad_cursor(self, authenticated_client):
+        response = authenticated_client.get('/api/sync?since=garbage')
+        assert response.status_code == 400
+        for position in ({'games': [1, 5]}, {'games': [1]}, {'games': ['1', '00000000-0000-0000-0000-000000000000']},
+                         {'tombstones': [1, 'x']}, {'games': None}):
+            cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+            response = authenticated_client.get(f'/api/sync?since={cursor}')
+            assert response.status_code == 400
+            assert response.get_json() == {'error': 'invalid sync parameters: invalid cursor'}
+
+    def test_sync_follows_commit_order_not_clock(self, authenticated_client):
+        import uuid
+        from datetime import datetime
+        from app import db
+        from app.models import Game, sync_counter
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Clock Game'}),
+                                 content_type='application/json')
+        game_id = json.loads(game_response.data)['id']
+        cursor = json.loads(authenticated_client.get('/api/sync').data)['cursor']
+        
+        before = db.session.scalar(db.select(sync_counter.c.value))
+        authenticated_client.put(f'/api/games/{game_id}/holes/1/players/1/score',
+                               data=json.dumps({'player_score': 4}),
+                               content_type='application/json')
+        assert db.session.scalar(db.select(sync_counter.c.value)) == before + 1
+        
+        game = db.session.get(Game, uuid.UUID(game_id))
+        game.game_name = 'Late Commit'
+        game.updated_at = datetime(2000, 1, 1)
+        db.session.commit()
+        
+        delta = json.loads(authenticated_client.get(f'/api/sync?since={cursor}').data)
+        assert [game['game_name'] for game in delta['changes']['games']] == ['Late Commit']
+        assert [score['player_score'] for score in delta['changes']['player_hole_scores']] == [4]
+        assert delta['changes']['player_hole_scores'][0]['change_seq'] < delta['changes']['games'][0]['change_seq']
+
+    def test_change_seq_is_assigned_at_commit(self, authenticated_client):
+        import uuid
+        from app import db
+        from app.models import Game, sync_counter
+        game_response = authenticated_client.post('/api/games',
+                                 data=json.dumps({'game_name': 'Pending Game'}),
+                                 content_type='application/json')
+        game_id = uuid.UUID(json.loads(game_response.data)['id'])
+        before = db.session.scalar(db.select(sync_counter.c.value))
+        
+        game = db.session.get(Game, game_id)
+        game.game_name = 'Renamed'
+        db.session.flush()
+        assert db.session.scalar(db.select(sync_counter.c.value)) == before
+        assert db.session.scalar(db.select(Game.change_seq).where(Game.id == game_id)) is None
+        
+        db.session.commit()
+        assert db.session.scalar(db.select(sync_counter.c.value)) == before + 1
+        assert db.session.scalar(db.select(Game.change_seq).where(Game.id == game_id)) == before + 1
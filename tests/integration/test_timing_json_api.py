@@ -0,0 +1,50 @@
+import pytest
+import json
+import logging
+import re
+
+@pytest.mark.integration
+class TestTimingJSONAPI:
+    @pytest.fixture
+    def timed(self, token_client):
+        return token_client(TIMING_SAMPLE_RATE=1.0)
+
+    def test_server_timing_header_and_log(self, timed, caplog):
+        app, client, headers = timed
+        response = client.post('/api/games', data=json.dumps({'game_name': 'Timed Game'}), headers=headers)
+        game_id = json.loads(response.data)['id']
+
+        with app.app_context(), caplog.at_level(logging.INFO, logger='app.timing'):
+            response = client.get(f'/api/games/{game_id}/full', headers=headers)
+        assert response.status_code == 200
+
+        metrics = dict(re.match(r'(\w+);dur=([\d.]+)', metric).groups()
+                       for metric in response.headers['Server-Timing'].split(', '))
+        assert set(metrics) == {'db', 'auth', 'serialize', 'total'}
+        queries = int(re.search(r'desc="(\d+) queries"', response.headers['Server-Timing']).group(1))
+        assert queries >= 1
+        assert float(metrics['total']) >= float(metrics['db'])
+
+        line = json.loads(caplog.records[-1].getMessage())
+        assert line['endpoint'] == 'games.get_game_full'
+        assert line['path'] == f'/api/games/{game_id}/full'
+        assert line['status'] == 200
+        assert line['db_queries'] == queries
+        assert set(line) >= {'total_ms', 'db_ms', 'auth_ms', 'serialize_ms'}
+
+    def test_errors_are_timed(self, timed):
+        app, client, headers = timed
+        response = client.get('/api/games/00000000-0000-0000-0000-000000000000', headers=headers)
+        assert response.status_code == 404
+        assert 'total;dur=' in response.headers['Server-Timing']
+
+    def test_sampling(self, token_client, monkeypatch):
+        app, client, headers = token_client(TIMING_SAMPLE_RATE=0.5)
+        monkeypatch.setattr('app.timing.random.random', lambda: 0.7)
+        assert 'Server-Timing' not in client.get('/api/games', headers=headers).headers
+        monkeypatch.setattr('app.timing.random.random', lambda: 0.2)
+        assert 'Server-Timing' in client.get('/api/games', headers=headers).headers
+
+    def test_disabled_by_default(self, client):
+        response = client.get('/')
+        assert 'Server-Timing' not in response.headers
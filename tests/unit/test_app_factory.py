@@ -13,11 +13,32 @@ class TestAppFactory:
     def test_blueprints_registered(self):
         app = create_test_app()
         blueprint_names = [bp.name for bp in app.blueprints.values()]
-        expected_blueprints = ['index', 'games', 'saved_game_meta', 'game_hole_data', 'game_players', 'player_hole_scores']
+        expected_blueprints = ['index', 'games', 'saved_game_meta', 'game_hole_data', 'game_players', 'player_hole_scores', 'sync', 'cache']
         for bp_name in expected_blueprints:
             assert bp_name in blueprint_names
 
     def test_app_has_database(self):
         app = create_test_app()
         with app.app_context():
-            assert db.engine is not None
\ No newline at end of file
+            assert db.engine is not None
+
+    def test_api_only_app_skips_admin_and_security_views(self):
+        from app import create_app
+        app = create_app('testing', api_only=True)
+        assert app.config['API_ONLY'] is True
+        blueprint_names = set(app.blueprints)
+        assert {'games', 'saved_game_meta', 'game_hole_data', 'game_players', 'player_hole_scores', 'sync',
+                'cache', 'metrics'} <= blueprint_names
+        assert not blueprint_names & {'admin', 'security', 'index'}
+        assert 'migrate' not in app.extensions
+        assert 'security' in app.extensions
+
+    def test_api_only_app_does_not_import_admin(self):
+        import subprocess
+        import sys
+        script = ('import sys\n'
+                  'from app import create_app\n'
+                  'create_app("testing", api_only=True)\n'
+                  'print(" ".join(m for m in ("flask_admin", "flask_migrate", "alembic") if m in sys.modules))\n')
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+        assert output.strip() == ''
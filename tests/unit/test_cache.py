@@ -0,0 +1,79 @@
+import pytest
+from app.cache import LRUCache, RedisCache
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.expiries = {}
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode()
+        self.expiries[key] = ex
+
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    def expire(self, key, seconds):
+        self.expiries[key] = seconds
+
+    def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sets.pop(key, None)
+
+@pytest.mark.unit
+class TestCacheBackends:
+    def test_lru_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert len(cache) == 2
+
+    def test_lru_expires_entries(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr('app.cache.time.monotonic', lambda: now[0])
+        cache = LRUCache(ttl=10)
+        cache.set('a', 1)
+        now[0] = 109.0
+        assert cache.get('a') == 1
+        now[0] = 110.0
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+    def test_lru_invalidates_tags(self):
+        cache = LRUCache()
+        cache.set('games:1', 'game', tags=('game:1',))
+        cache.set('game_players:2', 'player', tags=('game:1',))
+        cache.set('games:3', 'other', tags=('game:3',))
+        cache.invalidate_tags(['game:1'])
+        assert cache.get('games:1') is None
+        assert cache.get('game_players:2') is None
+        assert cache.get('games:3') == 'other'
+
+    def test_redis_backend_with_stand_in_client(self):
+        client = FakeRedis()
+        cache = RedisCache(client, ttl=30)
+        cache.set('games:1', ('etag', '{}'), tags=('game:1',))
+        assert cache.get('games:1') == ('etag', '{}')
+        assert client.expiries['wolf:cache:games:1'] == 30
+        cache.invalidate_tags(['game:1'])
+        assert cache.get('games:1') is None
+        assert client.sets == {}
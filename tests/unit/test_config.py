@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import create_engine
+from app.database import LocalStatementTimeout, configure_engine
+from config import async_database_uri, engine_options
+
+@pytest.mark.unit
+class TestEngineOptions:
+    def test_defaults_without_postgres(self, monkeypatch):
+        for name in ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_POOL_TIMEOUT', 'DB_POOL_RECYCLE', 'DB_POOL_PRE_PING'):
+            monkeypatch.delenv(name, raising=False)
+        options = engine_options('sqlite:///wolf_scoring.db', pool_size=2, max_overflow=3)
+        assert options == {
+            'pool_size': 2,
+            'max_overflow': 3,
+            'pool_timeout': 10,
+            'pool_recycle': 1800,
+            'pool_pre_ping': True,
+        }
+
+    def test_environment_overrides(self, monkeypatch):
+        monkeypatch.setenv('DB_POOL_SIZE', '20')
+        monkeypatch.setenv('DB_MAX_OVERFLOW', '0')
+        monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+        monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+        options = engine_options('postgresql://user@localhost/wolf', pool_size=5, max_overflow=10)
+        assert options['pool_size'] == 20
+        assert options['max_overflow'] == 0
+        assert options['pool_pre_ping'] == False
+        assert options['connect_args'] == {'options': '-c statement_timeout=5000'}
+
+    @pytest.mark.parametrize('uri, connect_args', [
+        ('postgresql://user@pgbouncer/wolf', None),
+        ('postgresql+psycopg://user@pgbouncer/wolf', {'prepare_threshold': None}),
+        ('postgresql+asyncpg://user@pgbouncer/wolf', {'statement_cache_size': 0, 'prepared_statement_cache_size': 0}),
+    ])
+    def test_pgbouncer_mode(self, monkeypatch, uri, connect_args):
+        monkeypatch.setenv('DB_PGBOUNCER', 'true')
+        options = engine_options(uri, pool_size=5, max_overflow=10)
+        assert options.get('connect_args') == connect_args
+
+    def test_asyncpg_statement_timeout(self, monkeypatch):
+        monkeypatch.delenv('DB_PGBOUNCER', raising=False)
+        monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+        options = engine_options('postgresql+asyncpg://user@localhost/wolf', pool_size=20, max_overflow=10)
+        assert options['connect_args'] == {'server_settings': {'statement_timeout': '5000'}}
+
+    @pytest.mark.parametrize('uri, expected', [
+        ('postgresql://user@localhost/wolf', 'postgresql+asyncpg://user@localhost/wolf'),
+        ('sqlite:///wolf_scoring.db', 'sqlite+aiosqlite:///wolf_scoring.db'),
+        ('postgresql+psycopg://user@localhost/wolf', 'postgresql+psycopg://user@localhost/wolf'),
+    ])
+    def test_async_database_uri(self, uri, expected):
+        assert async_database_uri(uri) == expected
+
+@pytest.mark.unit
+class TestConfigureEngine:
+    def _timeouts(self, engine):
+        return [listener.timeout_ms for listener in engine.dispatch.begin if isinstance(listener, LocalStatementTimeout)]
+
+    def test_pgbouncer_mode_sets_local_statement_timeout(self):
+        engine = create_engine('postgresql://user@pgbouncer/wolf')
+        configure_engine(engine, {'DB_PGBOUNCER': True, 'DB_STATEMENT_TIMEOUT_MS': 5000})
+        assert self._timeouts(engine) == [5000]
+
+    @pytest.mark.parametrize('uri, pgbouncer', [
+        ('postgresql://user@localhost/wolf', False),
+        ('sqlite:///wolf_scoring.db', True),
+    ])
+    def test_statement_timeout_stays_a_startup_option(self, uri, pgbouncer):
+        engine = create_engine(uri)
+        configure_engine(engine, {'DB_PGBOUNCER': pgbouncer, 'DB_STATEMENT_TIMEOUT_MS': 5000})
+        assert self._timeouts(engine) == []
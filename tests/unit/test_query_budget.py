@@ -0,0 +1,62 @@
+import pytest
+import logging
+from sqlalchemy import create_engine, text
+from app.query_budget import QueryBudgetExceeded, query_budget
+
+@pytest.mark.unit
+class TestQueryBudget:
+    @pytest.fixture
+    def conn(self):
+        engine = create_engine('sqlite://')
+        with engine.connect() as conn:
+            conn.execute(text('CREATE TABLE t (id INTEGER PRIMARY KEY)'))
+            yield conn
+        engine.dispose()
+
+    def test_counts_statements(self, conn):
+        with query_budget(3) as log:
+            conn.execute(text('SELECT 1'))
+            conn.execute(text('SELECT id FROM t'))
+        assert log.count == 2
+
+    def test_over_budget_raises(self, conn):
+        with pytest.raises(QueryBudgetExceeded, match='3 queries, budget is 2'):
+            with query_budget(2):
+                for _ in range(3):
+                    conn.execute(text('SELECT 1'))
+
+    def test_repeated_shape_is_reported(self, conn):
+        with pytest.raises(QueryBudgetExceeded, match='ran 3 times with different parameters'):
+            with query_budget():
+                for i in range(3):
+                    conn.execute(text('SELECT id FROM t WHERE id = :id'), {'id': i})
+
+    def test_identical_repeats_are_not_n_plus_one(self, conn):
+        with query_budget() as log:
+            for _ in range(5):
+                conn.execute(text('SELECT id FROM t WHERE id = :id'), {'id': 1})
+        assert log.repeated() == {}
+
+    def test_warn_logs_instead_of_raising(self, conn, caplog):
+        with caplog.at_level(logging.WARNING, logger='app.query_budget'):
+            with query_budget(0, action='warn', label='games.get_games'):
+                conn.execute(text('SELECT 1'))
+        assert caplog.records[-1].getMessage() == 'games.get_games: 1 queries, budget is 0'
+
+    def test_nested_budgets_both_count(self, conn):
+        with query_budget() as outer:
+            conn.execute(text('SELECT 1'))
+            with query_budget() as inner:
+                conn.execute(text('SELECT 2'))
+        assert (outer.count, inner.count) == (2, 1)
+
+    def test_statements_outside_are_ignored(self, conn):
+        with query_budget() as log:
+            pass
+        conn.execute(text('SELECT 1'))
+        assert log.count == 0
+
+    def test_unknown_action(self):
+        with pytest.raises(ValueError):
+            with query_budget(action='explode'):
+                pass
@@ -0,0 +1,43 @@
+import pytest
+from types import SimpleNamespace
+from app.scorecards import card_from_json, card_from_rows, card_to_json, empty_card, pack, unpack
+
+@pytest.mark.unit
+class TestScorecards:
+    def test_pack_round_trip_is_zero_copy(self):
+        card = empty_card()
+        card[2, 5] = (True, 4, 3, 4, 2, 1, 350)
+        cells = pack(card)
+        assert len(cells) == 9 * 18 * card.dtype.itemsize
+
+        unpacked = unpack(cells)
+        assert not unpacked.flags.owndata
+        assert unpacked[2, 5].tolist() == (True, 4, 3, 4, 2, 1, 350)
+        assert unpacked['player_score'].sum() == 4
+
+    def test_card_from_rows(self):
+        rows = [SimpleNamespace(player_number=1, hole_number=18, player_score=5, net_score=4, gross_score=5,
+                                wolf_score=1, prox_score=0, player_money='2.35')]
+        card = card_from_rows(rows)
+        assert card['entered'].sum() == 1
+        assert card[0, 17]['player_money'] == 235
+        assert card_to_json(card)['player_money'][0][17] == 2.35
+
+    def test_card_from_json_clears_unentered_cells(self):
+        entered = [[False] * 18 for _ in range(9)]
+        entered[0][0] = True
+        card = card_from_json({'entered': entered, 'player_score': [[4] * 18] * 9, 'player_money': [[0.1] * 18] * 9})
+        assert card['player_score'].sum() == 4
+        assert card['player_money'][0, 0] == 10
+
+    @pytest.mark.parametrize('payload', [
+        None,
+        {'player_score': [[4] * 18] * 9},
+        {'entered': [[1] * 18] * 9},
+        {'entered': [[True] * 17] * 9},
+        {'entered': [[True] * 18] * 9, 'wolf_score': [[2 ** 40] * 18] * 9},
+        {'entered': [[True] * 18] * 9, 'player_money': [['1'] * 18] * 9},
+    ])
+    def test_card_from_json_rejects_invalid(self, payload):
+        with pytest.raises(ValueError):
+            card_from_json(payload)
@@ -0,0 +1,85 @@
+import pytest
+import time
+import numpy as np
+from app.scoring import empty_arrays, compute, POINT_FIELDS
+
+def four_player_game(game_count=1):
+    arrays = empty_arrays(game_count)
+    arrays['active'][:, :4] = True
+    arrays['hole_dollars'][:] = 2.0
+    arrays['wolf'][:] = 1
+    arrays['points'][:] = [2, 4, 1, 1]
+    return arrays
+
+@pytest.mark.unit
+class TestScoring:
+    def test_wolf_team_best_ball_wins(self):
+        arrays = four_player_game()
+        arrays['partner'][0, 0] = 2
+        arrays['strokes'][0, :4, 0] = [4, 5, 5, 6]
+        
+        results = compute(arrays)
+        
+        assert list(results['money'][0, :4, 0]) == [4.0, 4.0, -4.0, -4.0]
+        assert results['wolf_score'][0, 0, 0] == 1
+        assert results['activated_dollars'][0, 0] == 2.0
+
+    def test_lone_wolf_doubles_stake_and_scores_birdie(self):
+        arrays = four_player_game()
+        arrays['alone'][0, 0] = True
+        arrays['doublings'][0, 0] = 2
+        arrays['strokes'][0, :4, 0] = [3, 4, 4, 4]
+        
+        results = compute(arrays)
+        
+        assert list(results['money'][0, :4, 0]) == [24.0, -8.0, -8.0, -8.0]
+        assert results['point_totals'][0, 0, POINT_FIELDS.index('wolf_birdie_points')] == 2
+
+    def test_tied_hole_pushes(self):
+        arrays = four_player_game()
+        arrays['partner'][0, 0] = 2
+        arrays['strokes'][0, :4, 0] = [4, 5, 4, 6]
+        
+        results = compute(arrays)
+        
+        assert not results['money'][0, :, 0].any()
+
+    def test_incomplete_hole_is_not_scored(self):
+        arrays = four_player_game()
+        arrays['partner'][0, 0] = 2
+        arrays['strokes'][0, :3, 0] = [3, 5, 5]
+        
+        results = compute(arrays)
+        
+        assert not results['money'][0, :, 0].any()
+        assert not results['wolf_score'][0, :, 0].any()
+        assert results['activated_dollars'][0, 0] == 0.0
+
+    def test_handicap_strokes_decide_the_hole(self):
+        arrays = four_player_game()
+        arrays['partner'][0, 0] = 2
+        arrays['handicap'][0, 2] = 19
+        arrays['hole_handicap'][0, 0] = 1
+        arrays['strokes'][0, :4, 0] = [4, 5, 6, 6]
+        
+        results = compute(arrays)
+        
+        assert results['net'][0, 2, 0] == 4
+        assert not results['money'][0, :, 0].any()
+
+    def test_batch_is_zero_sum(self):
+        rng = np.random.default_rng(7)
+        arrays = four_player_game(2000)
+        arrays['active'][:, :rng.integers(4, 10)] = True
+        arrays['strokes'][:] = rng.integers(2, 8, size=arrays['strokes'].shape)
+        arrays['wolf'][:] = rng.integers(1, 5, size=arrays['wolf'].shape)
+        arrays['partner'][:] = rng.integers(0, 5, size=arrays['partner'].shape)
+        arrays['doublings'][:] = rng.integers(0, 3, size=arrays['doublings'].shape)
+        
+        started = time.perf_counter()
+        results = compute(arrays)
+        elapsed = time.perf_counter() - started
+        
+        assert np.allclose(results['money'].sum(axis=1), 0.0)
+        assert results['money'].any()
+        assert elapsed < 2.0
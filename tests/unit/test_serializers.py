@@ -0,0 +1,42 @@
+import pytest
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from app.models import Game, PlayerHoleScore
+from app.serializers import all_fields, public_fields, serialize, serializer_for
+
+@pytest.mark.unit
+class TestSerializers:
+    def test_serializer_is_cached_per_model(self):
+        assert serializer_for(Game) is serializer_for(Game)
+        assert serializer_for(Game) is not serializer_for(PlayerHoleScore)
+
+    def test_serializer_covers_every_public_column(self):
+        score = PlayerHoleScore(id=uuid.uuid4(), game_id=uuid.uuid4(), player_number=1, hole_number=1,
+                                player_money=Decimal('2.50'), version=3)
+        data = serialize(score)
+        assert set(data) == {column.key for column in PlayerHoleScore.__table__.columns} - {'version', 'updated_at', 'change_seq'}
+        assert data['player_money'] == 2.5
+        assert isinstance(data['player_money'], float)
+        assert serializer_for(PlayerHoleScore, all_fields(PlayerHoleScore))(score)['version'] == 3
+
+    def test_game_serializer_hides_child_version(self):
+        assert 'child_version' not in public_fields(Game)
+        assert 'change_seq' not in public_fields(Game)
+        assert {'created_at', 'updated_at'} <= public_fields(Game)
+
+    def test_provider_encodes_uuid_decimal_and_datetime(self, app):
+        game_id = uuid.uuid4()
+        body = app.json.dumps({
+            'id': game_id,
+            'money': Decimal('1.25'),
+            'saved_at': datetime(2024, 1, 15, 14, 30)
+        })
+        assert json.loads(body) == {'id': str(game_id), 'money': 1.25, 'saved_at': '2024-01-15T14:30:00'}
+
+    def test_provider_response_is_json(self, app):
+        with app.test_request_context():
+            response = app.json.response({'id': uuid.UUID(int=1)})
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == {'id': str(uuid.UUID(int=1))}
@@ -0,0 +1,25 @@
+import pytest
+import json
+from app.streaming import stream_json_array
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows = rows
+        self.batch_size = None
+
+    def yield_per(self, batch_size):
+        self.batch_size = batch_size
+        return iter(self.rows)
+
+@pytest.mark.unit
+class TestStreaming:
+    @pytest.mark.parametrize('row_count', [0, 1, 2, 3, 7])
+    def test_stream_json_array_chunks(self, app, row_count):
+        query = FakeQuery(list(range(row_count)))
+        with app.test_request_context('/api/games?stream=1'):
+            response = stream_json_array(query, lambda row: {'n': row}, batch_size=2)
+            chunks = list(response.response)
+        
+        assert query.batch_size == 2
+        assert chunks[0] == '['
+        assert json.loads(''.join(chunks)) == [{'n': n} for n in range(row_count)]
@@ -0,0 +1,7 @@
+from app import create_app
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+app = create_app(os.environ.get('FLASK_ENV', 'default'))